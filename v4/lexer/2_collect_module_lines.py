@@ -1,21 +1,26 @@
 #!/usr/local/bin/python3
 
+from yapl.v4.lexer.shared.parallel import process_modules
 from yapl.v4.lexer.shared.transpilation import Transpilation
 from yapl.v4.lexer.shared.module_lines.manifest.builder import ManifestBuilder as ModuleLinesManifestBuilder
 
 
+def process_module(module_ref, transpilation_directory, codec):
+    print("processing file: " + module_ref["filename"])
+    module_lines = ModuleLinesManifestBuilder(
+        transpilation_directory,
+        module_ref["sha256"],
+        codec
+    )
+    module_lines.parse()
+    module_lines.save()
+
+
 def main(args):
     transpilation = Transpilation(args.transpilation_directory)
     transpilation.load()
     modules = transpilation.manifest().get_module_file_refs()
-    for module_ref in modules:
-        print("processing file: " + module_ref["filename"])
-        module_lines = ModuleLinesManifestBuilder(
-            args.transpilation_directory,
-            module_ref["sha256"]
-        )
-        module_lines.parse()
-        module_lines.save()
+    process_modules(process_module, modules, args.jobs, args.transpilation_directory, transpilation.codec())
 
 
 if __name__ == "__main__":
@@ -25,6 +30,8 @@ if __name__ == "__main__":
         description='Collect source lines from previously collected modules')
     parser.add_argument('-t', '--transpilation', dest='transpilation_directory', required=True,
                         help='The transpilation directory')
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, default=1,
+                        help='The number of processes that modules are spread across (default: 1)')
     args = parser.parse_args()
 
     main(args)
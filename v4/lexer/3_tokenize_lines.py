@@ -1,41 +1,57 @@
 #!/usr/local/bin/python3
 
+from yapl.v4.lexer.shared.memo_cache import MemoCache
+from yapl.v4.lexer.shared.parallel import process_modules
 from yapl.v4.lexer.shared.transpilation import Transpilation
 from yapl.v4.lexer.shared.module_lines.manifest.reader \
     import ManifestReader as ModuleLinesManifestReader
 from yapl.v4.lexer.shared.tokenized_lines.builder \
-    import ManifestBuilder as TokenizedLinesManifestBuilder
+    import ManifestBuilder as TokenizedLinesManifestBuilder, TOKENIZER_VERSION
+
+
+def process_module(module_ref, transpilation_directory, codec, cache):
+    module_sha256 = module_ref["sha256"]
+    print("processing module: " + module_ref["filename"] + " (" + module_sha256 + ")")
+    builder = TokenizedLinesManifestBuilder(
+        transpilation_directory,
+        module_sha256,
+        codec,
+        cache
+    )
+    reader = ModuleLinesManifestReader(
+        transpilation_directory,
+        module_sha256
+    )
+    for logical_line in reader.logical_lines():
+        try:
+            builder.tokenize_logical_line(
+                logical_line.sha256(),
+                logical_line.content()
+            )
+        except:
+            print("FAILED to process logical line #{}, sha256={}, actual line(s)={}".format(
+                logical_line.logical_line_number(),
+                logical_line.sha256(),
+                str(logical_line.actual_line_numbers())
+            ))
+            raise
+    builder.save()
 
 
 def main(args):
     transpilation = Transpilation(args.transpilation_directory)
     transpilation.load()
     modules = transpilation.manifest().get_module_file_refs()
-    for module_ref in modules:
-        module_sha256 = module_ref["sha256"]
-        print("processing module: " + module_ref["filename"] + " (" + module_sha256 + ")")
-        builder = TokenizedLinesManifestBuilder(
-            args.transpilation_directory,
-            module_sha256
-        )
-        reader = ModuleLinesManifestReader(
-            args.transpilation_directory,
-            module_sha256
-        )
-        for logical_line in reader.logical_lines():
-            try:
-                builder.tokenize_logical_line(
-                    logical_line.sha256(),
-                    logical_line.content()
-                )
-            except:
-                print("FAILED to process logical line #{}, sha256={}, actual line(s)={}".format(
-                    logical_line.logical_line_number(),
-                    logical_line.sha256(),
-                    str(logical_line.actual_line_numbers())
-                ))
-                raise
-        builder.save()
+    cache = None
+    if not args.no_cache:
+        cache = MemoCache(args.transpilation_directory, "tokenized_lines", TOKENIZER_VERSION, transpilation.codec()).load()
+    try:
+        process_modules(process_module, modules, args.jobs, args.transpilation_directory, transpilation.codec(), cache)
+    finally:
+        # the lines processed before a failure are cached nonetheless
+        if cache is not None:
+            cache.save()
+            print(cache.statistics())
 
 
 if __name__ == "__main__":
@@ -45,6 +61,10 @@ if __name__ == "__main__":
         description='Tokenize previously collected module lines')
     parser.add_argument('-t', '--transpilation', dest='transpilation_directory', required=True,
                         help='The transpilation directory')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='Neither look up nor store tokens in the transpilation-wide cache')
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, default=1,
+                        help='The number of processes that modules are spread across (default: 1)')
     args = parser.parse_args()
 
     main(args)
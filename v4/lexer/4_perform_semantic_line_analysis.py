@@ -1,43 +1,72 @@
 #!/usr/local/bin/python3
 
-import copy
-
+from yapl.v4.lexer.shared.memo_cache import MemoCache
+from yapl.v4.lexer.shared.parallel import process_modules
 from yapl.v4.lexer.shared.transpilation import Transpilation
 from yapl.v4.lexer.shared.tokenized_lines.reader \
     import ManifestReader as TokenizedLinesManifestReader
 from yapl.v4.lexer.shared.semantic_lines.builder \
-    import ManifestBuilder as SemanticLinesManifestBuilder
+    import ManifestBuilder as SemanticLinesManifestBuilder, SEMANTIC_ANALYZER_VERSION, SemanticAnalysisStatistics
+
+
+def process_module(module_ref, transpilation_directory, codec, cache, stage_statistics):
+    module_sha256 = module_ref["sha256"]
+    print("processing module: " + module_ref["filename"] + " (" + module_sha256 + ")")
+    statistics = SemanticAnalysisStatistics() if stage_statistics is not None else None
+    builder = SemanticLinesManifestBuilder(
+        transpilation_directory,
+        module_sha256,
+        codec,
+        cache,
+        statistics
+    )
+    reader = TokenizedLinesManifestReader(
+        transpilation_directory,
+        module_sha256
+    )
+    for tokenized_line in reader.tokenized_lines():
+        try:
+            builder.process_line(
+                tokenized_line.sha256(),
+                tokenized_line.tokens()
+            )
+        except:
+            print("FAILED to process tokenized line sha256={}, tokens: {}".format(
+                tokenized_line.sha256(),
+                str(tokenized_line.tokens())
+            ))
+            raise
+    builder.save()
+    if statistics is not None:
+        print(statistics.summary())
+        stage_statistics.merge(statistics)
 
 
 def main(args):
     transpilation = Transpilation(args.transpilation_directory)
     transpilation.load()
     modules = transpilation.manifest().get_module_file_refs()
-    for module_ref in modules:
-        module_sha256 = module_ref["sha256"]
-        print("processing module: " + module_ref["filename"] + " (" + module_sha256 + ")")
-        builder = SemanticLinesManifestBuilder(
-            args.transpilation_directory,
-            module_sha256
-        )
-        reader = TokenizedLinesManifestReader(
+    cache = None
+    if not args.no_cache:
+        cache = MemoCache(args.transpilation_directory, "semantic_lines", SEMANTIC_ANALYZER_VERSION, transpilation.codec()).load()
+    statistics = SemanticAnalysisStatistics() if args.statistics else None
+    try:
+        process_modules(
+            process_module,
+            modules,
+            args.jobs,
             args.transpilation_directory,
-            module_sha256
+            transpilation.codec(),
+            cache,
+            statistics
         )
-        for tokenized_line in reader.tokenized_lines():
-            tokens_before = copy.copy(tokenized_line.tokens())
-            try:
-                builder.process_line(
-                    tokenized_line.sha256(),
-                    tokenized_line.tokens()
-                )
-            except:
-                print("FAILED to process tokenized line sha256={}, tokens: {}".format(
-                    tokenized_line.sha256(),
-                    str(tokens_before)
-                ))
-                raise
-        builder.save()
+    finally:
+        # the lines processed before a failure are cached nonetheless
+        if cache is not None:
+            cache.save()
+            print(cache.statistics())
+        if statistics is not None:
+            print(statistics.summary("semantic analysis, all modules"))
 
 
 if __name__ == "__main__":
@@ -47,6 +76,12 @@ if __name__ == "__main__":
         description='Performs semantic analysis on previously tokenized module lines')
     parser.add_argument('-t', '--transpilation', dest='transpilation_directory', required=True,
                         help='The transpilation directory')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='Neither look up nor store semantic tokens in the transpilation-wide cache')
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, default=1,
+                        help='The number of processes that modules are spread across (default: 1)')
+    parser.add_argument('--statistics', dest='statistics', action='store_true',
+                        help='Report how many semantic analyzers were attempted on the lines of each module, and of all modules')
     args = parser.parse_args()
 
     main(args)
@@ -0,0 +1,80 @@
+#!/usr/local/bin/python3
+
+import time
+import yaml
+
+from yapl.v4.lexer.shared.encoding import ALL_CODECS, get_codec
+from yapl.v4.lexer.shared.transpilation import Transpilation
+from yapl.v4.lexer.shared.module_lines.manifest.reader \
+    import ManifestReader as ModuleLinesManifestReader
+from yapl.v4.lexer.shared.tokenized_lines.reader \
+    import ManifestReader as TokenizedLinesManifestReader
+
+
+class PurePythonYamlCodec(object):
+    # the codec that the stages used before, for comparison
+
+    def name(self):
+        return "yaml (pure python)"
+
+    def encode(self, value):
+        return yaml.safe_dump(value).encode("utf-8")
+
+    def decode(self, data):
+        return yaml.safe_load(data)
+
+
+def collect_records(transpilation_directory):
+    transpilation = Transpilation(transpilation_directory)
+    transpilation.load()
+    records = []
+    for module_ref in transpilation.manifest().get_module_file_refs():
+        module_sha256 = module_ref["sha256"]
+        for logical_line in ModuleLinesManifestReader(transpilation_directory, module_sha256).logical_lines():
+            records.append(logical_line._contents)
+        for tokenized_line in TokenizedLinesManifestReader(transpilation_directory, module_sha256).tokenized_lines():
+            records.append(tokenized_line._contents)
+    return records
+
+
+def best_of(repeat, function, *args):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark_codec(codec, records, repeat):
+    encode_seconds, encoded = best_of(repeat, lambda: [codec.encode(record) for record in records])
+    decode_seconds, decoded = best_of(repeat, lambda: [codec.decode(data) for data in encoded])
+    assert decoded == records, "Expected the {} codec to round-trip the records".format(codec.name())
+    return encode_seconds, decode_seconds, sum(len(data) for data in encoded)
+
+
+def main(args):
+    records = collect_records(args.transpilation_directory)
+    print("{} records".format(len(records)))
+    print("{:<20} {:>12} {:>12} {:>12}".format("codec", "encode (ms)", "decode (ms)", "size (bytes)"))
+    codecs = [PurePythonYamlCodec()] + [get_codec(name) for name in ALL_CODECS]
+    for codec in codecs:
+        encode_seconds, decode_seconds, size = benchmark_codec(codec, records, args.repeat)
+        print("{:<20} {:>12.1f} {:>12.1f} {:>12}".format(codec.name(), encode_seconds * 1000, decode_seconds * 1000, size))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the codecs on the line records of a transpilation directory, which must have been '
+                    'processed up to and including 3_tokenize_lines.py')
+    parser.add_argument('-t', '--transpilation', dest='transpilation_directory', required=True,
+                        help='The transpilation directory')
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int, default=3,
+                        help='The number of timed repetitions, of which the best is reported')
+    args = parser.parse_args()
+
+    main(args)
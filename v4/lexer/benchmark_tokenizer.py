@@ -0,0 +1,50 @@
+#!/usr/local/bin/python3
+
+import time
+
+from yapl.v4.lexer.shared.tokenized_lines import reference_tokenizer, tokenizer
+from yapl.v4.lexer.shared.tokenized_lines.tokenizer_test import collect_logical_line_contents
+
+
+def best_of(repeat, function, *args):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def tokenize_all(tokenize, contents):
+    for logical_line_contents in contents:
+        tokenize(logical_line_contents)
+
+
+def main(args):
+    contents = collect_logical_line_contents(args.input_directory) * args.multiply
+    print("{} logical lines".format(len(contents)))
+    print("{:<24} {:>12} {:>14}".format("tokenizer", "time (ms)", "lines/sec"))
+    for name, tokenize in (
+        ("reference_tokenizer.py", reference_tokenizer.tokenize),
+        ("tokenizer.py", tokenizer.tokenize)
+    ):
+        seconds = best_of(args.repeat, tokenize_all, tokenize, contents)
+        print("{:<24} {:>12.1f} {:>14.0f}".format(name, seconds * 1000, len(contents) / seconds))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the tokenizer against the reference tokenizer on the logical lines of the YAPL '
+                    'modules in a directory')
+    parser.add_argument('-i', '--input', dest='input_directory', required=True,
+                        help='the directory to process YAPL packages within')
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int, default=3,
+                        help='The number of timed repetitions, of which the best is reported')
+    parser.add_argument('-m', '--multiply', dest='multiply', type=int, default=10,
+                        help='The number of times that the logical lines are tokenized per repetition')
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,215 @@
+import json
+import lzma
+import struct
+import zlib
+import yaml
+
+# The codecs that manifests and line records are encoded with. A codec is named by its encoding, optionally followed
+# by a compression, e.g. "yaml", "json+zlib" or "binary+lzma". The codec of a transpilation directory is chosen when
+# its modules are collected, and recorded in its top-level manifest.
+
+try:
+    YAML_LOADER = yaml.CSafeLoader
+    YAML_DUMPER = yaml.CSafeDumper
+except AttributeError:
+    YAML_LOADER = yaml.SafeLoader
+    YAML_DUMPER = yaml.SafeDumper
+
+DEFAULT_CODEC = "yaml"
+
+
+def yaml_load(stream):
+    return yaml.load(stream, Loader=YAML_LOADER)
+
+
+def yaml_dump(data, stream=None):
+    return yaml.dump(data, stream, Dumper=YAML_DUMPER)
+
+
+def encode_yaml(value):
+    return yaml_dump(value).encode("utf-8")
+
+
+def decode_yaml(data):
+    return yaml_load(bytes(data))
+
+
+def encode_json(value):
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(data):
+    return json.loads(bytes(data))
+
+
+# The binary encoding tags each value with one byte, followed by its payload: integers and lengths are stored as
+# (zig-zag encoded) varints, strings as their length and UTF-8 bytes, lists as their length and items, and dicts as
+# their length and alternating keys and values. A string that occurs again within the same record, e.g. a dict key
+# or a token name, is stored as the varint index of its first occurrence instead.
+
+FLOAT = struct.Struct("<d")
+
+
+def encode_varint(n, out):
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def encode_binary_value(value, out, strings):
+    if value is None:
+        out.append(0x4e)  # N
+    elif value is True:
+        out.append(0x54)  # T
+    elif value is False:
+        out.append(0x46)  # F
+    elif isinstance(value, int):
+        out.append(0x49)  # I
+        encode_varint((value << 1) if value >= 0 else ((-value << 1) - 1), out)
+    elif isinstance(value, float):
+        out.append(0x52)  # R
+        out += FLOAT.pack(value)
+    elif isinstance(value, str):
+        index = strings.get(value)
+        if index is not None:
+            out.append(0x50)  # P
+            encode_varint(index, out)
+        else:
+            strings[value] = len(strings)
+            encoded = value.encode("utf-8")
+            out.append(0x53)  # S
+            encode_varint(len(encoded), out)
+            out += encoded
+    elif isinstance(value, list):
+        out.append(0x4c)  # L
+        encode_varint(len(value), out)
+        for item in value:
+            encode_binary_value(item, out, strings)
+    elif isinstance(value, dict):
+        out.append(0x44)  # D
+        encode_varint(len(value), out)
+        for k, v in value.items():
+            encode_binary_value(k, out, strings)
+            encode_binary_value(v, out, strings)
+    else:
+        raise TypeError("cannot encode a {} with the binary codec".format(type(value).__name__))
+
+
+def encode_binary(value):
+    out = bytearray()
+    encode_binary_value(value, out, {})
+    return bytes(out)
+
+
+def decode_varint(data, offset):
+    n = 0
+    shift = 0
+    while True:
+        b = data[offset]
+        offset += 1
+        n |= (b & 0x7f) << shift
+        if b < 0x80:
+            return n, offset
+        shift += 7
+
+
+def decode_binary_value(data, offset, strings):
+    tag = data[offset]
+    offset += 1
+    if tag == 0x50:
+        index, offset = decode_varint(data, offset)
+        return strings[index], offset
+    if tag == 0x53:
+        length, offset = decode_varint(data, offset)
+        s = str(data[offset:offset + length], "utf-8")
+        strings.append(s)
+        return s, offset + length
+    if tag == 0x44:
+        count, offset = decode_varint(data, offset)
+        result = {}
+        for _ in range(count):
+            k, offset = decode_binary_value(data, offset, strings)
+            result[k], offset = decode_binary_value(data, offset, strings)
+        return result, offset
+    if tag == 0x4c:
+        count, offset = decode_varint(data, offset)
+        result = []
+        for _ in range(count):
+            item, offset = decode_binary_value(data, offset, strings)
+            result.append(item)
+        return result, offset
+    if tag == 0x49:
+        n, offset = decode_varint(data, offset)
+        return (n >> 1) if not (n & 1) else -((n + 1) >> 1), offset
+    if tag == 0x4e:
+        return None, offset
+    if tag == 0x54:
+        return True, offset
+    if tag == 0x46:
+        return False, offset
+    if tag == 0x52:
+        return FLOAT.unpack_from(data, offset)[0], offset + FLOAT.size
+    raise ValueError("unknown binary codec tag {:#x} at offset {}".format(tag, offset - 1))
+
+
+def decode_binary(data):
+    value, offset = decode_binary_value(bytes(data), 0, [])
+    assert offset == len(data), "Expected the binary record to end after its value"
+    return value
+
+
+ENCODINGS = {
+    "yaml": (encode_yaml, decode_yaml),
+    "json": (encode_json, decode_json),
+    "binary": (encode_binary, decode_binary)
+}
+
+COMPRESSIONS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress)
+}
+
+ALL_CODECS = [
+    encoding + ("+" + compression if compression else "")
+    for encoding in ENCODINGS
+    for compression in [None] + list(COMPRESSIONS)
+]
+
+
+class Codec(object):
+
+    def __init__(self, name):
+        encoding, _, compression = name.partition("+")
+        assert encoding in ENCODINGS, "Unknown encoding '{}', expected one of {}".format(encoding, ", ".join(ENCODINGS))
+        assert not compression or compression in COMPRESSIONS, \
+            "Unknown compression '{}', expected one of {}".format(compression, ", ".join(COMPRESSIONS))
+        self.__name = name
+        self.__encode, self.__decode = ENCODINGS[encoding]
+        self.__compress, self.__decompress = COMPRESSIONS[compression] if compression else (None, None)
+
+    def name(self):
+        return self.__name
+
+    def encode(self, value):
+        data = self.__encode(value)
+        if self.__compress is not None:
+            data = self.__compress(data)
+        return data
+
+    def decode(self, data):
+        if self.__decompress is not None:
+            data = self.__decompress(data)
+        return self.__decode(data)
+
+
+CODECS = {}
+
+
+def get_codec(name=None):
+    if name is None:
+        name = DEFAULT_CODEC
+    codec = CODECS.get(name)
+    if codec is None:
+        codec = CODECS[name] = Codec(name)
+    return codec
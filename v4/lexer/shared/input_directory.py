@@ -0,0 +1,23 @@
+import os
+from yapl.v4.lexer.shared.file_reference import to_file_reference
+
+
+class InputDirectory(object):
+
+    def __init__(self, input_directory):
+        self.input_directory = os.path.abspath(input_directory)
+
+    def __enumerate(self, path):
+        for subpath in os.listdir(path):
+            fullpath = os.path.join(path, subpath)
+            if os.path.isdir(fullpath):
+                for each in self.__enumerate(fullpath):
+                    yield each
+            elif os.path.isfile(fullpath):
+                extension = os.path.splitext(subpath)[1]
+                if extension == ".yapl":
+                    yield fullpath
+
+    def get_module_file_references(self):
+        for module_filename in self.__enumerate(self.input_directory):
+            yield to_file_reference(self.input_directory, module_filename)
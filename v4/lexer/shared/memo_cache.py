@@ -0,0 +1,136 @@
+import os
+
+from yapl.v4.lexer.shared.segments import SegmentFileReader, SegmentFileWriter
+
+# A transpilation-wide cache of the results of a stage, keyed by the sha256 of the logical line that they were computed
+# from, so that a line that occurs more than once, in any module, is only processed once. The cache of each stage is
+# kept in a segment file in the cache directory of the transpilation, and is discarded when the version of the stage
+# differs from the one that the cache was written by.
+#
+# A cache that is handed to a worker process is copied without its entries, and reloaded from its segment file by the
+# worker. The entries that the worker adds are taken from it with take_delta() and merged into the cache of the parent
+# with merge_delta(), so that only the parent saves the cache.
+
+
+class MemoCache(object):
+
+    def __init__(self, transpilation_directory, name, version, codec=None):
+        self.__name = name
+        self.__version = version
+        self.__codec = codec
+        self.__filename = os.path.join(transpilation_directory, "cache", name + ".segments")
+        self.__segments = None
+        self.__new_entries = {}
+        self.__changed = False
+        self.__hits = 0
+        self.__misses = 0
+
+    def __getstate__(self):
+        return {
+            "name": self.__name,
+            "version": self.__version,
+            "codec": self.__codec,
+            "filename": self.__filename,
+            "loaded": self.__segments is not None
+        }
+
+    def __setstate__(self, state):
+        self.__name = state["name"]
+        self.__version = state["version"]
+        self.__codec = state["codec"]
+        self.__filename = state["filename"]
+        self.__segments = None
+        self.__new_entries = {}
+        self.__changed = False
+        self.__hits = 0
+        self.__misses = 0
+        if state["loaded"]:
+            self.load()
+
+    def load(self):
+        if not os.path.exists(self.__filename):
+            return self
+        segments = SegmentFileReader(self.__filename)
+        if segments.manifest()["version"] == self.__version:
+            self.__segments = segments
+            self.__codec = segments.codec().name()
+        else:
+            segments.close()
+        return self
+
+    def lookup(self, line_sha256):
+        entry = self.__new_entries.get(line_sha256)
+        if entry is None and self.__segments is not None and line_sha256 in self.__segments:
+            entry = self.__new_entries[line_sha256] = self.__segments.get(line_sha256)
+        if entry is None:
+            self.__misses += 1
+        else:
+            self.__hits += 1
+        return entry
+
+    def store(self, line_sha256, entry):
+        self.__new_entries[line_sha256] = entry
+        self.__changed = True
+
+    def get_or_compute(self, line_sha256, compute, *args):
+        entry = self.lookup(line_sha256)
+        if entry is None:
+            entry = compute(*args)
+            self.store(line_sha256, entry)
+        return entry
+
+    def take_delta(self):
+        # the entries stored since the cache was loaded, and the lookups made, which are reset
+        entries = dict(
+            (line_sha256, entry)
+            for line_sha256, entry in self.__new_entries.items()
+            if self.__segments is None or line_sha256 not in self.__segments
+        )
+        delta = (entries, self.__hits, self.__misses)
+        self.__hits = 0
+        self.__misses = 0
+        return delta
+
+    def merge_delta(self, delta):
+        entries, hits, misses = delta
+        for line_sha256, entry in entries.items():
+            if line_sha256 not in self.__new_entries:
+                self.store(line_sha256, entry)
+        self.__hits += hits
+        self.__misses += misses
+
+    def hits(self):
+        return self.__hits
+
+    def misses(self):
+        return self.__misses
+
+    def statistics(self):
+        lookups = self.__hits + self.__misses
+        return "{} cache: {} hits, {} misses ({:.1%} hit rate), {} entries".format(
+            self.__name,
+            self.__hits,
+            self.__misses,
+            self.__hits / lookups if lookups else 0.0,
+            len(self)
+        )
+
+    def __len__(self):
+        keys = set(self.__new_entries)
+        if self.__segments is not None:
+            keys.update(self.__segments.keys())
+        return len(keys)
+
+    def save(self):
+        if not self.__changed:
+            return
+        with SegmentFileWriter(self.__filename, self.__codec) as segments:
+            if self.__segments is not None:
+                for line_sha256 in self.__segments.keys():
+                    segments.append_encoded(line_sha256, self.__segments.get_encoded(line_sha256))
+            for line_sha256, entry in self.__new_entries.items():
+                segments.append(line_sha256, entry)
+            segments.close({
+                "name": self.__name,
+                "version": self.__version
+            })
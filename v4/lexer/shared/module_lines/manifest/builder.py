@@ -1,17 +1,18 @@
-import os
 import io
-import yaml
 import hashlib
 import base64
 
 from yapl.v4.lexer.shared.module_lines.manifest.actual_line import ActualLineBuilder
 from yapl.v4.lexer.shared.module_lines.manifest.base import ManifestBase
+from yapl.v4.lexer.shared.module_lines.manifest.reader import LogicalLine
+from yapl.v4.lexer.shared.segments import SegmentFileWriter
 
 
 class ManifestBuilder(ManifestBase):
 
-    def __init__(self, transpilation_directory, sha256):
+    def __init__(self, transpilation_directory, sha256, codec=None):
         super().__init__(transpilation_directory, sha256)
+        self._codec = codec
         self._actual_lines = []
         self._actual_line_content = {}
         self._logical_lines = []
@@ -112,9 +113,11 @@ class ManifestBuilder(ManifestBase):
             return l[-1] + r[1:]
         return None
 
+    def logical_lines(self):
+        for logical_line in self._logical_lines:
+            yield LogicalLine(logical_line)
+
     def save(self):
-        os.makedirs(self._actual_lines_directory, mode=0o777, exist_ok=True)
-        os.makedirs(self._logical_lines_directory, mode=0o777, exist_ok=True)
         actual_lines_manifest = {
             "module": {
                 "sha256": self._module_sha256
@@ -127,15 +130,11 @@ class ManifestBuilder(ManifestBase):
             },
             "logical_lines": [l["sha256"] for l in self._logical_lines]
         }
-        with io.open(self._actual_lines_manifest, 'w') as manifest_file:
-            yaml.safe_dump(actual_lines_manifest, manifest_file)
-        for k, v in self._actual_line_content.items():
-            filename = os.path.join(self._actual_lines_directory, k + ".txt")
-            with io.open(filename, 'w') as manifest_file:
-                manifest_file.write(v)
-        with io.open(self._logical_lines_manifest, 'w') as manifest_file:
-            yaml.safe_dump(logical_lines_manifest, manifest_file)
-        for k, v in self._logical_line_content.items():
-            filename = os.path.join(self._logical_lines_directory, k + ".yaml")
-            with io.open(filename, 'w') as manifest_file:
-                yaml.safe_dump(v, manifest_file)
+        with SegmentFileWriter(self._actual_lines_segments, self._codec) as segments:
+            for k, v in self._actual_line_content.items():
+                segments.append(k, v)
+            segments.close(actual_lines_manifest)
+        with SegmentFileWriter(self._logical_lines_segments, self._codec) as segments:
+            for k, v in self._logical_line_content.items():
+                segments.append(k, v)
+            segments.close(logical_lines_manifest)
@@ -1,53 +1,43 @@
-import io
 import codecs
-import os
-import yaml
 from yapl.v4.lexer.shared.module_lines.manifest.base import ManifestBase
+from yapl.v4.lexer.shared.segments import SegmentFileReader
 
 
 class LinesManifestReader(object):
 
-    def __init__(self, module_sha256, manifest_filename, lines_name):
+    def __init__(self, module_sha256, segments_filename, lines_name):
         self._module_sha256 = module_sha256
-        self._manifest_filename = manifest_filename
-        self._manifest_directory = os.path.dirname(manifest_filename)
-        with io.open(manifest_filename, 'r') as manifest_file:
-            contents = yaml.safe_load(manifest_file)
-            assert contents["module"]["sha256"] == module_sha256, \
-                "Expected the sha256 of the manifest.yaml file to match the module sha256"
-            self._line_shas = contents[lines_name]
+        self._segments = SegmentFileReader(segments_filename)
+        contents = self._segments.manifest()
+        assert contents["module"]["sha256"] == module_sha256, \
+            "Expected the sha256 of the segments manifest to match the module sha256"
+        self._line_shas = contents[lines_name]
 
     def __len__(self):
         return len(self._line_shas)
 
-    def _filename_of_line(self, line_sha256, extension):
-        if not extension.startswith("."):
-            extension = "." + extension
-        return os.path.join(self._manifest_directory, line_sha256) + extension
+    def _line_record(self, line_sha256):
+        return self._segments.get(line_sha256)
 
 
 class ActualLineReader(object):
 
-    def __init__(self, sha, filename):
+    def __init__(self, sha, record):
         self._sha = sha
-        self._filename = filename
-        self._contents = None
+        self._contents = record
 
     def contents(self):
-        if self._contents is None:
-            with io.open(self._filename, "r") as file:
-                self._contents = file.read()
         return self._contents
 
 
 class ActualLinesManifestReader(LinesManifestReader):
 
-    def __init__(self, module_sha256, manifest_filename):
-        super().__init__(module_sha256, manifest_filename, "actual_lines")
+    def __init__(self, module_sha256, segments_filename):
+        super().__init__(module_sha256, segments_filename, "actual_lines")
 
     def lines(self):
         for line_sha in self._line_shas:
-            yield ActualLineReader(line_sha, self._filename_of_line(line_sha, ".txt")).contents()
+            yield ActualLineReader(line_sha, self._line_record(line_sha)).contents()
 
 
 class LogicalLine(object):
@@ -83,28 +73,24 @@ class LogicalLine(object):
 
 class LogicalLineReader(object):
 
-    def __init__(self, sha, filename):
+    def __init__(self, sha, record):
         self._sha = sha
-        self._filename = filename
-        self._manifest_contents = None
+        self._manifest_contents = record
 
     def contents(self):
-        if self._manifest_contents is None:
-            with io.open(self._filename, 'r') as manifest_file:
-                self._manifest_contents = yaml.safe_load(manifest_file)
-                assert self._manifest_contents["sha256"] == self._sha, \
-                    "Expected the sha256 of the line.yaml file to match the line sha256"
+        assert self._manifest_contents["sha256"] == self._sha, \
+            "Expected the sha256 of the line record to match the line sha256"
         return LogicalLine(self._manifest_contents)
 
 
 class LogicalLinesManifestReader(LinesManifestReader):
 
-    def __init__(self, module_sha256, manifest_filename):
-        super().__init__(module_sha256, manifest_filename, "logical_lines")
+    def __init__(self, module_sha256, segments_filename):
+        super().__init__(module_sha256, segments_filename, "logical_lines")
 
     def lines(self):
         for line_sha in self._line_shas:
-            yield LogicalLineReader(line_sha, self._filename_of_line(line_sha, ".yaml")).contents()
+            yield LogicalLineReader(line_sha, self._line_record(line_sha)).contents()
 
 
 class ManifestReader(ManifestBase):
@@ -118,7 +104,7 @@ class ManifestReader(ManifestBase):
         if self._actual_lines is None:
             self._actual_lines = ActualLinesManifestReader(
                 self._module_sha256,
-                self._actual_lines_manifest
+                self._actual_lines_segments
             )
         for line in self._actual_lines.lines():
             yield line
@@ -127,7 +113,7 @@ class ManifestReader(ManifestBase):
         if self._logical_lines is None:
             self._logical_lines = LogicalLinesManifestReader(
                 self._module_sha256,
-                self._logical_lines_manifest
+                self._logical_lines_segments
             )
         for line in self._logical_lines.lines():
             yield line
@@ -1,8 +1,9 @@
 import os
 import io
-import yaml
 import hashlib
 
+from yapl.v4.lexer.shared.encoding import DEFAULT_CODEC, get_codec, yaml_dump, yaml_load
+
 
 class Manifest(object):
 
@@ -11,12 +12,15 @@ class Manifest(object):
         self.__manifest_filename = os.path.join(self.__modules_directory, "manifest.yaml")
         self.__manifest_dict = None
         self.__module_file_refs = []
+        self.__codec = DEFAULT_CODEC
 
     def load(self):
         os.makedirs(self.__modules_directory, mode=0o777, exist_ok=True)
         with io.open(self.__manifest_filename, 'r') as manifest_file:
-            manifest_dict = yaml.safe_load(manifest_file)
+            manifest_dict = yaml_load(manifest_file)
             self.__module_file_refs = manifest_dict["modules"]
+            # transpilation directories that predate codecs were written with YAML
+            self.__codec = manifest_dict.get("codec", DEFAULT_CODEC)
 
     def save(self):
         os.makedirs(self.__modules_directory, mode=0o777, exist_ok = True)
@@ -40,9 +44,10 @@ class Manifest(object):
         manifest_dict["manifest"] = {
             "sha256": self.__calculate_manifest_sha256()
         }
+        manifest_dict["codec"] = self.__codec
         self.__manifest_dict = manifest_dict
         with io.open(self.__manifest_filename, 'w') as manifest_file:
-            yaml.safe_dump(self.__manifest_dict, manifest_file)
+            yaml_dump(self.__manifest_dict, manifest_file)
 
     def __calculate_manifest_sha256(self):
         stuff = [
@@ -55,6 +60,12 @@ class Manifest(object):
             h.update(s.encode("utf-8"))
         return h.hexdigest()
 
+    def set_codec(self, codec):
+        self.__codec = get_codec(codec).name()
+
+    def get_codec(self):
+        return self.__codec
+
     def add_module_file_refs(self, module_file_references):
         self.__module_file_refs.extend(module_file_references)
 
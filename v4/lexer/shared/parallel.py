@@ -0,0 +1,76 @@
+import collections
+import contextlib
+import io
+import sys
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+
+# Spreads the modules of a stage across a pool of processes. Every module is processed by calling
+# process_module(module_ref, *args) in a worker, with the worker's output captured, and the output of the modules is
+# printed in module order, so that a run prints the same as a sequential run, up to and including the first module
+# that failed. No more modules are in flight than there are workers, so that little work is wasted, and few outputs
+# are written, past a module that failed. The args that take deltas, i.e. the memo caches and the statistics, are
+# copied to the workers, and what each worker adds to them is merged back into the args of the parent, e.g. the
+# entries of a memo cache, which the parent saves.
+
+
+class ModuleProcessingError(Exception):
+
+    def __init__(self, module_ref, worker_traceback):
+        super(ModuleProcessingError, self).__init__(
+            "FAILED to process module {} ({}), in a worker process:\n\n{}".format(
+                module_ref["filename"],
+                module_ref["sha256"],
+                worker_traceback
+            )
+        )
+        self.module_ref = module_ref
+        self.worker_traceback = worker_traceback
+
+
+def takes_delta(arg):
+    return callable(getattr(arg, "take_delta", None))
+
+
+def process_module_in_worker(process_module, module_ref, args):
+    output = io.StringIO()
+    worker_traceback = None
+    with contextlib.redirect_stdout(output):
+        try:
+            process_module(module_ref, *args)
+        except Exception:
+            worker_traceback = traceback.format_exc()
+    deltas = [arg.take_delta() for arg in args if takes_delta(arg)]
+    return output.getvalue(), deltas, worker_traceback
+
+
+def process_modules(process_module, module_refs, jobs, *args):
+    if jobs is None or jobs <= 1:
+        for module_ref in module_refs:
+            process_module(module_ref, *args)
+        return
+    merged_args = [arg for arg in args if takes_delta(arg)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # no more modules are submitted than there are workers, so that when a module fails, fewer modules than there
+        # are workers, that follow it, have been processed and have written their outputs, and the others never start
+        pending = collections.deque()
+        for module_ref in module_refs:
+            pending.append((module_ref, executor.submit(process_module_in_worker, process_module, module_ref, args)))
+            if len(pending) == jobs:
+                process_next_result(pending, merged_args)
+        while pending:
+            process_next_result(pending, merged_args)
+
+
+def process_next_result(pending, merged_args):
+    module_ref, future = pending.popleft()
+    output, deltas, worker_traceback = future.result()
+    sys.stdout.write(output)
+    sys.stdout.flush()
+    for arg, delta in zip(merged_args, deltas):
+        arg.merge_delta(delta)
+    if worker_traceback is not None:
+        for _, running in pending:
+            running.cancel()
+        raise ModuleProcessingError(module_ref, worker_traceback)
@@ -0,0 +1,140 @@
+import io
+import os
+import mmap
+import struct
+import tempfile
+
+from yapl.v4.lexer.shared.encoding import get_codec
+
+# A segment file packs the records of one module and stage into a single file:
+#
+#   header:   MAGIC, version, the name of the codec that the records are encoded with, offset and length of the
+#             manifest record, offset and count of the index entries
+#   data:     the encoded records, appended back to back, each stored once per sha256
+#   manifest: the record that the stage manifest used to be stored in, listing the record sha256s in order
+#   index:    one (sha256 digest, offset, length) entry per record, sorted by digest
+#
+# so that all records of a module can be read through one open() and one mmap().
+
+MAGIC = b"YAPLSEG\0"
+VERSION = 2
+HEADER = struct.Struct("<8sI16sQIQI")
+INDEX_ENTRY = struct.Struct("<32sQI")
+
+
+def current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+class SegmentFileWriter(object):
+
+    def __init__(self, filename, codec=None):
+        self.__filename = filename
+        self.__codec = get_codec(codec)
+        directory = os.path.dirname(filename)
+        os.makedirs(directory, mode=0o777, exist_ok=True)
+        fd, self.__temporary_filename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        self.__file = io.open(fd, "wb")
+        self.__file.write(b"\0" * HEADER.size)
+        self.__offset = HEADER.size
+        self.__index = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+
+    def __append(self, data):
+        offset = self.__offset
+        self.__file.write(data)
+        self.__offset += len(data)
+        return offset
+
+    def __contains__(self, sha256):
+        return sha256 in self.__index
+
+    def append(self, sha256, record):
+        if sha256 in self.__index:
+            return
+        self.append_encoded(sha256, self.__codec.encode(record))
+
+    def append_encoded(self, sha256, data):
+        # appends a record that was already encoded with this writer's codec, e.g. copied from another segment file
+        if sha256 in self.__index:
+            return
+        self.__index[sha256] = (self.__append(data), len(data))
+
+    def close(self, manifest):
+        manifest_data = self.__codec.encode(manifest)
+        manifest_offset = self.__append(manifest_data)
+        index_offset = self.__offset
+        for sha256 in sorted(self.__index):
+            offset, length = self.__index[sha256]
+            self.__file.write(INDEX_ENTRY.pack(bytes.fromhex(sha256), offset, length))
+        self.__file.seek(0)
+        self.__file.write(HEADER.pack(MAGIC, VERSION, self.__codec.name().encode("ascii"), manifest_offset, len(manifest_data), index_offset, len(self.__index)))
+        self.__file.close()
+        os.chmod(self.__temporary_filename, 0o666 & ~current_umask())
+        os.replace(self.__temporary_filename, self.__filename)
+
+    def abort(self):
+        self.__file.close()
+        os.unlink(self.__temporary_filename)
+
+
+class SegmentFileReader(object):
+
+    def __init__(self, filename):
+        self.__filename = filename
+        with io.open(filename, "rb") as f:
+            self.__data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, codec_name, self.__manifest_offset, self.__manifest_length, index_offset, index_count = \
+            HEADER.unpack_from(self.__data, 0)
+        assert magic == MAGIC and version == VERSION, \
+            "Expected {} to be a segment file of version {}".format(filename, VERSION)
+        self.__codec = get_codec(codec_name.rstrip(b"\0").decode("ascii"))
+        self.__index_offset = index_offset
+        self.__index_count = index_count
+        self.__index = None
+
+    def __len__(self):
+        return self.__index_count
+
+    def codec(self):
+        return self.__codec
+
+    def manifest(self):
+        return self.__codec.decode(self.__data[self.__manifest_offset:self.__manifest_offset + self.__manifest_length])
+
+    def __load_index(self):
+        index_end = self.__index_offset + self.__index_count * INDEX_ENTRY.size
+        self.__index = dict(
+            (digest.hex(), (offset, length))
+            for digest, offset, length in INDEX_ENTRY.iter_unpack(self.__data[self.__index_offset:index_end])
+        )
+
+    def __contains__(self, sha256):
+        if self.__index is None:
+            self.__load_index()
+        return sha256 in self.__index
+
+    def keys(self):
+        if self.__index is None:
+            self.__load_index()
+        return self.__index.keys()
+
+    def get(self, sha256):
+        return self.__codec.decode(self.get_encoded(sha256))
+
+    def get_encoded(self, sha256):
+        if self.__index is None:
+            self.__load_index()
+        offset, length = self.__index[sha256]
+        return self.__data[offset:offset + length]
+
+    def close(self):
+        self.__data.close()
@@ -1,10 +1,13 @@
 import collections
-import copy
 import os
-import io
-import yaml
 
 from yapl.v4.lexer.shared.semantic_lines.base import ManifestBase
+from yapl.v4.lexer.shared.semantic_lines.patterns import \
+    AnalyzerDispatchTable, Pattern, TokenCursor, keyword, one_of, semantic_peek, semantic_peek_alternatives, starts_with, \
+    symbol, token_kind
+from yapl.v4.lexer.shared.segments import SegmentFileWriter
+from yapl.v4.lexer.shared.sha256 import calculate_sha256_of_file, calculate_sha256_of_string
+from yapl.v4.lexer.shared.tokenized_lines.builder import TOKENIZER_VERSION
 
 SemanticLine = collections.namedtuple(
     "SemanticLine", [
@@ -13,121 +16,62 @@ SemanticLine = collections.namedtuple(
     ]
 )
 
+IDENTIFIER = token_kind("IDENTIFIER")
+BASIC_TYPE = token_kind("BASIC_TYPE")
+LEADING_MULTI_LINE_COMMENT = token_kind("LEADING_MULTI_LINE_COMMENT")
+LEADING_SINGLE_LINE_COMMENT = token_kind("LEADING_SINGLE_LINE_COMMENT")
+TRAILING_COMMENT = token_kind("INLINE_COMMENT")
+LITERAL = token_kind("STRING_LITERAL", "INTEGER_LITERAL", "BOOLEAN_LITERAL")
+IDENTIFIER_OR_LITERAL = one_of(IDENTIFIER, LITERAL)
+INFIX_OPERATOR = token_kind("INFIX_COMPARISON_OPERATOR", "INFIX_LOGICAL_OPERATOR", "INFIX_MATHEMATICAL_OPERATOR")
+CONSTRAINT = token_kind("CONSTRAINT")
 
-def peek(n, input_tokens):
-    if len(input_tokens) < n:
-        return None
-    return input_tokens[:n]
 
-
-def is_identifier(t):
-    return t["token"] == "IDENTIFIER"
-
-
-def is_keyword(t, s):
-    return t["token"] == "KEYWORD" and t["value"] == s.upper()
-
-
-def is_basic_type(t):
-    return t["token"] == "BASIC_TYPE"
-
-
-def is_symbol(t, s):
-    return t["token"] == "SYMBOL" and t["value"] == s
-
-
-def is_leading_multi_line_comment(t):
-    return t["token"] == "LEADING_MULTI_LINE_COMMENT"
-
-
-def is_leading_single_line_comment(t):
-    return t["token"] == "LEADING_SINGLE_LINE_COMMENT"
-
-
-def is_inline_comment(t):
-    return t["token"] == "INLINE_COMMENT"
-
-
-def is_literal(t):
-    return t["token"] in ("STRING_LITERAL", "INTEGER_LITERAL", "BOOLEAN_LITERAL")
-
-
-def is_identifier_or_literal(t):
-    return is_identifier(t) or is_literal(t)
-
-
-def is_infix_comparison_operator(t):
-    return t["token"] == "INFIX_COMPARISON_OPERATOR"
-
-
-def is_infix_logical_operator(t):
-    return t["token"] == "INFIX_LOGICAL_OPERATOR"
-
-
-def is_infix_mathematical_operator(t):
-    return t["token"] == "INFIX_MATHEMATICAL_OPERATOR"
-
-
-def is_infix_operator(t):
-    return is_infix_comparison_operator(t) or is_infix_logical_operator(t) or is_infix_mathematical_operator(t)
-
-
-def is_constraint(t):
-    return t["token"] == "CONSTRAINT"
-
-
-def is_trailing_comment(t):
-    return t["token"] == "INLINE_COMMENT"
-
-
-def semantic_peek(analysers, input_tokens):
-    peeked_input_tokens = peek(len(analysers), input_tokens)
-    if peeked_input_tokens is not None:
-        values = []
-        for i in range(len(analysers)):
-            t = input_tokens[i]
-            if not analysers[i](t):
-                return None
-            if "value" in t:
-                values.append(t["value"])
-            else:
-                values.append(None)
-        del input_tokens[:len(analysers)]
-        return values
-    return None
+LEADING_COMMENT_PATTERN = Pattern(
+    [LEADING_SINGLE_LINE_COMMENT]
+)
 
 
-def leading_comment(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_single_line_comment,
-    ], input_tokens)
+@starts_with(LEADING_SINGLE_LINE_COMMENT)
+def leading_comment(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(LEADING_COMMENT_PATTERN, cursor)
     if peeked_values is not None:
         cv = peeked_values
         output_semantic_tokens.append({
             "token": "LEADING_COMMENT",
             "leading_docstring": cv
         })
-    return input_tokens
 
 
-def semantic_identifier(input_tokens, output_semantic_tokens):
+SEMANTIC_IDENTIFIER_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, IDENTIFIER],
+    [IDENTIFIER]
+)
+SEMANTIC_IDENTIFIER_TYPE_PATTERN = Pattern(
+    [symbol(":"), one_of(BASIC_TYPE, IDENTIFIER)]
+)
+SEMANTIC_IDENTIFIER_CONSTRAINT_PATTERN = Pattern(
+    [CONSTRAINT]
+)
+SEMANTIC_IDENTIFIER_TRAILING_COMMENT_PATTERN = Pattern(
+    [TRAILING_COMMENT]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT, IDENTIFIER)
+def semantic_identifier(cursor, output_semantic_tokens):
     appended = None
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        is_identifier,
-    ], input_tokens)
-    if peeked_values is not None:
-        cv, iv = peeked_values
-        appended = {
-            "token": "SEMANTIC_IDENTIFIER",
-            "identifier": iv,
-            "leading_docstring": cv
-        }
-    else:
-        peeked_values = semantic_peek([
-            is_identifier
-        ], input_tokens)
-        if peeked_values is not None:
+    matched = semantic_peek_alternatives(SEMANTIC_IDENTIFIER_PATTERN, cursor)
+    if matched is not None:
+        alternative, peeked_values = matched
+        if alternative == 0:
+            cv, iv = peeked_values
+            appended = {
+                "token": "SEMANTIC_IDENTIFIER",
+                "identifier": iv,
+                "leading_docstring": cv
+            }
+        else:
             iv = peeked_values[0]
             appended = {
                 "token": "SEMANTIC_IDENTIFIER",
@@ -135,83 +79,75 @@ def semantic_identifier(input_tokens, output_semantic_tokens):
             }
     if appended is not None:
         output_semantic_tokens.append(appended)
-        peeked_values = semantic_peek([
-            lambda t: is_symbol(t, ":"),
-            lambda t: is_one_of(t, [
-                is_basic_type,
-                is_identifier
-            ])
-        ], input_tokens)
+        peeked_values = semantic_peek(SEMANTIC_IDENTIFIER_TYPE_PATTERN, cursor)
         if peeked_values is not None:
             appended["type"] = peeked_values[1]
-        if input_tokens:
-            peeked_values = semantic_peek([
-                is_constraint
-            ], input_tokens)
+        if cursor:
+            peeked_values = semantic_peek(SEMANTIC_IDENTIFIER_CONSTRAINT_PATTERN, cursor)
             if peeked_values is not None:
                 appended["constraint"] = peeked_values[0]
-        if input_tokens:
-            peeked_values = semantic_peek([
-                is_trailing_comment
-            ], input_tokens)
+        if cursor:
+            peeked_values = semantic_peek(SEMANTIC_IDENTIFIER_TRAILING_COMMENT_PATTERN, cursor)
             if peeked_values is not None:
                 appended["trailing_docstring"] = peeked_values[0]
-    return input_tokens
 
 
-def renamed_return_value(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_keyword(t, "return"),
-        is_identifier,
-        lambda t: is_symbol(t, "=")
-    ], input_tokens)
+RENAMED_RETURN_VALUE_PATTERN = Pattern(
+    [keyword("return"), IDENTIFIER, symbol("=")]
+)
+
+
+@starts_with(keyword("return"))
+def renamed_return_value(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(RENAMED_RETURN_VALUE_PATTERN, cursor)
     if peeked_values is not None:
         _, iv, _ = peeked_values
         output_semantic_tokens.append({
             "token": "RENAMED_RETURN_VALUE",
             "name": iv
         })
-    return input_tokens
 
 
-def correctly_named_return_value(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_keyword(t, "return"),
-        is_identifier
-    ], input_tokens)
+CORRECTLY_NAMED_RETURN_VALUE_PATTERN = Pattern(
+    [keyword("return"), IDENTIFIER]
+)
+
+
+@starts_with(keyword("return"))
+def correctly_named_return_value(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(CORRECTLY_NAMED_RETURN_VALUE_PATTERN, cursor)
     if peeked_values is not None:
         _, iv = peeked_values
         output_semantic_tokens.append({
             "token": "CORRECTLY_NAMED_RETURN_VALUE",
             "name": iv
         })
-    return input_tokens
 
 
-def named_yield(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_keyword(t, "yield"),
-        is_identifier,
-        lambda t: is_symbol(t, "=")
-    ], input_tokens)
+NAMED_YIELD_PATTERN = Pattern(
+    [keyword("yield"), IDENTIFIER, symbol("=")]
+)
+
+
+@starts_with(keyword("yield"))
+def named_yield(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(NAMED_YIELD_PATTERN, cursor)
     if peeked_values is not None:
         _, iv, _ = peeked_values
         output_semantic_tokens.append({
             "token": "NAMED_YIELD_VALUE",
             "name": iv
         })
-    return input_tokens
-
-
-def unit_test_suite_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "unit"),
-        lambda t: is_keyword(t, "test"),
-        lambda t: is_keyword(t, "suite"),
-        lambda t: is_keyword(t, "for"),
-        is_identifier
-    ], input_tokens)
+
+
+UNIT_TEST_SUITE_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("unit"), keyword("test"), keyword("suite"), keyword("for"), IDENTIFIER]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def unit_test_suite_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(UNIT_TEST_SUITE_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv, _, _, _, _, iv = peeked_values
         output_semantic_tokens.append({
@@ -219,15 +155,16 @@ def unit_test_suite_declaration(input_tokens, output_semantic_tokens):
             "for_identifier": iv,
             "leading_docstring": cv
         })
-    return input_tokens
 
 
-def function_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "function"),
-        is_identifier
-    ], input_tokens)
+FUNCTION_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("function"), IDENTIFIER]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def function_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(FUNCTION_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv, _, iv = peeked_values
         output_semantic_tokens.append({
@@ -235,15 +172,16 @@ def function_declaration(input_tokens, output_semantic_tokens):
             "name": iv,
             "leading_docstring": cv
         })
-    return input_tokens
 
 
-def method_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "method"),
-        is_identifier
-    ], input_tokens)
+METHOD_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("method"), IDENTIFIER]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def method_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(METHOD_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv, _, iv = peeked_values
         output_semantic_tokens.append({
@@ -251,15 +189,16 @@ def method_declaration(input_tokens, output_semantic_tokens):
             "name": iv,
             "leading_docstring": cv
         })
-    return input_tokens
 
 
-def generator_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "generator"),
-        is_identifier
-    ], input_tokens)
+GENERATOR_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("generator"), IDENTIFIER]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def generator_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(GENERATOR_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv, _, iv = peeked_values
         output_semantic_tokens.append({
@@ -267,62 +206,52 @@ def generator_declaration(input_tokens, output_semantic_tokens):
             "name": iv,
             "leading_docstring": cv
         })
-    return input_tokens
 
 
-def immutable_let(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_identifier,
-        lambda t: is_symbol(t, "=")
-    ], input_tokens)
+IMMUTABLE_LET_PATTERN = Pattern(
+    [IDENTIFIER, symbol("=")]
+)
+
+
+@starts_with(IDENTIFIER)
+def immutable_let(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(IMMUTABLE_LET_PATTERN, cursor)
     if peeked_values is not None:
         iv, _ = peeked_values
         output_semantic_tokens.append({
             "token": "IMMUTABLE_LET",
             "name": iv
         })
-    return input_tokens
 
 
-def mutable_let(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_identifier,
-        lambda t: is_symbol(t, "~=")
-    ], input_tokens)
+MUTABLE_LET_PATTERN = Pattern(
+    [IDENTIFIER, symbol("~=")]
+)
+
+
+@starts_with(IDENTIFIER)
+def mutable_let(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(MUTABLE_LET_PATTERN, cursor)
     if peeked_values is not None:
         iv, _ = peeked_values
         output_semantic_tokens.append({
             "token": "MUTABLE_LET",
             "name": iv
         })
-    return input_tokens
-
-
-def is_one_of(t, patterns):
-    for p in patterns:
-        if p(t):
-            return True
-    return False
-
-
-def structure_section(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_one_of(t, [
-            lambda t: is_keyword(t, "public"),
-            lambda t: is_keyword(t, "private"),
-            lambda t: is_keyword(t, "protected")
-        ]),
-        lambda t: is_one_of(t, [
-            lambda t: is_keyword(t, "instance"),
-            lambda t: is_keyword(t, "class"),
-        ]),
-        lambda t: is_one_of(t, [
-            lambda t: is_keyword(t, "state"),
-            lambda t: is_keyword(t, "methods"),
-            lambda t: is_keyword(t, "properties"),
-            lambda t: is_keyword(t, "initializers"),
-        ]),
-    ], input_tokens)
+
+
+STRUCTURE_SECTION_PATTERN = Pattern(
+    [
+        keyword("public", "private", "protected"),
+        keyword("instance", "class"),
+        keyword("state", "methods", "properties", "initializers")
+    ]
+)
+
+
+@starts_with(keyword("public", "private", "protected"))
+def structure_section(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(STRUCTURE_SECTION_PATTERN, cursor)
     if peeked_values is not None:
         av, sv, wv = peeked_values
         output_semantic_tokens.append({
@@ -331,81 +260,83 @@ def structure_section(input_tokens, output_semantic_tokens):
             "level": sv.upper(),
             "section": wv.upper()
         })
-    return input_tokens
-
-
-def empty_check(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_identifier,
-        lambda t: is_one_of(t, [
-            lambda t: is_keyword(t, "is"),
-            lambda t: is_keyword(t, "are"),
-        ]),
-        lambda t: is_keyword(t, "empty")
-    ], input_tokens)
+
+
+EMPTY_CHECK_PATTERN = Pattern(
+    [IDENTIFIER, keyword("is", "are"), keyword("empty")]
+)
+
+
+@starts_with(IDENTIFIER)
+def empty_check(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(EMPTY_CHECK_PATTERN, cursor)
     if peeked_values is not None:
         iv, _, _ = peeked_values
         output_semantic_tokens.append({
             "token": "CHECK_IF_EMPTY",
             "identifier": iv
         })
-    return input_tokens
 
 
-def if_then_else(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_one_of(t, [
-            lambda t: is_keyword(t, "if"),
-            lambda t: is_keyword(t, "then"),
-            lambda t: is_keyword(t, "else")
-        ])
-    ], input_tokens)
+IF_THEN_ELSE_PATTERN = Pattern(
+    [keyword("if", "then", "else")]
+)
+
+
+@starts_with(keyword("if", "then", "else"))
+def if_then_else(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(IF_THEN_ELSE_PATTERN, cursor)
     if peeked_values is not None:
         v = peeked_values[0]
         output_semantic_tokens.append({
             "token": "IF_THEN_ELSE_BLOCK",
             "statement": v.upper()
         })
-    return input_tokens
 
 
-def property_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "property")
-    ], input_tokens)
+PROPERTY_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("property")]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def property_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(PROPERTY_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv = peeked_values[0]
         before = len(output_semantic_tokens)
-        semantic_identifier(input_tokens, output_semantic_tokens)
+        semantic_identifier(cursor, output_semantic_tokens)
         after = len(output_semantic_tokens)
         assert before != after, "expected a semantic identifier to follow a property statement"
         last_token = output_semantic_tokens[-1]
         last_token["leading_docstring"] = cv
         last_token["token"] = "PROPERTY_DECLARATION"
-    return input_tokens
 
 
-def repeat_loop(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_keyword(t, "repeat"),
-    ], input_tokens)
+REPEAT_LOOP_PATTERN = Pattern(
+    [keyword("repeat")]
+)
+
+
+@starts_with(keyword("repeat"))
+def repeat_loop(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(REPEAT_LOOP_PATTERN, cursor)
     if peeked_values is not None:
         v = peeked_values[0]
         output_semantic_tokens.append({
             "token": "LOOP",
             "statement": v.upper()
         })
-    return input_tokens
 
 
-def for_loop(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_keyword(t, "for"),
-        is_identifier,
-        lambda t: is_keyword(t, "in"),
-        is_identifier
-    ], input_tokens)
+FOR_LOOP_PATTERN = Pattern(
+    [keyword("for"), IDENTIFIER, keyword("in"), IDENTIFIER]
+)
+
+
+@starts_with(keyword("for"))
+def for_loop(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(FOR_LOOP_PATTERN, cursor)
     if peeked_values is not None:
         _, cv, _, wv = peeked_values
         output_semantic_tokens.append({
@@ -414,33 +345,32 @@ def for_loop(input_tokens, output_semantic_tokens):
             "cursor": cv,
             "collection": wv
         })
-    return input_tokens
-
-
-def function_section(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_one_of(t, [
-            lambda t: is_keyword(t, "accepts"),
-            lambda t: is_keyword(t, "yields"),
-            lambda t: is_keyword(t, "returns"),
-            lambda t: is_keyword(t, "body")
-        ])
-    ], input_tokens)
+
+
+FUNCTION_SECTION_PATTERN = Pattern(
+    [keyword("accepts", "yields", "returns", "body")]
+)
+
+
+@starts_with(keyword("accepts", "yields", "returns", "body"))
+def function_section(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(FUNCTION_SECTION_PATTERN, cursor)
     if peeked_values is not None:
         v = peeked_values[0]
         output_semantic_tokens.append({
             "token": "FUNCTION_SECTION",
             "section": v.upper()
         })
-    return input_tokens
 
 
-def module_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "module"),
-        is_identifier
-    ], input_tokens)
+MODULE_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("module"), IDENTIFIER]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def module_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(MODULE_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv, _, iv = peeked_values
         output_semantic_tokens.append({
@@ -448,99 +378,92 @@ def module_declaration(input_tokens, output_semantic_tokens):
             "module": iv,
             "leading_docstring": cv
         })
-    return input_tokens
 
 
-def infix_operator(input_tokens, output_semantic_tokens):
-    before = input_tokens[:3]
-    peeked_values = semantic_peek([
-        is_identifier_or_literal,
-        is_infix_operator,
-        is_identifier_or_literal
-    ], input_tokens)
-    if peeked_values is not None:
-        lv, ov, rv = peeked_values
+INFIX_OPERATOR_PATTERN = Pattern(
+    [IDENTIFIER_OR_LITERAL, INFIX_OPERATOR, IDENTIFIER_OR_LITERAL]
+)
+
+
+@starts_with(IDENTIFIER_OR_LITERAL)
+def infix_operator(cursor, output_semantic_tokens):
+    matched = INFIX_OPERATOR_PATTERN.match(cursor)
+    if matched is not None:
+        _, (lv, ov, rv) = matched
         output_semantic_tokens.append({
             "token": "INFIX_OPERATOR",
-            "left": before[0],
-            "right": before[2],
+            "left": cursor.peek(0),
+            "right": cursor.peek(2),
             "operator": ov.upper()
         })
-    return input_tokens
+        cursor.advance(3)
 
 
-def discard_statement(input_tokens, output_semantic_tokens):
-    t = input_tokens[0]
-    if is_keyword(t, "discard"):
+DISCARD_STATEMENT_PATTERN = Pattern(
+    [keyword("discard")]
+)
+
+
+@starts_with(keyword("discard"))
+def discard_statement(cursor, output_semantic_tokens):
+    if semantic_peek(DISCARD_STATEMENT_PATTERN, cursor) is not None:
         output_semantic_tokens.append({
             "token": "DISCARD_EVALUATION_RESULTS"
         })
-        del input_tokens[0]
-    return input_tokens
 
 
-def instantiate_object(input_tokens, output_semantic_tokens):
-    tmp_tokens = input_tokens[:2]
-    peeked_values = semantic_peek([
-        lambda t: is_keyword(t, "new"),
-        is_identifier
-    ], tmp_tokens)
-    if peeked_values is not None:
+INSTANTIATE_OBJECT_PATTERN = Pattern(
+    [keyword("new"), IDENTIFIER]
+)
+
+
+@starts_with(keyword("new"))
+def instantiate_object(cursor, output_semantic_tokens):
+    # only consumes "new", the identifier is consumed by the constructor call that follows
+    if INSTANTIATE_OBJECT_PATTERN.match(cursor) is not None:
         output_semantic_tokens.append({
             "token": "INSTANTIATE_OBJECT"
         })
-        del input_tokens[0]
-    return input_tokens
-
-
-def export_new_token(input_tokens, output_semantic_tokens):
-    tmp_input_tokens = copy.deepcopy(input_tokens)
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "export"),
-        lambda t: is_one_of(t, [
-            lambda t: is_keyword(t, "function"),
-            lambda t: is_keyword(t, "class"),
-            lambda t: is_keyword(t, "type")
-        ]),
-        is_identifier
-    ], tmp_input_tokens)
-    if peeked_values is not None:
-        _, _, wv, iv = peeked_values
-        output_semantic_tokens.append({
-            "token": "EXPORT_NEW_TOKEN",
-            "what": wv,
-            "identifier": iv
-        })
-        del input_tokens[1]
-    else:
-        peeked_values = semantic_peek([
-            is_leading_multi_line_comment,
-            lambda t: is_keyword(t, "export"),
-            lambda t: is_keyword(t, "compound"),
-            lambda t: is_keyword(t, "value"),
-            lambda t: is_keyword(t, "type"),
-            is_identifier
-        ], tmp_input_tokens)
-        if peeked_values is not None:
+        cursor.advance()
+
+
+EXPORT_NEW_TOKEN_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("export"), keyword("function", "class", "type"), IDENTIFIER],
+    [LEADING_MULTI_LINE_COMMENT, keyword("export"), keyword("compound"), keyword("value"), keyword("type"), IDENTIFIER]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def export_new_token(cursor, output_semantic_tokens):
+    # only removes "export", the declaration that it exports is left to the declaration analyzers
+    matched = EXPORT_NEW_TOKEN_PATTERN.match(cursor)
+    if matched is not None:
+        alternative, peeked_values = matched
+        if alternative == 0:
+            _, _, wv, iv = peeked_values
+            output_semantic_tokens.append({
+                "token": "EXPORT_NEW_TOKEN",
+                "what": wv,
+                "identifier": iv
+            })
+        else:
             _, _, _, _, _, iv = peeked_values
             output_semantic_tokens.append({
                 "token": "EXPORT_NEW_TOKEN",
                 "what": "COMPOUND_VALUE_TYPE",
                 "identifier": iv
             })
-            del input_tokens[1]
-    return input_tokens
-
-
-def compound_value_type_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "compound"),
-        lambda t: is_keyword(t, "value"),
-        lambda t: is_keyword(t, "type"),
-        is_identifier
-    ], input_tokens)
+        cursor.remove(1)
+
+
+COMPOUND_VALUE_TYPE_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("compound"), keyword("value"), keyword("type"), IDENTIFIER]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def compound_value_type_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(COMPOUND_VALUE_TYPE_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv, _, _, _, iv = peeked_values
         output_semantic_tokens.append({
@@ -548,64 +471,60 @@ def compound_value_type_declaration(input_tokens, output_semantic_tokens):
             "identifier": iv,
             "leading_docstring": cv
         })
-    return input_tokens
 
 
-def simple_type_declaration(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        is_leading_multi_line_comment,
-        lambda t: is_keyword(t, "type")
-    ], input_tokens)
+SIMPLE_TYPE_DECLARATION_PATTERN = Pattern(
+    [LEADING_MULTI_LINE_COMMENT, keyword("type")]
+)
+
+
+@starts_with(LEADING_MULTI_LINE_COMMENT)
+def simple_type_declaration(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(SIMPLE_TYPE_DECLARATION_PATTERN, cursor)
     if peeked_values is not None:
         cv, _ = peeked_values
-        before = len(input_tokens)
-        input_tokens = semantic_identifier(input_tokens, output_semantic_tokens)
-        assert len(input_tokens) != before, "expected 'type' to be followed by a semantic identifier"
+        before = len(cursor)
+        semantic_identifier(cursor, output_semantic_tokens)
+        assert len(cursor) != before, "expected 'type' to be followed by a semantic identifier"
         output_semantic_tokens[-1]["token"] = "SIMPLE_TYPE_DECLARATION"
         output_semantic_tokens[-1]["leading_docstring"] = cv
-    return input_tokens
 
 
-def function_call(input_tokens, output_semantic_tokens):
+OPENING_PARENTHESIS_PATTERN = Pattern([symbol("(")])
+CLOSING_PARENTHESIS_PATTERN = Pattern([symbol(")")])
+COMMA_PATTERN = Pattern([symbol(",")])
+EQUALS_PATTERN = Pattern([symbol("=")])
+IDENTIFIER_PATTERN = Pattern([IDENTIFIER])
+LITERAL_PATTERN = Pattern([LITERAL])
+
+
+@starts_with(symbol("("))
+def function_call(cursor, output_semantic_tokens):
     if output_semantic_tokens:
         last_token = output_semantic_tokens[-1]
         if last_token["token"] == "SEMANTIC_IDENTIFIER":
-            peeked_values = semantic_peek([
-                lambda t: is_symbol(t, "(")
-            ], input_tokens)
+            peeked_values = semantic_peek(OPENING_PARENTHESIS_PATTERN, cursor)
             arguments = []
             if peeked_values is not None:
-                while input_tokens:
-                    peeked_values = semantic_peek([
-                        lambda t: is_symbol(t, ")")
-                    ], input_tokens)
+                while cursor:
+                    peeked_values = semantic_peek(CLOSING_PARENTHESIS_PATTERN, cursor)
                     if peeked_values is not None:
                         break
                     if arguments:
-                        peeked_values = semantic_peek([
-                            lambda t: is_symbol(t, ",")
-                        ], input_tokens)
+                        peeked_values = semantic_peek(COMMA_PATTERN, cursor)
                         assert peeked_values is not None, "yapl function arguments must be comma-separated"
-                    peeked_values = semantic_peek([
-                        is_identifier
-                    ], input_tokens)
+                    peeked_values = semantic_peek(IDENTIFIER_PATTERN, cursor)
                     assert peeked_values is not None, "yapl function arguments must always be named"
                     arg_name = peeked_values[0]
                     arg_value_identifier = arg_name
-                    peeked_values = semantic_peek([
-                        lambda t: is_symbol(t, "=")
-                    ], input_tokens)
+                    peeked_values = semantic_peek(EQUALS_PATTERN, cursor)
                     if peeked_values is not None:
-                        peeked_values = semantic_peek([
-                            is_identifier
-                        ], input_tokens)
+                        peeked_values = semantic_peek(IDENTIFIER_PATTERN, cursor)
                         if peeked_values is not None:
                             arg_value_identifier = peeked_values[0]
                         else:
-                            arg_value_literal = input_tokens[0]
-                            peeked_values = semantic_peek([
-                                is_literal
-                            ], input_tokens)
+                            arg_value_literal = cursor.peek()
+                            peeked_values = semantic_peek(LITERAL_PATTERN, cursor)
                             assert peeked_values is not None, "yapl function arguments must be populated with identifiers or values"
                             arguments.append({
                                 "name": arg_name,
@@ -627,24 +546,24 @@ def function_call(input_tokens, output_semantic_tokens):
                         del output_semantic_tokens[-2]
                 last_token["token"] = token
                 last_token["arguments"] = arguments
-    return input_tokens
 
 
-def import_statement(input_tokens, output_semantic_tokens):
-    peeked_values = semantic_peek([
-        lambda t: is_keyword(t, "from"),
-        is_identifier,
-        lambda t: is_keyword(t, "import"),
-        is_identifier,
-    ], input_tokens)
+IMPORT_STATEMENT_PATTERN = Pattern(
+    [keyword("from"), IDENTIFIER, keyword("import"), IDENTIFIER]
+)
+IMPORT_STATEMENT_MORE_PATTERN = Pattern(
+    [symbol(","), IDENTIFIER]
+)
+
+
+@starts_with(keyword("from"))
+def import_statement(cursor, output_semantic_tokens):
+    peeked_values = semantic_peek(IMPORT_STATEMENT_PATTERN, cursor)
     if peeked_values is not None:
         _, mv, _, iv = peeked_values
         symbols = [ iv ]
         def more():
-            peeked_values = semantic_peek([
-                lambda t: is_symbol(t, ","),
-                is_identifier,
-            ], input_tokens)
+            peeked_values = semantic_peek(IMPORT_STATEMENT_MORE_PATTERN, cursor)
             if peeked_values is None:
                 return False
             else:
@@ -658,21 +577,20 @@ def import_statement(input_tokens, output_semantic_tokens):
             "module": mv,
             "symbols": symbols
         })
-    return input_tokens
 
 
-def expression(input_tokens, output_semantic_tokens):
+EXPRESSION_PATTERN = Pattern(
+    [INFIX_OPERATOR, IDENTIFIER_OR_LITERAL]
+)
+
+
+@starts_with(INFIX_OPERATOR)
+def expression(cursor, output_semantic_tokens):
     while output_semantic_tokens:
         lv = output_semantic_tokens[-1]
         if lv["token"] not in ("SEMANTIC_IDENTIFIER", "EXPRESSION", "RENAMED_RETURN_VALUE"):
             break
-        peeked_values = semantic_peek([
-            is_infix_operator,
-            lambda t: is_one_of(t, [
-                is_identifier,
-                is_literal
-            ]),
-        ], input_tokens)
+        peeked_values = semantic_peek(EXPRESSION_PATTERN, cursor)
         if peeked_values is not None:
             ov, rv = peeked_values
             del output_semantic_tokens[-1]
@@ -684,16 +602,15 @@ def expression(input_tokens, output_semantic_tokens):
             })
         else:
             break
-    return input_tokens
 
 
-def remainder(input_tokens, output_semantic_tokens):
-    if input_tokens:
+def remainder(cursor, output_semantic_tokens):
+    if cursor:
         output_semantic_tokens.append({
             "token": "REMAINDER",
-            "value": input_tokens
+            "value": cursor.remaining()
         })
-    return []
+        cursor.advance(len(cursor))
 
 
 SEMANTIC_ANALYZERS=[
@@ -729,48 +646,154 @@ SEMANTIC_ANALYZERS=[
 ]
 
 
-def changed(l, r):
-    if len(l) != len(r):
-        return True
-    for i in range(len(l)):
-        lt = l[i]
-        rt = r[i]
-        if lt["token"] != rt["token"]:
-            return True
-        if lt["value"] != rt["value"]:
-            return True
-    return False
+# the semantic tokens of a logical line are cached by the sha256 of the line, for as long as neither the tokenizer nor
+# the semantic analysis change
+SEMANTIC_ANALYZER_VERSION = calculate_sha256_of_string(
+    TOKENIZER_VERSION +
+    calculate_sha256_of_file(__file__) +
+    calculate_sha256_of_file(os.path.join(os.path.dirname(__file__), "patterns.py"))
+)
+
 
+SEMANTIC_ANALYZER_DISPATCH_TABLE = AnalyzerDispatchTable(SEMANTIC_ANALYZERS)
+
+SEMANTIC_ANALYZER_PRIORITIES = dict((analyzer, i) for i, analyzer in enumerate(SEMANTIC_ANALYZERS))
+
+
+class SemanticAnalysisStatistics(object):
+    # counts how many analyzers were tried on the lines that were analyzed, and how many would have been without the
+    # dispatch table, i.e. every analyzer up to and including the one that consumed tokens, in every pass, as well as
+    # the lines whose semantic tokens were taken from the cache, and weren't analyzed
+    #
+    # Like a MemoCache, statistics that are handed to a worker process are copied without their counts, and the counts
+    # that the worker adds are taken from it with take_delta() and merged into the statistics of the parent with
+    # merge_delta().
+
+    def __init__(self):
+        self.__reset()
+
+    def __reset(self):
+        self.__lines = 0
+        self.__cached_lines = 0
+        self.__passes = 0
+        self.__attempts = 0
+        self.__undispatched_attempts = 0
+        self.__most_attempts = 0
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__reset()
+
+    def record_line(self, passes, attempts, undispatched_attempts):
+        self.__lines += 1
+        self.__passes += passes
+        self.__attempts += attempts
+        self.__undispatched_attempts += undispatched_attempts
+        self.__most_attempts = max(self.__most_attempts, attempts)
+
+    def record_cached_line(self):
+        self.__lines += 1
+        self.__cached_lines += 1
+
+    def take_delta(self):
+        # the counts recorded since the statistics were copied, or since the last delta was taken, which are reset
+        delta = (
+            self.__lines, self.__cached_lines, self.__passes, self.__attempts, self.__undispatched_attempts,
+            self.__most_attempts
+        )
+        self.__reset()
+        return delta
+
+    def merge_delta(self, delta):
+        lines, cached_lines, passes, attempts, undispatched_attempts, most_attempts = delta
+        self.__lines += lines
+        self.__cached_lines += cached_lines
+        self.__passes += passes
+        self.__attempts += attempts
+        self.__undispatched_attempts += undispatched_attempts
+        self.__most_attempts = max(self.__most_attempts, most_attempts)
+
+    def merge(self, statistics):
+        self.merge_delta((
+            statistics.__lines, statistics.__cached_lines, statistics.__passes, statistics.__attempts,
+            statistics.__undispatched_attempts, statistics.__most_attempts
+        ))
 
-def perform_semantic_line_analysis(tokens):
+    def lines(self):
+        return self.__lines
+
+    def cached_lines(self):
+        return self.__cached_lines
+
+    def attempts(self):
+        return self.__attempts
+
+    def summary(self, label="semantic analysis"):
+        analyzed_lines = self.__lines - self.__cached_lines
+        return "{}: {} lines ({} cached), {} passes, {} analyzers attempted ({:.1f} per analyzed line, at most {}), {} without dispatch".format(
+            label,
+            self.__lines,
+            self.__cached_lines,
+            self.__passes,
+            self.__attempts,
+            self.__attempts / analyzed_lines if analyzed_lines else 0.0,
+            self.__most_attempts,
+            self.__undispatched_attempts
+        )
+
+
+def perform_semantic_line_analysis(tokens, statistics=None):
+    # every analyzer consumes the tokens that it recognises through the cursor, and the first analyzer that consumes
+    # any starts the next pass over the analyzers that may consume the next token; the tokens themselves are left
+    # unchanged
     semantic_tokens = []
-    while tokens:
-        for analyzer in SEMANTIC_ANALYZERS:
-            before = copy.deepcopy(tokens)
-            after = analyzer(tokens, semantic_tokens)
-            if changed(before, after):
-                tokens = after
+    cursor = TokenCursor(tokens)
+    passes = 0
+    attempts = 0
+    undispatched_attempts = 0
+    while cursor:
+        passes += 1
+        for analyzer in SEMANTIC_ANALYZER_DISPATCH_TABLE.analyzers(cursor.peek()):
+            attempts += 1
+            before = len(cursor)
+            analyzer(cursor, semantic_tokens)
+            if len(cursor) != before:
+                undispatched_attempts += SEMANTIC_ANALYZER_PRIORITIES[analyzer] + 1
                 break
-    assert not tokens
+    if statistics is not None:
+        statistics.record_line(passes, attempts, undispatched_attempts)
     return semantic_tokens
 
 
 class ManifestBuilder(ManifestBase):
 
-    def __init__(self, transpilation_directory, sha256):
+    def __init__(self, transpilation_directory, sha256, codec=None, cache=None, statistics=None):
         super().__init__(transpilation_directory, sha256)
+        self._codec = codec
+        self._cache = cache
+        self._statistics = statistics
         self._lines = []
 
     def process_line(self, logical_line_sha256, tokens):
-        before = copy.deepcopy(tokens)
-        semantic_tokens = perform_semantic_line_analysis(tokens)
+        if self._cache is not None:
+            semantic_tokens = self._cache.lookup(logical_line_sha256)
+            if semantic_tokens is None:
+                semantic_tokens = perform_semantic_line_analysis(tokens, self._statistics)
+                self._cache.store(logical_line_sha256, semantic_tokens)
+            elif self._statistics is not None:
+                # the line isn't analyzed, but it is counted, so that a run on a warm cache reports all of its lines
+                self._statistics.record_cached_line()
+        else:
+            semantic_tokens = perform_semantic_line_analysis(tokens, self._statistics)
         #if semantic_tokens[-1]["token"] == "REMAINDER" and
         if logical_line_sha256 == "66225a603f1e5637c8e6b0c92ae918c720ef276fc241c031e51f79c376cb9387":
             print("----------------------------------------------------------------")
             print("{} REMAINDER:\n\tBEFORE: {}\n\tAFTER:{}\n\tPROCESSED:{}".format(
                 logical_line_sha256,
-                str(before),
                 str(tokens),
+                str(semantic_tokens[-1]["value"] if semantic_tokens[-1]["token"] == "REMAINDER" else []),
                 str(semantic_tokens[:-1])
             ))
 
@@ -780,22 +803,16 @@ class ManifestBuilder(ManifestBase):
         ))
 
     def save(self):
-        os.makedirs(self._semantic_lines_directory, mode=0o777, exist_ok=True)
         manifest = {
             "module": {
                 "sha256": self._module_sha256
             },
             "semantic_lines": [l.logical_line_sha256 for l in self._lines]
         }
-        with io.open(self._semantic_lines_manifest, 'w') as f:
-            yaml.safe_dump(manifest, f)
-        for l in self._lines:
-            filename = os.path.join(
-                self._semantic_lines_directory,
-                l.logical_line_sha256 + ".yaml"
-            )
-            with io.open(filename, 'w') as f:
-                yaml.safe_dump({
+        with SegmentFileWriter(self._semantic_lines_segments, self._codec) as segments:
+            for l in self._lines:
+                segments.append(l.logical_line_sha256, {
                     "sha256": l.logical_line_sha256,
                     "semantic_tokens": l.semantic_tokens
-                }, f)
+                })
+            segments.close(manifest)
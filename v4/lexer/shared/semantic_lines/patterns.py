@@ -0,0 +1,193 @@
+# The semantic analyzers match the tokens of a logical line against patterns. A pattern is one or more alternative
+# sequences of elements, and an element maps the kinds of token that it accepts to the values that it accepts of
+# each kind, or to None if it accepts any value of that kind. A pattern is compiled into a decision tree, in which
+# every node maps a token kind to the accepted values and the node that follows them, so that matching a token is one
+# lookup of its kind, however many alternatives the pattern has.
+#
+# The analyzers read the tokens through a TokenCursor, which tracks how many tokens have been consumed, instead of
+# deleting them from the list of tokens, so that the analysis neither copies nor changes the tokens that it is given.
+#
+# Every analyzer declares the elements that the first token it consumes can match, with @starts_with, and an
+# AnalyzerDispatchTable maps the kind and value of the next token to the analyzers that may consume it, in their order
+# of priority, so that the others aren't tried. An analyzer that doesn't declare them is tried on any token.
+
+ANY_VALUE = None
+
+
+def token_kind(*kinds):
+    return dict((kind, ANY_VALUE) for kind in kinds)
+
+
+def keyword(*values):
+    return {"KEYWORD": frozenset(value.upper() for value in values)}
+
+
+def symbol(*values):
+    return {"SYMBOL": frozenset(values)}
+
+
+def one_of(*elements):
+    result = {}
+    for element in elements:
+        for kind, values in element.items():
+            if values is ANY_VALUE or (kind in result and result[kind] is ANY_VALUE):
+                result[kind] = ANY_VALUE
+            else:
+                result[kind] = result.get(kind, frozenset()) | values
+    return result
+
+
+def starts_with(*elements):
+    leading_element = one_of(*elements)
+
+    def declare(analyzer):
+        analyzer.leading_element = leading_element
+        return analyzer
+
+    return declare
+
+
+def leading_element_of(analyzer):
+    return getattr(analyzer, "leading_element", None)
+
+
+class AnalyzerDispatchTable(object):
+
+    def __init__(self, analyzers):
+        self.__any_token = tuple(a for a in analyzers if leading_element_of(a) is None)
+        self.__by_kind = {}
+        self.__by_kind_and_value = {}
+        for analyzer in analyzers:
+            leading_element = leading_element_of(analyzer)
+            if leading_element is None:
+                continue
+            for kind, values in leading_element.items():
+                self.__by_kind[kind] = self.__applicable(analyzers, kind, None)
+                for value in (values or ()):
+                    self.__by_kind_and_value[(kind, value)] = self.__applicable(analyzers, kind, value)
+
+    @staticmethod
+    def __applicable(analyzers, kind, value):
+        # the analyzers that may consume a token of the kind, and of the value, or of a value that no analyzer names
+        applicable = []
+        for analyzer in analyzers:
+            leading_element = leading_element_of(analyzer)
+            if leading_element is None:
+                applicable.append(analyzer)
+            elif kind in leading_element:
+                values = leading_element[kind]
+                if values is ANY_VALUE or value in values:
+                    applicable.append(analyzer)
+        return tuple(applicable)
+
+    def analyzers(self, t):
+        analyzers = self.__by_kind_and_value.get((t["token"], t.get("value")))
+        if analyzers is None:
+            analyzers = self.__by_kind.get(t["token"], self.__any_token)
+        return analyzers
+
+
+class TokenCursor(object):
+
+    def __init__(self, tokens):
+        self.__tokens = tokens
+        self.__position = 0
+        self.__copied = False
+
+    def __len__(self):
+        return len(self.__tokens) - self.__position
+
+    def __bool__(self):
+        return self.__position < len(self.__tokens)
+
+    def tokens(self):
+        return self.__tokens
+
+    def position(self):
+        return self.__position
+
+    def peek(self, offset=0):
+        return self.__tokens[self.__position + offset]
+
+    def advance(self, count=1):
+        self.__position += count
+
+    def remaining(self):
+        return self.__tokens[self.__position:]
+
+    def remove(self, offset):
+        # removes a token that follows the next one, from a copy of the remaining tokens, which is made the first time
+        if not self.__copied:
+            self.__tokens = self.__tokens[self.__position:]
+            self.__position = 0
+            self.__copied = True
+        del self.__tokens[self.__position + offset]
+
+
+class PatternNode(object):
+
+    def __init__(self):
+        self.edges = {}
+        self.alternative = None
+
+    def add(self, sequence, alternative):
+        if not sequence:
+            if self.alternative is None:
+                self.alternative = alternative
+            return
+        for kind, values in sequence[0].items():
+            edges = self.edges.setdefault(kind, [])
+            for edge_values, child in edges:
+                if edge_values == values:
+                    break
+            else:
+                child = PatternNode()
+                edges.append((values, child))
+            child.add(sequence[1:], alternative)
+
+    def match(self, tokens, position, values):
+        # returns the first alternative that the tokens from position on match, and the values of the matched tokens
+        best = None
+        if self.alternative is not None:
+            best = (self.alternative, list(values))
+        if position < len(tokens):
+            t = tokens[position]
+            for accepted_values, child in self.edges.get(t["token"], ()):
+                if accepted_values is ANY_VALUE or t["value"] in accepted_values:
+                    values.append(t.get("value"))
+                    matched = child.match(tokens, position + 1, values)
+                    values.pop()
+                    if matched is not None and (best is None or matched[0] < best[0]):
+                        best = matched
+        return best
+
+
+class Pattern(object):
+
+    def __init__(self, *alternatives):
+        self.__root = PatternNode()
+        for alternative, sequence in enumerate(alternatives):
+            assert sequence, "Expected the alternatives of a pattern to be non-empty"
+            self.__root.add(sequence, alternative)
+
+    def match(self, cursor):
+        # returns the index of the first alternative that the next tokens match, and their values, without consuming them
+        return self.__root.match(cursor.tokens(), cursor.position(), [])
+
+
+def semantic_peek(pattern, cursor):
+    # consumes the next tokens and returns their values, if they match the (first alternative of the) pattern
+    matched = pattern.match(cursor)
+    if matched is None:
+        return None
+    _, values = matched
+    cursor.advance(len(values))
+    return values
+
+
+def semantic_peek_alternatives(pattern, cursor):
+    # as semantic_peek, but also returns which alternative of the pattern the tokens matched
+    matched = pattern.match(cursor)
+    if matched is not None:
+        cursor.advance(len(matched[1]))
+    return matched
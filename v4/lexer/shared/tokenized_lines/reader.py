@@ -1,29 +1,23 @@
-import io
-import os
-import yaml
 from yapl.v4.lexer.shared.tokenized_lines.base import ManifestBase
+from yapl.v4.lexer.shared.segments import SegmentFileReader
 
 
 
 class TokenizedLinesManifestReader(object):
 
-    def __init__(self, module_sha256, manifest_filename, lines_name):
+    def __init__(self, module_sha256, segments_filename, lines_name):
         self._module_sha256 = module_sha256
-        self._manifest_filename = manifest_filename
-        self._manifest_directory = os.path.dirname(manifest_filename)
-        with io.open(manifest_filename, 'r') as manifest_file:
-            contents = yaml.safe_load(manifest_file)
-            assert contents["module"]["sha256"] == module_sha256, \
-                "Expected the sha256 of the manifest.yaml file to match the module sha256"
-            self._line_shas = contents[lines_name]
+        self._segments = SegmentFileReader(segments_filename)
+        contents = self._segments.manifest()
+        assert contents["module"]["sha256"] == module_sha256, \
+            "Expected the sha256 of the segments manifest to match the module sha256"
+        self._line_shas = contents[lines_name]
 
     def __len__(self):
         return len(self._line_shas)
 
-    def _filename_of_line(self, line_sha256, extension):
-        if not extension.startswith("."):
-            extension = "." + extension
-        return os.path.join(self._manifest_directory, line_sha256) + extension
+    def _line_record(self, line_sha256):
+        return self._segments.get(line_sha256)
 
 
 class TokenizedLine(object):
@@ -40,28 +34,24 @@ class TokenizedLine(object):
 
 class TokenizedLineReader(object):
 
-    def __init__(self, sha, filename):
+    def __init__(self, sha, record):
         self._sha = sha
-        self._filename = filename
-        self._manifest_contents = None
+        self._manifest_contents = record
 
     def contents(self):
-        if self._manifest_contents is None:
-            with io.open(self._filename, 'r') as manifest_file:
-                self._manifest_contents = yaml.safe_load(manifest_file)
-                assert self._manifest_contents["sha256"] == self._sha, \
-                    "Expected the sha256 of the line.yaml file to match the line sha256"
+        assert self._manifest_contents["sha256"] == self._sha, \
+            "Expected the sha256 of the line record to match the line sha256"
         return TokenizedLine(self._manifest_contents)
 
 
 class TokenizedLinesManifestReader(TokenizedLinesManifestReader):
 
-    def __init__(self, module_sha256, manifest_filename):
-        super().__init__(module_sha256, manifest_filename, "tokenized_lines")
+    def __init__(self, module_sha256, segments_filename):
+        super().__init__(module_sha256, segments_filename, "tokenized_lines")
 
     def lines(self):
         for line_sha in self._line_shas:
-            yield TokenizedLineReader(line_sha, self._filename_of_line(line_sha, ".yaml")).contents()
+            yield TokenizedLineReader(line_sha, self._line_record(line_sha)).contents()
 
 
 class ManifestReader(ManifestBase):
@@ -74,7 +64,7 @@ class ManifestReader(ManifestBase):
         if self._lines is None:
             self._lines = TokenizedLinesManifestReader(
                 self._module_sha256,
-                self._tokenized_lines_manifest
+                self._tokenized_lines_segments
             )
         for line in self._lines.lines():
             yield line
@@ -0,0 +1,273 @@
+import base64
+import re
+
+from yapl.v4.lexer.shared.sha256 import calculate_sha256_of_file
+
+# A single pass tokenizer: the logical line is scanned with an index, and what is left of the line is tokenized by
+# the function that the table below maps its first character to. Each of those functions tries the kinds of token
+# that can start with that character, in the order in which the reference tokenizer (reference_tokenizer.py) tries
+# them, so that both produce the same tokens, e.g. "order" is the logical operator "or", followed by the identifier
+# "der". Each function returns the line and the index to continue from.
+
+KEYWORDS = (
+    "not",
+    "empty", "none",
+    "module", "class",
+    "initializers", "initialize", "new",
+    "closure", "closes", "over",
+    "functions", "export", "function",
+    "returns", "return",
+    "generator",
+    "yields", "yield",
+    "methods", "method",
+    "accepts",
+    "body",
+    "fake", "unit", "test", "suite",
+    "for", "repeat", "while", "until", "in",
+    "given", "that", "when", "then",
+    "if", "else",
+    "scenario", "discard",
+    "private", "instance", "public", "state", "properties",
+    "compound", "value", "type",
+    "property", "getter", "setter",
+    "import", "from"
+)
+
+BASIC_TYPES = (
+    "string", "boolean", "integer", "float", "character", "bytes"
+)
+
+# a keyword or basic type is only one if it is followed by a space, which it is taken together with, or by the end of
+# the line
+KEYWORD_OR_BASIC_TYPE = re.compile("(?:({})|({}))(?: |\\Z)".format("|".join(KEYWORDS), "|".join(BASIC_TYPES)))
+
+# the characters that may follow a boolean or an integer literal
+LITERAL_TERMINATORS = frozenset((" ", "]", "}", ")", ","))
+
+WHITESPACE = re.compile(r"\s*")
+IDENTIFIER_CONTINUATION = re.compile(r"[\w.]*")
+
+
+def encode(content_string):
+    content_binary = content_string.encode("utf-8")
+    base64_encoded = base64.b64encode(content_binary)
+    hex_encoded = base64_encoded.hex()
+    return hex_encoded
+
+
+# the comments take what is left of the line as a string, as the reference tokenizer does, and return what is left of
+# it after the comment, or the same string if it isn't such a comment
+
+def leading_multi_line_comment(logical_line_contents, tokens):
+    if logical_line_contents.startswith("---"):
+        sublines = logical_line_contents.strip().split("\n")
+        comment_contents = [l[3:] for l in sublines[1:-2]]
+        encoded_comment_contents = encode("\n".join(comment_contents))
+        tokens.append({
+            "token": "LEADING_MULTI_LINE_COMMENT",
+            "value": encoded_comment_contents
+        })
+        return sublines[-1]
+    return logical_line_contents
+
+
+def leading_single_line_comment(logical_line_contents, tokens):
+    if logical_line_contents.startswith("--") and "\n" in logical_line_contents:
+        sublines = logical_line_contents.strip().split("\n")
+        comment_contents = [l[2:] for l in sublines[:-1]]
+        encoded_comment_contents = encode("\n".join(comment_contents))
+        token = "LEADING_MULTI_LINE_COMMENT" if len(sublines) > 2 else "LEADING_SINGLE_LINE_COMMENT"
+        tokens.append({
+            "token": token,
+            "value": encoded_comment_contents
+        })
+        return sublines[-1]
+    return logical_line_contents
+
+
+def inline_comment(logical_line_contents, tokens):
+    if logical_line_contents.startswith("--"):
+        comment_contents = logical_line_contents[2:]
+        encoded_comment_contents = encode(comment_contents)
+        tokens.append({
+            "token": "INLINE_COMMENT",
+            "value": encoded_comment_contents
+        })
+        return ""
+    return logical_line_contents
+
+
+def _append(tokens, token, value):
+    tokens.append({
+        "token": token,
+        "value": value
+    })
+
+
+def remainder(line, pos, tokens):
+    _append(tokens, "REMAINDER", line[pos:])
+    return line, len(line)
+
+
+def _integer_literal(line, pos, tokens):
+    # may have a leading unary +/-, returns None if there is no integer literal at pos
+    end = pos + 1
+    if not line[pos].isdigit():
+        if end == len(line) or not line[end].isdigit():
+            return None
+        end += 1
+    while end < len(line) and line[end].isdigit():
+        end += 1
+    if end < len(line) and line[end] not in LITERAL_TERMINATORS:
+        return None
+    _append(tokens, "INTEGER_LITERAL", line[pos:end])
+    return end
+
+
+def integer_literal(line, pos, tokens):
+    end = _integer_literal(line, pos, tokens)
+    if end is None:
+        return remainder(line, pos, tokens)
+    return line, end
+
+
+def identifier(line, pos, tokens):
+    end = IDENTIFIER_CONTINUATION.match(line, pos + 1).end()
+    _append(tokens, "IDENTIFIER", line[pos:end])
+    return line, end
+
+
+def quoted_identifier(line, pos, tokens):
+    # `anything`
+    end = line.index("`", pos + 1)
+    _append(tokens, "IDENTIFIER", line[pos + 1:end])
+    return line, end + 1
+
+
+def word(line, pos, tokens):
+    match = KEYWORD_OR_BASIC_TYPE.match(line, pos)
+    if match is not None:
+        keyword, basic_type = match.groups()
+        if keyword is not None:
+            _append(tokens, "KEYWORD", keyword.upper())
+        else:
+            _append(tokens, "BASIC_TYPE", basic_type.upper())
+        return line, match.end()
+    for l in ("true", "false"):
+        if line.startswith(l, pos):
+            end = pos + len(l)
+            if end == len(line) or line[end] in LITERAL_TERMINATORS or line[end:].isspace():
+                _append(tokens, "BOOLEAN_LITERAL", l)
+                # the reference tokenizer strips what is left of the line after a boolean literal
+                return line.rstrip(), end
+    for o in ("and", "or", "xor"):
+        if line.startswith(o, pos):
+            _append(tokens, "INFIX_LOGICAL_OPERATOR", o)
+            return line, pos + len(o)
+    return identifier(line, pos, tokens)
+
+
+def string_literal(line, pos, tokens):
+    # xcxc todo escape (\"), and perhaps other string symbols (""", ')
+    end = line.find("\"", pos + 1)
+    assert end != -1, "string literals should be terminated by a quote ({})".format(line[pos:])
+    _append(tokens, "STRING_LITERAL", encode(line[pos + 1:end]))
+    return line, end + 1
+
+
+def plus(line, pos, tokens):
+    end = _integer_literal(line, pos, tokens)
+    if end is not None:
+        return line, end
+    _append(tokens, "INFIX_MATHEMATICAL_OPERATOR", "+")
+    return line, pos + 1
+
+
+def minus(line, pos, tokens):
+    if line.startswith("--", pos):
+        contents = line[pos:]
+        for comment in (leading_multi_line_comment, leading_single_line_comment, inline_comment):
+            after = comment(contents, tokens)
+            if after != contents:
+                return after, 0
+    end = _integer_literal(line, pos, tokens)
+    if end is not None:
+        return line, end
+    _append(tokens, "INFIX_MATHEMATICAL_OPERATOR", "-")
+    return line, pos + 1
+
+
+def _operator(first_character, token_name, second_character_token_name):
+    # a one character operator, or a two character one if it is followed by "="
+    two_characters = first_character + "="
+
+    def operator(line, pos, tokens):
+        if second_character_token_name is not None and line.startswith(two_characters, pos):
+            _append(tokens, second_character_token_name, two_characters)
+            return line, pos + 2
+        if token_name is None:
+            return remainder(line, pos, tokens)
+        _append(tokens, token_name, first_character)
+        return line, pos + 1
+
+    return operator
+
+
+def constraint(line, pos, tokens):
+    if pos + 1 == len(line):
+        return remainder(line, pos, tokens)
+    end = line.find("}", pos + 1)
+    assert end != -1, "constraints should be terminated by a }"
+    _append(tokens, "CONSTRAINT", line[pos + 1:end])
+    return line, end + 1
+
+
+def other(line, pos, tokens):
+    c = line[pos]
+    if c.isalpha():
+        return word(line, pos, tokens)
+    if c.isdigit():
+        return integer_literal(line, pos, tokens)
+    return remainder(line, pos, tokens)
+
+
+TOKENIZERS_BY_FIRST_CHARACTER = {
+    "\"": string_literal,
+    "`": quoted_identifier,
+    "_": identifier,
+    "+": plus,
+    "-": minus,
+    "/": _operator("/", "INFIX_MATHEMATICAL_OPERATOR", None),
+    "*": _operator("*", "INFIX_MATHEMATICAL_OPERATOR", None),
+    "=": _operator("=", "SYMBOL", "INFIX_COMPARISON_OPERATOR"),
+    "<": _operator("<", "INFIX_COMPARISON_OPERATOR", "INFIX_COMPARISON_OPERATOR"),
+    ">": _operator(">", "INFIX_COMPARISON_OPERATOR", "INFIX_COMPARISON_OPERATOR"),
+    "!": _operator("!", "SYMBOL", "INFIX_COMPARISON_OPERATOR"),
+    "~": _operator("~", None, "SYMBOL"),
+    ":": _operator(":", "SYMBOL", None),
+    ",": _operator(",", "SYMBOL", None),
+    "(": _operator("(", "SYMBOL", None),
+    ")": _operator(")", "SYMBOL", None),
+    "[": _operator("[", "SYMBOL", None),
+    "]": _operator("]", "SYMBOL", None),
+    "{": constraint
+}
+TOKENIZERS_BY_FIRST_CHARACTER.update((c, word) for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+TOKENIZERS_BY_FIRST_CHARACTER.update((c, integer_literal) for c in "0123456789")
+
+
+# the tokens of a logical line are cached by the sha256 of the line, for as long as the tokenizer doesn't change
+TOKENIZER_VERSION = calculate_sha256_of_file(__file__)
+
+
+def tokenize(logical_line_contents):
+    tokens = []
+    line = logical_line_contents
+    pos = 0
+    while True:
+        pos = WHITESPACE.match(line, pos).end()
+        if pos == len(line):
+            break
+        tokenizer = TOKENIZERS_BY_FIRST_CHARACTER.get(line[pos], other)
+        line, pos = tokenizer(line, pos, tokens)
+    return tokens
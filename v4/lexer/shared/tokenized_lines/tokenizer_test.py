@@ -0,0 +1,94 @@
+import os
+import random
+import tempfile
+import unittest
+
+from yapl.v4.lexer.shared.input_directory import InputDirectory
+from yapl.v4.lexer.shared.transpilation import Transpilation
+from yapl.v4.lexer.shared.module_lines.manifest.builder import ManifestBuilder as ModuleLinesManifestBuilder
+from yapl.v4.lexer.shared.tokenized_lines import reference_tokenizer, tokenizer
+
+EXAMPLES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "examples")
+
+
+def collect_logical_line_contents(input_directory):
+    with tempfile.TemporaryDirectory() as transpilation_directory:
+        transpilation = Transpilation.create(transpilation_directory)
+        for module_file_reference in InputDirectory(input_directory).get_module_file_references():
+            transpilation.add_module_file_ref(module_file_reference)
+        contents = []
+        for module_file_reference in transpilation.get_module_file_refs():
+            module_lines = ModuleLinesManifestBuilder(transpilation_directory, module_file_reference.sha256)
+            module_lines.parse()
+            contents.extend(logical_line.content() for logical_line in module_lines.logical_lines())
+        return contents
+
+
+def tokenize_or_fail(tokenize, logical_line_contents):
+    try:
+        return tokenize(logical_line_contents)
+    except (AssertionError, ValueError) as e:
+        return type(e), str(e)
+
+
+class TokenizerTest(unittest.TestCase):
+
+    def assert_same_tokens(self, logical_line_contents):
+        self.assertEqual(
+            tokenize_or_fail(reference_tokenizer.tokenize, logical_line_contents),
+            tokenize_or_fail(tokenizer.tokenize, logical_line_contents),
+            logical_line_contents
+        )
+
+    def test_examples(self):
+        contents = collect_logical_line_contents(EXAMPLES_DIRECTORY)
+        self.assertTrue(contents)
+        for logical_line_contents in contents:
+            self.assert_same_tokens(logical_line_contents)
+
+    def test_keywords_and_basic_types(self):
+        for k in tokenizer.KEYWORDS + tokenizer.BASIC_TYPES:
+            for logical_line_contents in (k, k + " x", k + "x", k + "(", k + "\tx", "x." + k + " y", k.upper()):
+                self.assert_same_tokens(logical_line_contents)
+
+    def test_literals(self):
+        for logical_line_contents in (
+            "true", "false", "true ", "true  x  ", "true)", "truex", "true\tx", "true \t\n",
+            "1", "12 ", "-1", "+12)", "1x", "-x", "+", "-", "1,2", "٣٤", "²",
+            "\"\"", "\"abc\" x", "\"abc", "\"",
+        ):
+            self.assert_same_tokens(logical_line_contents)
+
+    def test_operators_and_symbols(self):
+        for logical_line_contents in (
+            "a == b", "a>=b", "a != b", "a <= b", "a < b", "a>b", "a = b", "a ~= b", "~", "!x", "a+b", "a / b * c",
+            "order", "android", "xorb", "or", "f(a, b)[0]", "{x > 0}", "{", "{x", "x: y", ".x", "@x", "#",
+        ):
+            self.assert_same_tokens(logical_line_contents)
+
+    def test_identifiers(self):
+        for logical_line_contents in (
+            "x", "_x", "a.b.c", "a1_b", "`any thing` x", "`x", "été x", "x²",
+        ):
+            self.assert_same_tokens(logical_line_contents)
+
+    def test_comments(self):
+        for logical_line_contents in (
+            "-- x", "x -- y", "---x", "--x\ny", "--x\n--y\nz", "---\n---x\n---\nz", "  --x\ny  ", "--\n",
+            "true --x\ny", "x ---\n---y\n---\nz",
+        ):
+            self.assert_same_tokens(logical_line_contents)
+
+    def test_random_lines(self):
+        pieces = (
+            "true", "false", "and", "or", "xor", "not", "in", "string", "return", "x", "_a", "a.b", "1", "-", "+",
+            "--", "---", "\n", " ", "\t", "\"", "`", "{", "}", "(", ")", "[", "]", ",", ":", "=", "!", "<", ">", "~",
+            "/", "*", "é", "٣", "²", ".", "@"
+        )
+        rng = random.Random(0)
+        for _ in range(20000):
+            self.assert_same_tokens("".join(rng.choice(pieces) for _ in range(rng.randint(1, 12))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,11 +11,14 @@ class Transpilation(object):
         os.makedirs(self.__transpilation_directory, mode=0o777, exist_ok=True)
         self.__manifest = None
         self.__module_file_refs = []
+        self.__codec = None
 
     @staticmethod
-    def create(transpilation_directory):
+    def create(transpilation_directory, codec=None):
         os.makedirs(transpilation_directory, mode=0o777, exist_ok = True)
-        return Transpilation(transpilation_directory)
+        transpilation = Transpilation(transpilation_directory)
+        transpilation.__codec = codec
+        return transpilation
 
     def manifest(self):
         return self.__manifest
@@ -24,11 +27,14 @@ class Transpilation(object):
         self.__manifest = ModulesManifest(self.__transpilation_directory)
         self.__manifest.load()
         self.__module_file_refs = list(self.__manifest.get_module_file_refs())
+        self.__codec = self.__manifest.get_codec()
         return self
 
     def save(self):
         self.__manifest = ModulesManifest(self.__transpilation_directory)
         self.__manifest.add_module_file_refs(self.__module_file_refs)
+        if self.__codec is not None:
+            self.__manifest.set_codec(self.__codec)
         self.__manifest.save()
         return self
 
@@ -41,5 +47,8 @@ class Transpilation(object):
         shutil.copyfile(module_file_ref.absolute_pathname, destination)
         return self
 
+    def codec(self):
+        return self.__codec
+
     def get_module_file_refs(self):
         return self.__module_file_refs
@@ -0,0 +1,134 @@
+#!/usr/local/bin/python3
+
+# Runs stages 1 to 4 in a single process, passing each module's lines, tokens and semantic tokens from stage to
+# stage in memory, instead of writing them to and re-reading them from the transpilation directory. The staged
+# scripts (1_collect_modules.py ... 4_perform_semantic_line_analysis.py) remain available for debugging, and produce
+# the same artifacts as this driver does with --checkpoints.
+
+from yapl.v4.lexer.shared.encoding import ALL_CODECS, DEFAULT_CODEC
+from yapl.v4.lexer.shared.input_directory import InputDirectory
+from yapl.v4.lexer.shared.memo_cache import MemoCache
+from yapl.v4.lexer.shared.parallel import process_modules
+from yapl.v4.lexer.shared.transpilation import Transpilation
+from yapl.v4.lexer.shared.module_lines.manifest.builder import ManifestBuilder as ModuleLinesManifestBuilder
+from yapl.v4.lexer.shared.tokenized_lines.builder import ManifestBuilder as TokenizedLinesManifestBuilder, TOKENIZER_VERSION
+from yapl.v4.lexer.shared.semantic_lines.builder import \
+    ManifestBuilder as SemanticLinesManifestBuilder, SEMANTIC_ANALYZER_VERSION, SemanticAnalysisStatistics
+
+
+def collect_module_lines(transpilation_directory, module_sha256, codec, checkpoints):
+    module_lines = ModuleLinesManifestBuilder(transpilation_directory, module_sha256, codec)
+    module_lines.parse()
+    if checkpoints:
+        module_lines.save()
+    return module_lines.logical_lines()
+
+
+def tokenize_lines(transpilation_directory, module_sha256, codec, checkpoints, cache, logical_lines):
+    builder = TokenizedLinesManifestBuilder(transpilation_directory, module_sha256, codec, cache)
+    for logical_line in logical_lines:
+        try:
+            builder.tokenize_logical_line(
+                logical_line.sha256(),
+                logical_line.content()
+            )
+        except:
+            print("FAILED to process logical line #{}, sha256={}, actual line(s)={}".format(
+                logical_line.logical_line_number(),
+                logical_line.sha256(),
+                str(logical_line.actual_line_numbers())
+            ))
+            raise
+    if checkpoints:
+        builder.save()
+    return builder.tokenized_lines()
+
+
+def perform_semantic_line_analysis(transpilation_directory, module_sha256, codec, cache, statistics, tokenized_lines):
+    builder = SemanticLinesManifestBuilder(transpilation_directory, module_sha256, codec, cache, statistics)
+    for tokenized_line in tokenized_lines:
+        try:
+            builder.process_line(
+                tokenized_line.logical_line_sha256,
+                tokenized_line.tokens
+            )
+        except:
+            print("FAILED to process tokenized line sha256={}, tokens: {}".format(
+                tokenized_line.logical_line_sha256,
+                str(tokenized_line.tokens)
+            ))
+            raise
+    builder.save()
+
+
+def transpile_module(module_ref, transpilation_directory, codec, checkpoints, tokenized_lines_cache, semantic_lines_cache, stage_statistics):
+    module_sha256 = module_ref["sha256"]
+    print("processing module: " + module_ref["filename"] + " (" + module_sha256 + ")")
+    statistics = SemanticAnalysisStatistics() if stage_statistics is not None else None
+    logical_lines = collect_module_lines(transpilation_directory, module_sha256, codec, checkpoints)
+    tokenized_lines = tokenize_lines(transpilation_directory, module_sha256, codec, checkpoints, tokenized_lines_cache, logical_lines)
+    perform_semantic_line_analysis(transpilation_directory, module_sha256, codec, semantic_lines_cache, statistics, tokenized_lines)
+    if statistics is not None:
+        print(statistics.summary())
+        stage_statistics.merge(statistics)
+
+
+def main(args):
+    input_directory = InputDirectory(args.input_directory)
+    transpilation = Transpilation.create(args.transpilation_directory, args.codec)
+    for module_file_reference in input_directory.get_module_file_references():
+        transpilation.add_module_file_ref(module_file_reference)
+    transpilation.save()
+    transpilation.load()
+    codec = transpilation.codec()
+    caches = [None, None]
+    if not args.no_cache:
+        caches = [
+            MemoCache(args.transpilation_directory, "tokenized_lines", TOKENIZER_VERSION, codec).load(),
+            MemoCache(args.transpilation_directory, "semantic_lines", SEMANTIC_ANALYZER_VERSION, codec).load()
+        ]
+    tokenized_lines_cache, semantic_lines_cache = caches
+    statistics = SemanticAnalysisStatistics() if args.statistics else None
+    try:
+        process_modules(
+            transpile_module,
+            transpilation.manifest().get_module_file_refs(),
+            args.jobs,
+            args.transpilation_directory,
+            codec,
+            args.checkpoints,
+            tokenized_lines_cache,
+            semantic_lines_cache,
+            statistics
+        )
+    finally:
+        for cache in caches:
+            if cache is not None:
+                cache.save()
+                print(cache.statistics())
+        if statistics is not None:
+            print(statistics.summary("semantic analysis, all modules"))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Collect, tokenize and semantically analyse the YAPL modules in a directory, in memory')
+    parser.add_argument('-i', '--input', dest='input_directory', required=True,
+                        help='the directory to process YAPL packages within')
+    parser.add_argument('-t', '--transpilation', dest='transpilation_directory', required=True,
+                        help='The transpilation directory')
+    parser.add_argument('--codec', dest='codec', choices=ALL_CODECS, default=DEFAULT_CODEC,
+                        help='The codec that line records are encoded with (default: {})'.format(DEFAULT_CODEC))
+    parser.add_argument('--checkpoints', dest='checkpoints', action='store_true',
+                        help='Also write the module lines and tokenized lines of each module, as the staged scripts do')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='Neither look up nor store tokens and semantic tokens in the transpilation-wide cache')
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, default=1,
+                        help='The number of processes that modules are spread across (default: 1)')
+    parser.add_argument('--statistics', dest='statistics', action='store_true',
+                        help='Report how many semantic analyzers were attempted on the lines of each module, and of all modules')
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1 @@
+__all__ = ["corpus", "frontend", "lexeme_memory", "lexer_throughput"]
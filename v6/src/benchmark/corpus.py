@@ -0,0 +1,84 @@
+import io
+import os
+
+INDENT = "    "
+HORIZONTAL_RULE_WIDTH = 116
+CLASS_FACET_TYPES = ["facet", "interface", "trait"]
+IDENTIFIER_TYPES = [("is", "integer"), ("is", "boolean"), ("references", "garden")]
+
+def horizontal_rule(depth):
+    return INDENT * depth + "-" * (HORIZONTAL_RULE_WIDTH - len(INDENT) * depth)
+
+def generate_lines(modules=1, classes=10, facets=2, callables=4, identifiers=3, errors=0):
+    """
+        generates the lines of a synthetic, valid YAPL file, following the grammar in v6/docs
+
+        'modules' is the number of modules in the file
+        'classes' is the number of classes per module
+        'facets' is the number of class-facets per class, which cycle through the facet, interface and trait types
+        'callables' is the number of methods per class-facet
+        'identifiers' is the number of identifier declarations per inputs- and returns-segment
+        'errors' is the number of error declarations per errors-segment, where no errors-segment is generated for 0
+    """
+    for m in range(modules):
+        if m > 0:
+            yield ""
+        yield horizontal_rule(0)
+        yield "-- generated module number {}, for benchmarking purposes".format(m)
+        yield horizontal_rule(0)
+        yield "module org.yapllang.benchmark.module_{}:".format(m)
+        for c in range(classes):
+            yield ""
+            if c % 2 == 0:
+                yield "    class class_{}_{}: -- generated class number {}".format(m, c, c)
+            else:
+                yield horizontal_rule(1)
+                yield "    -- generated class number {}, commented using prefix-notation".format(c)
+                yield horizontal_rule(1)
+                yield "    class class_{}_{}:".format(m, c)
+            for f in range(facets):
+                yield ""
+                yield "        public {} facet_{}: -- generated class-facet number {}".format(CLASS_FACET_TYPES[f % len(CLASS_FACET_TYPES)], f, f)
+                for k in range(callables):
+                    yield ""
+                    yield horizontal_rule(3)
+                    yield "            -- generated method number {}, for benchmarking purposes".format(k)
+                    yield horizontal_rule(3)
+                    yield "            method method_{}:".format(k)
+                    for segment, name in (("inputs", "argument"), ("returns", "result")):
+                        yield ""
+                        yield "                {}:".format(segment)
+                        yield ""
+                        for i in range(identifiers):
+                            relationship, type_name = IDENTIFIER_TYPES[i % len(IDENTIFIER_TYPES)]
+                            yield "                    {}_{} {} {} -- generated {} number {}".format(name, i, relationship, type_name, name, i)
+                    if errors > 0:
+                        yield ""
+                        yield "                errors:"
+                        yield ""
+                        for e in range(errors):
+                            yield "                    error_{} -- generated error number {}".format(e, e)
+
+
+def write_file(file_name, **kwargs):
+    """
+        writes a synthetic YAPL file to 'file_name', passing 'kwargs' on to generate_lines
+    """
+    directory_name = os.path.dirname(os.path.abspath(file_name))
+    os.makedirs(directory_name, mode=0o777, exist_ok=True)
+    with io.open(file_name, "w") as f:
+        for line in generate_lines(**kwargs):
+            f.write(line + "\n")
+
+def write_corpus(directory_name, files=1, **kwargs):
+    """
+        writes 'files' synthetic YAPL files to 'directory_name', passing 'kwargs' on to generate_lines
+
+        returns the list of file names written
+    """
+    file_names = []
+    for index in range(files):
+        file_name = os.path.join(directory_name, "corpus_{}.py.yapl".format(index))
+        write_file(file_name, **kwargs)
+        file_names.append(file_name)
+    return file_names
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+    Benchmarks the v6 frontend on a synthetic corpus: times Lexer.analyze_line and Job.run, and measures the peak of
+    the Python heap that tracemalloc traces during Job.run, with and without compacting the Contexts. The traced heap
+    is not the resident set size of the process, as it leaves out the interpreter and the allocator's overhead, so the
+    peak resident set size of a process that runs just the Job is measured as well, where the platform reports it. The
+    results are written as JSON, and can be compared against the JSON of an earlier run.
+
+    usage (from v6/src): python3 -m benchmark.frontend [--classes N] [--no-line-cache] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmark.corpus import write_corpus
+from transpiler.frontend.file_reader import FileReader
+from transpiler.frontend.lexer import LineCache, Lexer
+from transpiler.job import Job
+
+# the metrics that are compared against a baseline, and whether higher values are better
+COMPARED_METRICS = [
+    ("lexer", "lines_per_second", True),
+    ("lexer", "tokens_per_second", True),
+    ("job", "lines_per_second", True),
+    ("job", "tokens_per_second", True),
+    ("job", "traced_heap_peak_bytes", False),
+    ("job", "compact_traced_heap_peak_bytes", False),
+    ("job", "peak_rss_bytes", False),
+    ("job", "compact_peak_rss_bytes", False)
+]
+
+# runs a Job in a fresh interpreter, and prints the peak resident set size of that interpreter, in bytes. On linux,
+# getrusage's maxrss survives the exec of the interpreter, so that it would report the benchmark's own peak if that is
+# higher, while the VmHWM of /proc/self/status starts over
+PEAK_RSS_SCRIPT = """
+import os, resource, sys
+from benchmark.frontend import run_job
+run_job(sys.argv[1], compact=sys.argv[2] == "compact")
+if os.path.exists("/proc/self/status"):
+    with open("/proc/self/status") as f:
+        print(1024 * int(next(line for line in f if line.startswith("VmHWM:")).split()[1]))
+else:
+    # ru_maxrss is in bytes on macos
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def time_lexer(file_names, repeat, line_cache=True):
+    """
+        times Lexer.analyze_line over the lines of 'file_names', returning a tuple of (best seconds, lines, tokens,
+        line cache hit rate)
+
+        each repetition starts with an empty LineCache, that is shared by the files, or without one if 'line_cache'
+        is not set
+    """
+    lines_per_file = [list(FileReader(file_name).read_lines()) for file_name in file_names]
+    best = None
+    line_count = 0
+    token_count = 0
+    hit_rate = 0.0
+    for _ in range(repeat):
+        line_count = 0
+        token_count = 0
+        cache = LineCache() if line_cache else None
+        started = time.perf_counter()
+        for lines in lines_per_file:
+            lexer = Lexer(line_cache=cache)
+            for line in lines:
+                token_count += len(lexer.analyze_line(line).peek_tokens())
+                line_count += 1
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        hit_rate = cache.get_hit_rate() if cache is not None else 0.0
+    return best, line_count, token_count, hit_rate
+
+def run_job(file_name, compact=False):
+    job = Job()
+    job.set_input_file_name(file_name)
+    if compact:
+        job.set_compacting_contents()
+    with contextlib.redirect_stdout(io.StringIO()):
+        job.run()
+    assert not job.failed(), "expected the synthetic corpus to be valid YAPL, but {} failed".format(file_name)
+
+def time_jobs(file_names, repeat):
+    """
+        times Job.run over 'file_names', returning the best number of seconds
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for file_name in file_names:
+            run_job(file_name)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def measure_traced_heap_peak(file_names, compact=False):
+    """
+        measures the peak of the Python heap that tracemalloc traces while Job.run runs on the largest of 'file_names',
+        in bytes, compacting the Contexts if 'compact' is set
+    """
+    file_name = max(file_names, key=os.path.getsize)
+    tracemalloc.start()
+    try:
+        run_job(file_name, compact)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def measure_peak_rss(file_names, compact=False):
+    """
+        measures the peak resident set size of a fresh process that runs Job.run on the largest of 'file_names', in
+        bytes, compacting the Contexts if 'compact' is set
+
+        returns None on platforms without the resource module
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    file_name = max(file_names, key=os.path.getsize)
+    completed_process = subprocess.run(
+        [sys.executable, "-c", PEAK_RSS_SCRIPT, file_name, "compact" if compact else "full"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), stdout=subprocess.PIPE, check=True
+    )
+    return int(completed_process.stdout)
+
+def run_benchmarks(corpus_parameters, files, repeat, line_cache=True):
+    """
+        generates a corpus of 'files' files with 'corpus_parameters', and benchmarks the frontend on it, lexing with a
+        LineCache if 'line_cache' is set
+
+        returns the results as a dictionary that can be serialized to JSON
+    """
+    with tempfile.TemporaryDirectory(prefix="yapl-benchmark-") as directory_name:
+        file_names = write_corpus(directory_name, files=files, **corpus_parameters)
+        lexer_seconds, line_count, token_count, line_cache_hit_rate = time_lexer(file_names, repeat, line_cache)
+        job_seconds = time_jobs(file_names, repeat)
+        traced_heap_peak_bytes = measure_traced_heap_peak(file_names)
+        compact_traced_heap_peak_bytes = measure_traced_heap_peak(file_names, compact=True)
+        peak_rss_bytes = measure_peak_rss(file_names)
+        compact_peak_rss_bytes = measure_peak_rss(file_names, compact=True)
+    return {
+        "python": platform.python_version(),
+        "corpus": dict(corpus_parameters, files=files),
+        "lines": line_count,
+        "tokens": token_count,
+        "lexer": {
+            "seconds": lexer_seconds,
+            "lines_per_second": line_count / lexer_seconds,
+            "tokens_per_second": token_count / lexer_seconds,
+            "line_cache_hit_rate": line_cache_hit_rate
+        },
+        "job": {
+            "seconds": job_seconds,
+            "lines_per_second": line_count / job_seconds,
+            "tokens_per_second": token_count / job_seconds,
+            "traced_heap_peak_bytes": traced_heap_peak_bytes,
+            "compact_traced_heap_peak_bytes": compact_traced_heap_peak_bytes,
+            "peak_rss_bytes": peak_rss_bytes,
+            "compact_peak_rss_bytes": compact_peak_rss_bytes
+        }
+    }
+
+def compare(results, baseline):
+    """
+        returns a list of report lines, comparing the metrics of 'results' against those of 'baseline'
+    """
+    report = []
+    if results["corpus"] != baseline["corpus"]:
+        report.append("warning: the baseline was measured on a different corpus: {}".format(baseline["corpus"]))
+    for section, metric, higher_is_better in COMPARED_METRICS:
+        if baseline[section].get(metric) is None or results[section][metric] is None:
+            # the baseline predates the metric, or either platform doesn't report it
+            continue
+        value = results[section][metric]
+        baseline_value = baseline[section][metric]
+        ratio = value / baseline_value if baseline_value else float("inf")
+        improved = ratio > 1.0 if higher_is_better else ratio < 1.0
+        report.append("{}.{}: {:.0f} (baseline {:.0f}, {:.2f}x, {})".format(
+            section, metric, value, baseline_value, ratio, "better" if improved else "worse or equal"
+        ))
+    return report
+
+def main(args):
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--files", help="the number of files in the generated corpus", type=int, default=1)
+    argument_parser.add_argument("--modules", help="the number of modules per file", type=int, default=1)
+    argument_parser.add_argument("--classes", help="the number of classes per module", type=int, default=100)
+    argument_parser.add_argument("--facets", help="the number of class-facets per class", type=int, default=2)
+    argument_parser.add_argument("--callables", help="the number of methods per class-facet", type=int, default=4)
+    argument_parser.add_argument("--identifiers", help="the number of identifier declarations per inputs- and returns-segment", type=int, default=3)
+    argument_parser.add_argument("--errors", help="the number of error declarations per errors-segment", type=int, default=2)
+    argument_parser.add_argument("--repeat", help="the number of timed repetitions, of which the best is reported", type=int, default=3)
+    argument_parser.add_argument("--no-line-cache", help="time the lexer without a LineCache", action="store_true")
+    argument_parser.add_argument("-o", "--output", help="the JSON file to write the results to")
+    argument_parser.add_argument("-b", "--baseline", help="a JSON file with the results of an earlier run, to compare against")
+    args = argument_parser.parse_args(args[1:])
+
+    corpus_parameters = {
+        "modules": args.modules,
+        "classes": args.classes,
+        "facets": args.facets,
+        "callables": args.callables,
+        "identifiers": args.identifiers,
+        "errors": args.errors
+    }
+    results = run_benchmarks(corpus_parameters, args.files, args.repeat, line_cache=not args.no_line_cache)
+
+    print("lines: {}, tokens: {}".format(results["lines"], results["tokens"]))
+    print("lexer: {:.3f}s, {:.0f} lines/sec, {:.0f} tokens/sec, line cache hit rate {:.1%}".format(
+        results["lexer"]["seconds"], results["lexer"]["lines_per_second"], results["lexer"]["tokens_per_second"],
+        results["lexer"]["line_cache_hit_rate"]
+    ))
+    print("job:   {:.3f}s, {:.0f} lines/sec, {:.0f} tokens/sec".format(
+        results["job"]["seconds"], results["job"]["lines_per_second"], results["job"]["tokens_per_second"]
+    ))
+    print("job:   traced Python heap peak {:.1f}MB ({:.1f}MB compacted)".format(
+        results["job"]["traced_heap_peak_bytes"] / (1024 * 1024),
+        results["job"]["compact_traced_heap_peak_bytes"] / (1024 * 1024)
+    ))
+    if results["job"]["peak_rss_bytes"] is not None:
+        print("job:   process peak RSS {:.1f}MB ({:.1f}MB compacted)".format(
+            results["job"]["peak_rss_bytes"] / (1024 * 1024),
+            results["job"]["compact_peak_rss_bytes"] / (1024 * 1024)
+        ))
+    if args.baseline:
+        with io.open(args.baseline) as f:
+            baseline = json.load(f)
+        for line in compare(results, baseline):
+            print(line)
+    if args.output:
+        with io.open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main(sys.argv)
+    sys.exit(exit_code)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+    Reports the memory held by lexically-analyzed lines, in bytes per token, on a synthetic YAPL file, and compares the
+    lexemes against copies of them in the form that lexemes had before they declared __slots__, with the attributes
+    in a per-instance __dict__ and values that aren't interned.
+
+    usage (from v6/src): python3 -m benchmark.lexeme_memory [--classes N]
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from benchmark.corpus import generate_lines
+from transpiler.frontend.lexer import Lexer
+
+class DictLexeme(object):
+    """
+        a lexeme as it was before lexemes declared __slots__
+    """
+
+    def __init__(self, value, offset):
+        self.__value = value
+        self.__offset = offset
+        self.__lexical_line = None
+
+def copy_as_dict_lexeme(lexeme):
+    value = lexeme.get_lexeme_value()
+    # a value that the scanner matched was a new string for every lexeme, rather than an interned one
+    return DictLexeme((value + " ")[:-1], lexeme.get_offset())
+
+def measure_traced_size(function, *args):
+    """
+        calls 'function' with 'args', and returns what it returns, and the size of the memory that it still holds
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        gc.collect()
+        traced_size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, traced_size
+
+def lexeme_size(lexeme):
+    size = sys.getsizeof(lexeme)
+    if hasattr(lexeme, "__dict__"):
+        size += sys.getsizeof(lexeme.__dict__)
+    return size
+
+def main(args):
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--classes", help="the number of classes in the generated file", type=int, default=200)
+    args = argument_parser.parse_args(args[1:])
+
+    lines = list(generate_lines(classes=args.classes))
+    lexer = Lexer()
+
+    analyzed_lines, traced_size = measure_traced_size(lambda: [lexer.analyze_line(line) for line in lines])
+
+    tokens = [token for analyzed_line in analyzed_lines for token in analyzed_line.peek_tokens()]
+    lexemes, traced_lexemes_size = measure_traced_size(lambda: [token.copy() for token in tokens])
+    dict_lexemes, traced_dict_lexemes_size = measure_traced_size(lambda: [copy_as_dict_lexeme(token) for token in tokens])
+
+    print("lines: {}, tokens: {}".format(len(lines), len(tokens)))
+    print("lexeme objects: {:.1f} -> {:.1f} bytes per token".format(
+        sum(lexeme_size(lexeme) for lexeme in dict_lexemes) / len(tokens),
+        sum(lexeme_size(lexeme) for lexeme in lexemes) / len(tokens)
+    ))
+    print("lexemes, including their values and the list of them: {:.1f} -> {:.1f} bytes per token".format(
+        traced_dict_lexemes_size / len(tokens),
+        traced_lexemes_size / len(tokens)
+    ))
+    print("analyzed lines, including lexemes: {:.1f} bytes per token".format(traced_size / len(tokens)))
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main(sys.argv)
+    sys.exit(exit_code)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+    Compares the throughput of the single-pass Scanner against the original multi-pass lexer, on a
+    synthetic YAPL file.
+
+    usage (from v6/src): python3 -m benchmark.lexer_throughput [--classes N] [--repeat N]
+"""
+import argparse
+import sys
+import time
+
+from benchmark.corpus import generate_lines
+from benchmark.multi_pass_lexer import multi_pass_scan
+from transpiler.frontend.scanner import Scanner
+
+def describe(tokens):
+    return [(type(token).__name__, token.get_lexeme_value(), token.get_offset()) for token in tokens]
+
+def time_scan(scan, lines, repeat):
+    best = None
+    token_count = 0
+    for _ in range(repeat):
+        token_count = 0
+        started = time.perf_counter()
+        for line in lines:
+            token_count += len(scan(line))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, token_count
+
+def main(args):
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--classes", help="the number of classes in the generated file", type=int, default=200)
+    argument_parser.add_argument("--repeat", help="the number of timed repetitions, of which the best is reported", type=int, default=3)
+    args = argument_parser.parse_args(args[1:])
+
+    lines = list(generate_lines(classes=args.classes))
+    scanner = Scanner()
+
+    for line in lines:
+        expected = describe(multi_pass_scan(line))
+        actual = describe(scanner.scan(line.rstrip()))
+        assert expected == actual, "scanner disagrees with the multi-pass lexer on \"{}\": {} != {}".format(line, expected, actual)
+
+    multi_pass_elapsed, token_count = time_scan(multi_pass_scan, lines, args.repeat)
+    scanner_elapsed, _ = time_scan(lambda line: scanner.scan(line.rstrip()), lines, args.repeat)
+
+    print("lines: {}, tokens: {}".format(len(lines), token_count))
+    print("multi-pass lexer: {:.3f}s, {:.0f} lines/sec, {:.0f} tokens/sec".format(
+        multi_pass_elapsed, len(lines) / multi_pass_elapsed, token_count / multi_pass_elapsed
+    ))
+    print("scanner:          {:.3f}s, {:.0f} lines/sec, {:.0f} tokens/sec".format(
+        scanner_elapsed, len(lines) / scanner_elapsed, token_count / scanner_elapsed
+    ))
+    print("speedup: {:.1f}x".format(multi_pass_elapsed / scanner_elapsed))
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main(sys.argv)
+    sys.exit(exit_code)
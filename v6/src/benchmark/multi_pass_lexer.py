@@ -0,0 +1,55 @@
+"""
+    The original, multi-pass lexer algorithm, kept as the reference that the single-pass Scanner is benchmarked and
+    tested against.
+
+    On every pass, each lexeme type in ALL_LEXEME_TYPES is tried once, in order, against what is left of the line, so
+    that a lexeme that immediately follows another one can only be of a type that comes later in the order, until the
+    next pass. A pass that consumes nothing skips the input up to the next whitespace, as an UnrecognizedInput lexeme,
+    as the Scanner does.
+"""
+import re
+
+from transpiler.frontend.lexemes import ALL_LEXEME_TYPES, EmptyLine, UnrecognizedInput
+
+UNRECOGNIZED_INPUT = re.compile(r"\S+")
+
+def advance_offset(input, output, current_offset):
+    return output, current_offset + len(input) - len(output)
+
+def consume(tokens, input, lexeme_type, offset):
+    """
+        consumes a lexeme of 'lexeme_type' from the start of 'input', returning what is left of it, and its offset
+    """
+    if lexeme_type is EmptyLine:
+        if input == "":
+            tokens.append(EmptyLine(offset))
+        return input, offset
+    token_result = re.match(lexeme_type.PATTERN, input)
+    if token_result:
+        token = token_result[0].rstrip()
+        tokens.append(lexeme_type.from_token(token, offset))
+        output = input[len(token):]
+    else:
+        output = input
+    return advance_offset(input, output, offset)
+
+def multi_pass_scan(line):
+    """
+        scans 'line' the way the original lexer did, returning the list of lexemes that it contains
+    """
+    offset = 0
+    tokens = []
+    stripped = line.rstrip()
+    while True:
+        stripped, offset = advance_offset(stripped, stripped.lstrip(), offset)
+        remaining = stripped
+        for lexeme_type in ALL_LEXEME_TYPES:
+            stripped, offset = consume(tokens, stripped, lexeme_type, offset)
+        if stripped and stripped == remaining:
+            unrecognized_input = UNRECOGNIZED_INPUT.match(stripped).group()
+            tokens.append(UnrecognizedInput(unrecognized_input, offset))
+            stripped, offset = advance_offset(stripped, stripped[len(unrecognized_input):], offset)
+        if len(stripped) > 0:
+            continue
+        break
+    return tokens
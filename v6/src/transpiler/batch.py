@@ -0,0 +1,167 @@
+import concurrent.futures
+import contextlib
+import cProfile
+import io
+import os
+import traceback
+
+from transpiler.cache import ParseCache
+from transpiler.diagnostics import create_sink, Diagnostic, FORMAT_TEXT, SEVERITY_ERROR
+from transpiler.job import Job
+from transpiler.output_writer import OutputWriter
+from transpiler.profiler import Profile
+from transpiler.syntax_tree import dumps as dump_syntax_tree
+
+def collect_input_files(paths):
+    """
+        expands a list of files and directories into a list of tuples of (input_file_name, relative_input_file_name),
+        sorted by the absolute input file name, recursing into directories to find files with a .yapl extension
+
+        the relative input file name is relative to the input root that the file was found through, i.e. the directory
+        that was given, or the directory of a file that was given itself. A file that was found through several paths
+        keeps the relative input file name of the first.
+    """
+    relative_input_file_names = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for directory_name, _, file_names in os.walk(path):
+                for file_name in file_names:
+                    if file_name.endswith(".yapl"):
+                        input_file_name = os.path.abspath(os.path.join(directory_name, file_name))
+                        relative_input_file_names.setdefault(input_file_name, os.path.relpath(input_file_name, os.path.abspath(path)))
+        else:
+            relative_input_file_names.setdefault(os.path.abspath(path), os.path.basename(path))
+    return sorted(relative_input_file_names.items())
+
+def get_syntax_tree_name(relative_input_file_name):
+    """
+        retrieves the name, relative to the output directory, of the serialized syntax tree of an input file, which
+        mirrors the input file's name relative to its input root, with an .ast extension instead of .yapl
+    """
+    if relative_input_file_name.endswith(".yapl"):
+        relative_input_file_name = relative_input_file_name[:-len(".yapl")]
+    return relative_input_file_name + ".ast"
+
+def get_syntax_tree_names(input_files):
+    """
+        retrieves a dictionary of the names of the serialized syntax trees of 'input_files', the tuples that
+        collect_input_files() returns, by input file name
+
+        raises a ValueError if the syntax trees of several input files would have the same name
+    """
+    syntax_tree_names = {}
+    input_file_names_by_syntax_tree_name = {}
+    for input_file_name, relative_input_file_name in input_files:
+        syntax_tree_name = get_syntax_tree_name(relative_input_file_name)
+        other_input_file_name = input_file_names_by_syntax_tree_name.setdefault(syntax_tree_name, input_file_name)
+        if other_input_file_name != input_file_name:
+            raise ValueError("the syntax trees of {} and {} would both be written to {}".format(
+                other_input_file_name, input_file_name, syntax_tree_name
+            ))
+        syntax_tree_names[input_file_name] = syntax_tree_name
+    return syntax_tree_names
+
+def create_internal_error(input_file_name, exception):
+    """
+        creates an error Diagnostic for an exception that a Job raised while transpiling 'input_file_name', naming the
+        exception and the place that it was raised at
+    """
+    message = "internal error: {}".format("".join(traceback.format_exception_only(type(exception), exception)).strip())
+    frames = traceback.extract_tb(exception.__traceback__)
+    if frames:
+        message += " (at {}:{})".format(frames[-1].filename, frames[-1].lineno)
+    return Diagnostic(SEVERITY_ERROR, "JOB", "INTERNAL-ERROR", input_file_name, None, None, input_file_name, None, message)
+
+def run_job(input_file_name, output_directory_name=None, verbose=False, memory_mapped=False, cache_directory=None, cache_size_in_bytes=None, diagnostics_format=FORMAT_TEXT, profile=False, pstats_file_name=None, syntax_tree_name=None, previous_outputs=None, compact=False):
+    """
+        runs a single transpilation Job, capturing its diagnostics
+
+        the Job renders its diagnostics in 'diagnostics_format', one of transpiler.diagnostics.ALL_FORMATS
+
+        the Job uses a ParseCache in 'cache_directory', bounded to 'cache_size_in_bytes', if a cache directory is given
+
+        if 'profile' is set, the Job's phases and Contexts are timed. If 'pstats_file_name' is given, the Job is also
+        run under cProfile, and its statistics are dumped to that file
+
+        if 'compact' is set, the Contexts release their lexically-analyzed-lines as soon as they are processed, which
+        bounds the memory that the Job holds on to while parsing a large input file
+
+        if 'syntax_tree_name' is given, and the Job succeeds, the serialized syntax tree of the input file is written to
+        the output directory, under that name (see get_syntax_tree_names()). It is written through an OutputWriter, so
+        an unchanged syntax tree is not rewritten; 'previous_outputs' is the dictionary of the manifest entries of the
+        files that an earlier run produced from the input file, if the manifest was loaded, which spares hashing the
+        files that are already on disk
+
+        an exception that the Job raises is reported as an INTERNAL-ERROR diagnostic, after the diagnostics that the Job
+        reported before it, and fails the Job, rather than aborting the other Jobs
+
+        returns a tuple of (input_file_name, failed, diagnostics, profile, outputs), where diagnostics is the rendered
+        diagnostics of the Job, profile is the dictionary of its Profile, or None if it wasn't profiled, and outputs is
+        the dictionary of the manifest entries of the files that the Job produced in the output directory
+    """
+    job = Job()
+    job.set_input_file_name(input_file_name)
+    if output_directory_name:
+        job.set_output_directory_name(output_directory_name)
+    if verbose:
+        job.set_verbose()
+    job.set_diagnostics_format(diagnostics_format)
+    if memory_mapped:
+        job.set_memory_mapped()
+    if compact:
+        job.set_compacting_contents()
+    if profile:
+        job.set_profile(Profile())
+    diagnostics = io.StringIO()
+    outputs = {}
+    try:
+        if cache_directory:
+            job.set_cache(ParseCache(cache_directory, cache_size_in_bytes))
+        with contextlib.redirect_stdout(diagnostics):
+            if pstats_file_name:
+                profiler = cProfile.Profile()
+                profiler.runcall(job.run)
+                profiler.dump_stats(pstats_file_name)
+            else:
+                job.run()
+        if syntax_tree_name and output_directory_name and not job.failed():
+            output_writer = OutputWriter(job.get_output_directory_name(), input_file_name, previous_outputs)
+            output_writer.write(syntax_tree_name, dump_syntax_tree(job.get_file_context()))
+            outputs = output_writer.get_entries()
+    except Exception as e:
+        job.set_failed()
+        outputs = {}
+        create_sink(diagnostics_format, diagnostics).write(create_internal_error(input_file_name, e))
+    profile_dict = job.get_profile().to_dict() if profile else None
+    return input_file_name, job.failed(), diagnostics.getvalue(), profile_dict, outputs
+
+def run_jobs(input_file_names, workers=None, pstats_directory_name=None, syntax_tree_names=None, manifest=None, **kwargs):
+    """
+        runs one transpilation Job per input file, in a pool of 'workers' processes, passing 'kwargs' on to run_job
+
+        if 'pstats_directory_name' is given, each Job dumps its cProfile statistics to a numbered file in that
+        directory
+
+        if 'syntax_tree_names' is given, each Job writes the serialized syntax tree of its input file under the name
+        that this dictionary holds for the input file
+
+        if 'manifest' is given, the Manifest of the output directory as it was loaded, each Job is only passed the
+        manifest entries of its own input file. The caller merges the outputs of the Jobs back into the Manifest.
+
+        yields the results of run_job in the order of 'input_file_names', regardless of the order in which the
+        Jobs complete. A single worker runs all Jobs in the current process.
+    """
+    def get_pstats_file_name(index):
+        if pstats_directory_name is None:
+            return None
+        return os.path.join(pstats_directory_name, "{}.pstats".format(index))
+    syntax_tree_names = syntax_tree_names or {}
+    previous_outputs = manifest.get_entries_by_source() if manifest is not None else {}
+    if workers == 1 or len(input_file_names) <= 1:
+        for index, input_file_name in enumerate(input_file_names):
+            yield run_job(input_file_name, pstats_file_name=get_pstats_file_name(index), syntax_tree_name=syntax_tree_names.get(input_file_name), previous_outputs=previous_outputs.get(input_file_name), **kwargs)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_job, input_file_name, pstats_file_name=get_pstats_file_name(index), syntax_tree_name=syntax_tree_names.get(input_file_name), previous_outputs=previous_outputs.get(input_file_name), **kwargs) for index, input_file_name in enumerate(input_file_names)]
+        for future in futures:
+            yield future.result()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+from transpiler.batch import collect_input_files, get_syntax_tree_names, run_jobs
+
+VALID_FILE = """module org.yapllang.test: -- the test module
+
+    class only_class: -- the only class
+
+        public facet only_facet:
+
+            method only_method: -- the only method
+
+                inputs:
+
+                    only_input is integer -- the only input
+"""
+
+
+class TestRunJobs(unittest.TestCase):
+    """
+        Unit test suite for running a batch of transpilation Jobs
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_input_file(self, relative_file_name, content):
+        file_name = os.path.join(self.directory.name, relative_file_name)
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        with open(file_name, "w") as f:
+            f.write(content)
+        return file_name
+
+    def test_an_exception_fails_only_its_own_job(self):
+        missing_file_name = os.path.join(self.directory.name, "missing.py.yapl")
+        valid_file_name = self.write_input_file("valid.py.yapl", VALID_FILE)
+        results = list(run_jobs([missing_file_name, valid_file_name], workers=1))
+        self.assertEqual([missing_file_name, valid_file_name], [result[0] for result in results])
+        _, failed, diagnostics, _, _ = results[0]
+        self.assertTrue(failed)
+        self.assertIn("error_code=INTERNAL-ERROR", diagnostics)
+        self.assertIn("FileNotFoundError", diagnostics)
+        _, failed, diagnostics, _, _ = results[1]
+        self.assertFalse(failed)
+        self.assertEqual("", diagnostics)
+
+
+class TestSyntaxTreeNames(unittest.TestCase):
+    """
+        Unit test suite for naming the serialized syntax trees of input files in the output directory
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_directory_name = os.path.join(self.directory.name, "input")
+        self.output_directory_name = os.path.join(self.directory.name, "output")
+        self.input_file_names = []
+        for subdirectory_name in ("a", "b"):
+            input_file_name = os.path.join(self.input_directory_name, subdirectory_name, "x.py.yapl")
+            os.makedirs(os.path.dirname(input_file_name))
+            with open(input_file_name, "w") as f:
+                f.write(VALID_FILE)
+            self.input_file_names.append(input_file_name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_jobs(self, syntax_tree_names):
+        return list(run_jobs(self.input_file_names, workers=1, syntax_tree_names=syntax_tree_names, output_directory_name=self.output_directory_name))
+
+    def test_same_named_inputs_mirror_their_paths_relative_to_the_input_root(self):
+        syntax_tree_names = get_syntax_tree_names(collect_input_files([self.input_directory_name]))
+        self.assertEqual([os.path.join("a", "x.py.ast"), os.path.join("b", "x.py.ast")], [syntax_tree_names[name] for name in self.input_file_names])
+        results = self.run_jobs(syntax_tree_names)
+        self.assertEqual(syntax_tree_names, dict((result[0], name) for result in results for name in result[4]))
+        mtimes = [os.stat(os.path.join(self.output_directory_name, name)).st_mtime_ns for name in syntax_tree_names.values()]
+        # neither syntax tree overwrites the other, so that a second run rewrites neither of them
+        self.run_jobs(syntax_tree_names)
+        self.assertEqual(mtimes, [os.stat(os.path.join(self.output_directory_name, name)).st_mtime_ns for name in syntax_tree_names.values()])
+
+    def test_same_named_input_files_given_themselves_collide(self):
+        with self.assertRaises(ValueError):
+            get_syntax_tree_names(collect_input_files(self.input_file_names))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import gc
+import hashlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "yapl", "v6")
+DEFAULT_CACHE_SIZE_IN_BYTES = 256 * 1024 * 1024
+
+def calculate_sha256_of_file(file_name):
+    sha256_hash = hashlib.sha256()
+    with io.open(file_name, "rb") as f:
+        def read_block():
+            return f.read(100 * 1024)
+        for block in iter(read_block, b""):
+            sha256_hash.update(block)
+    return sha256_hash.hexdigest()
+
+def calculate_frontend_version_stamp():
+    """
+        calculates a stamp that changes whenever the frontend's source code or the python version changes, so that
+        stale cache entries are never loaded
+    """
+    sha256_hash = hashlib.sha256()
+    sha256_hash.update(sys.version.encode("utf-8"))
+    transpiler_directory = os.path.dirname(os.path.abspath(__file__))
+    source_file_names = []
+    for directory_name, _, file_names in os.walk(os.path.join(transpiler_directory, "frontend")):
+        for file_name in file_names:
+            if file_name.endswith(".py"):
+                source_file_names.append(os.path.join(directory_name, file_name))
+    source_file_names.append(os.path.join(transpiler_directory, "job.py"))
+    source_file_names.append(os.path.join(transpiler_directory, "diagnostics.py"))
+    for source_file_name in sorted(source_file_names):
+        sha256_hash.update(os.path.relpath(source_file_name, transpiler_directory).encode("utf-8"))
+        sha256_hash.update(calculate_sha256_of_file(source_file_name).encode("utf-8"))
+    return sha256_hash.hexdigest()
+
+class ParseCache(object):
+    """
+        An on-disk cache of parsed FileContext trees and their error Diagnostics, keyed by the sha256 of the input file,
+        its name, and the frontend version stamp.
+
+        The cache is bounded in size; when it grows beyond 'max_size_in_bytes', the least recently used entries are
+        evicted.
+    """
+
+    __frontend_version_stamp = None
+
+    def __init__(self, cache_directory=DEFAULT_CACHE_DIRECTORY, max_size_in_bytes=DEFAULT_CACHE_SIZE_IN_BYTES):
+        self.__cache_directory = os.path.abspath(cache_directory)
+        self.__max_size_in_bytes = max_size_in_bytes
+
+    @classmethod
+    def get_frontend_version_stamp(cls):
+        if cls.__frontend_version_stamp is None:
+            cls.__frontend_version_stamp = calculate_frontend_version_stamp()
+        return cls.__frontend_version_stamp
+
+    def get_cache_directory(self):
+        return self.__cache_directory
+
+    def __entry_file_name(self, input_file_name):
+        sha256_hash = hashlib.sha256()
+        sha256_hash.update(ParseCache.get_frontend_version_stamp().encode("utf-8"))
+        sha256_hash.update(input_file_name.encode("utf-8"))
+        sha256_hash.update(calculate_sha256_of_file(input_file_name).encode("utf-8"))
+        return os.path.join(self.__cache_directory, sha256_hash.hexdigest() + ".pickle")
+
+    def load(self, input_file_name):
+        """
+            loads the cached results for 'input_file_name', returning a tuple of (file_context, errors), or None
+            if the file is not in the cache
+        """
+        entry_file_name = self.__entry_file_name(input_file_name)
+        try:
+            f = io.open(entry_file_name, "rb")
+        except OSError:
+            return None
+        # the unpickled tree is long-lived, so the garbage collector would only waste its time on it while it is
+        # unpickled
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with f:
+                file_context, errors = pickle.load(f)
+        except Exception:
+            # a corrupt entry may fail to unpickle with any exception, and is a cache miss, which is removed so that it
+            # is stored again, rather than failing every later run
+            self.__remove(entry_file_name)
+            return None
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        # mark the entry as recently used, for the sake of eviction
+        os.utime(entry_file_name)
+        return file_context, errors
+
+    def store(self, input_file_name, file_context, errors):
+        """
+            stores the results for 'input_file_name' in the cache, and evicts entries if the cache grew too large
+        """
+        os.makedirs(self.__cache_directory, mode=0o777, exist_ok=True)
+        entry_file_name = self.__entry_file_name(input_file_name)
+        file_descriptor, temporary_file_name = tempfile.mkstemp(dir=self.__cache_directory, suffix=".tmp")
+        try:
+            with io.open(file_descriptor, "wb") as f:
+                pickle.dump((file_context, errors), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_file_name, entry_file_name)
+        except:
+            os.unlink(temporary_file_name)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+            removes the least recently used entries until the cache fits within its size bound
+        """
+        entries = []
+        total_size = 0
+        for file_name in os.listdir(self.__cache_directory):
+            if not file_name.endswith(".pickle"):
+                continue
+            entry_file_name = os.path.join(self.__cache_directory, file_name)
+            try:
+                stat = os.stat(entry_file_name)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_file_name))
+            total_size += stat.st_size
+        entries.sort()
+        for _, size, entry_file_name in entries:
+            if total_size <= self.__max_size_in_bytes:
+                break
+            self.__remove(entry_file_name)
+            total_size -= size
+
+    def __remove(self, entry_file_name):
+        try:
+            os.unlink(entry_file_name)
+        except FileNotFoundError:
+            # removed concurrently by another job
+            pass
@@ -0,0 +1,115 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+from transpiler.cache import ParseCache
+from transpiler.job import Job
+from transpiler.job_test import SIBLING_DECLARATIONS
+
+class TestParseCache(unittest.TestCase):
+    """
+        Unit test suite for the ParseCache
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory_name = os.path.join(self.directory.name, "cache")
+        self.cache = ParseCache(self.cache_directory_name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_input_file(self, name, content):
+        input_file_name = os.path.join(self.directory.name, name)
+        with open(input_file_name, "w") as f:
+            f.write(content)
+        return input_file_name
+
+    def get_entry_file_names(self):
+        return sorted(
+            os.path.join(self.cache_directory_name, file_name)
+            for file_name in os.listdir(self.cache_directory_name)
+            if file_name.endswith(".pickle")
+        )
+
+    def test_stored_results_are_loaded(self):
+        input_file_name = self.write_input_file("a.py.yapl", "module a.b.c:\n")
+        self.cache.store(input_file_name, {"tree": "a"}, ["error"])
+        self.assertEqual(({"tree": "a"}, ["error"]), self.cache.load(input_file_name))
+
+    def test_files_that_were_not_stored_miss(self):
+        self.assertIsNone(self.cache.load(self.write_input_file("a.py.yapl", "module a.b.c:\n")))
+
+    def test_changed_files_miss(self):
+        input_file_name = self.write_input_file("a.py.yapl", "module a.b.c:\n")
+        self.cache.store(input_file_name, {"tree": "a"}, [])
+        self.write_input_file("a.py.yapl", "module a.b.d:\n")
+        self.assertIsNone(self.cache.load(input_file_name))
+
+    def test_a_changed_frontend_version_stamp_misses(self):
+        input_file_name = self.write_input_file("a.py.yapl", "module a.b.c:\n")
+        self.cache.store(input_file_name, {"tree": "a"}, [])
+        with unittest.mock.patch.object(ParseCache, "_ParseCache__frontend_version_stamp", "changed"):
+            self.assertIsNone(self.cache.load(input_file_name))
+        self.assertIsNotNone(self.cache.load(input_file_name))
+
+    def store_entry(self, cache, input_file_name, mtime):
+        """
+            stores an entry for 'input_file_name', and returns the name of its file, which is given 'mtime'
+        """
+        existing_entry_file_names = set(self.get_entry_file_names()) if os.path.isdir(self.cache_directory_name) else set()
+        cache.store(input_file_name, "x" * 1000, [])
+        entry_file_name, = set(self.get_entry_file_names()) - existing_entry_file_names
+        os.utime(entry_file_name, (mtime, mtime))
+        return entry_file_name
+
+    def test_least_recently_used_entries_are_evicted(self):
+        input_file_names = [self.write_input_file("{}.py.yapl".format(i), "module a.b.c{}:\n".format(i)) for i in range(4)]
+        entry_file_names = [self.store_entry(self.cache, input_file_names[0], 1)]
+        entry_size = os.path.getsize(entry_file_names[0])
+        cache = ParseCache(self.cache_directory_name, max_size_in_bytes=3 * entry_size)
+        entry_file_names.append(self.store_entry(cache, input_file_names[1], 2))
+        entry_file_names.append(self.store_entry(cache, input_file_names[2], 3))
+        # loading the oldest entry makes it the most recently used one, so that the second one is evicted instead
+        self.assertIsNotNone(cache.load(input_file_names[0]))
+        entry_file_names.append(self.store_entry(cache, input_file_names[3], 4))
+        self.assertEqual(sorted(entry_file_names[:1] + entry_file_names[2:]), self.get_entry_file_names())
+        self.assertLessEqual(sum(os.path.getsize(e) for e in self.get_entry_file_names()), 3 * entry_size)
+        self.assertIsNone(cache.load(input_file_names[1]))
+
+    def test_a_corrupt_entry_falls_back_to_a_parse(self):
+        input_file_name = self.write_input_file("test.py.yapl", SIBLING_DECLARATIONS)
+        self.run_cached_job(input_file_name)
+        entry_file_name, = self.get_entry_file_names()
+        with open(entry_file_name, "r+b") as f:
+            f.seek(10)
+            f.write(b"\xff" * 50)
+        job = self.run_cached_job(input_file_name)
+        self.assertEqual([], [error.to_text() for error in job.get_errors()])
+        self.assertEqual(["first", "second"], [c.get_content_class_name() for c in job.get_file_context().get_content_module("org.yapllang.test").get_content_classes()])
+        # the corrupt entry was replaced, by that of the parse
+        self.assertIsNotNone(self.cache.load(input_file_name))
+
+    def test_a_truncated_entry_is_a_miss_and_is_removed(self):
+        input_file_name = self.write_input_file("a.py.yapl", "module a.b.c:\n")
+        self.cache.store(input_file_name, {"tree": "a"}, [])
+        entry_file_name, = self.get_entry_file_names()
+        with open(entry_file_name, "r+b") as f:
+            f.truncate(5)
+        self.assertIsNone(self.cache.load(input_file_name))
+        self.assertEqual([], self.get_entry_file_names())
+
+    def run_cached_job(self, input_file_name):
+        job = Job()
+        job.set_input_file_name(input_file_name)
+        job.set_cache(self.cache)
+        with contextlib.redirect_stdout(io.StringIO()):
+            job.run()
+        return job
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import sys
+
+SEVERITY_ERROR = "ERROR"
+SEVERITY_TRACE = "TRACE"
+
+FORMAT_TEXT = "text"
+FORMAT_JSON_LINES = "jsonl"
+ALL_FORMATS = [FORMAT_TEXT, FORMAT_JSON_LINES]
+
+def resolve(value):
+    """
+        resolves a value that may have been passed as a thunk, i.e. as a callable that computes the value
+    """
+    if callable(value):
+        return value()
+    return value
+
+class Diagnostic(object):
+    """
+        A structured diagnostic event, i.e. an error or a trace, reported by a component of the transpiler.
+
+        Diagnostics only hold plain values, so that they can be pickled into the parse cache and rendered at a later
+        time. 'byte_offset' points back into the input file, at the lexeme, or at the start of the line if there is no
+        lexeme, and is None if the location isn't known. It is rendered in the JSON Lines format only, as the text
+        format already locates the diagnostic by line and offset.
+    """
+
+    __slots__ = ("severity", "component", "error_code", "file_name", "line_number", "offset", "name", "lexeme", "message", "byte_offset")
+
+    def __init__(self, severity, component, error_code, file_name, line_number, offset, name, lexeme, message, byte_offset=None):
+        self.severity = severity
+        self.component = component
+        self.error_code = error_code
+        self.file_name = file_name
+        self.line_number = line_number
+        self.offset = offset
+        self.name = name
+        self.lexeme = lexeme
+        self.message = message
+        self.byte_offset = byte_offset
+
+    def is_error(self):
+        return self.severity == SEVERITY_ERROR
+
+    def to_dict(self):
+        result = {}
+        for slot in Diagnostic.__slots__:
+            value = getattr(self, slot)
+            if value is not None:
+                result[slot] = value
+        return result
+
+    def to_text(self):
+        if self.error_code is None:
+            reported_by = "reported_by(component={})".format(self.component)
+        else:
+            reported_by = "reported_by(component={}, error_code={})".format(self.component, self.error_code)
+        if self.line_number is None:
+            location = "location(file=\"{}\", name=\"{}\")".format(self.file_name, self.name)
+        elif self.offset is None:
+            location = "location(file=\"{}\", line {}, name=\"{}\")".format(self.file_name, self.line_number, self.name)
+        else:
+            location = "location(file=\"{}\", line {}, offset={}, name=\"{}\")".format(self.file_name, self.line_number, self.offset, self.name)
+        if self.lexeme is None:
+            return "{}: {}, {}, message={}".format(self.severity, reported_by, location, self.message)
+        return "{}: {}, {}, lexeme={}, message={}".format(self.severity, reported_by, location, self.lexeme, self.message)
+
+class TextSink(object):
+    """
+        Renders diagnostics in the human-readable one-line-per-diagnostic format
+    """
+
+    def __init__(self, stream=None):
+        """
+            'stream' is the stream to write to, or None for whatever sys.stdout is at the time of writing
+        """
+        self.__stream = stream
+
+    def write(self, diagnostic):
+        stream = self.__stream if self.__stream is not None else sys.stdout
+        stream.write(diagnostic.to_text() + "\n")
+
+class JsonLinesSink(object):
+    """
+        Renders diagnostics as JSON Lines, i.e. one JSON object per diagnostic
+    """
+
+    def __init__(self, stream=None):
+        """
+            'stream' is the stream to write to, or None for whatever sys.stdout is at the time of writing
+        """
+        self.__stream = stream
+
+    def write(self, diagnostic):
+        stream = self.__stream if self.__stream is not None else sys.stdout
+        stream.write(json.dumps(diagnostic.to_dict(), sort_keys=True) + "\n")
+
+def create_sink(diagnostics_format, stream=None):
+    if diagnostics_format == FORMAT_TEXT:
+        return TextSink(stream)
+    assert diagnostics_format == FORMAT_JSON_LINES, "unknown diagnostics format: {}".format(diagnostics_format)
+    return JsonLinesSink(stream)
+
+class Diagnostics(object):
+    """
+        Records the diagnostics of a transpilation Job, and buffers them until they are flushed to the sinks.
+
+        Traces are only recorded when tracing is enabled, and are rejected before their message thunks are called
+        when it isn't, so that a run without tracing does not pay for formatting trace messages. Errors are always
+        recorded.
+    """
+
+    def __init__(self):
+        self.__sinks = []
+        self.__tracing = False
+        self.__buffer = []
+        self.__errors = []
+
+    def add_sink(self, sink):
+        self.__sinks.append(sink)
+
+    def set_tracing(self):
+        self.__tracing = True
+
+    def is_tracing(self):
+        return self.__tracing and len(self.__sinks) > 0
+
+    def get_errors(self):
+        """
+            retrieves all the error Diagnostics recorded so far, including those that have been flushed
+        """
+        return self.__errors
+
+    def record(self, diagnostic):
+        if diagnostic.is_error():
+            self.__errors.append(diagnostic)
+        if self.__sinks:
+            self.__buffer.append(diagnostic)
+
+    def flush(self):
+        """
+            renders the buffered diagnostics to all sinks, in the order they were recorded
+        """
+        buffer = self.__buffer
+        self.__buffer = []
+        for diagnostic in buffer:
+            for sink in self.__sinks:
+                sink.write(diagnostic)
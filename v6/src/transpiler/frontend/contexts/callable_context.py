@@ -67,23 +67,23 @@ class CallableContext(ContextBaseClass):
         """
         self.trace("callable statement encountered", leading_token)
         self.__callable_type = leading_token.get_lexeme_value()
-        lexer_line = self.peek_lexer_line().consume(leading_token)
-        callable_name = lexer_line.peek_leading_token()
+        token_stream = self.peek_lexer_line().get_token_stream().consume(leading_token)
+        callable_name = token_stream.peek_leading_token()
         if not callable_name.is_identifier():
             self.error("EXPECTED-IDENTIFIER", "callables must have a name", callable_name)
         elif not callable_name.is_valid_identifier():
             self.error("EXPECTED-VALID-IDENTIFIER", "callable names must be valid identifiers", callable_name)
         else:
             self.__callable_name = callable_name.get_lexeme_value()
-            self.trace("callable name: {}".format(self.__callable_name), callable_name)
-            lexer_line = lexer_line.consume(callable_name)
-            colon_token = lexer_line.peek_leading_token()
+            self.trace(lambda: "callable name: {}".format(self.__callable_name), callable_name)
+            token_stream = token_stream.consume(callable_name)
+            colon_token = token_stream.peek_leading_token()
             if not colon_token.is_symbol(":"):
                 self.error("EXPECTED-COLON-TERMINATOR-FOR-CALLABLE-STATEMENT", "callable statements must be terminated by a colon", colon_token)
             else:
-                lexer_line = lexer_line.consume(colon_token)
+                token_stream = token_stream.consume(colon_token)
                 # now there might be an optional suffix comment
-                suffix_comment = lexer_line.peek_leading_token()
+                suffix_comment = token_stream.peek_leading_token()
                 if suffix_comment.is_end_of_line():
                     pass
                 elif suffix_comment.is_comment_horizontal_rule():
@@ -114,12 +114,7 @@ class CallableContext(ContextBaseClass):
         callable_segment_statement_line = self.pop_lexer_line()
         prefix_comment_lines = self.maybe_pop_prefix_comments_at_offset(self.get_indentation_level() + 4)
         # create the callable-segment-context, attach it as a child of this context, and pass control to it
-        siblings_by_name = {}
-        siblings = self.get_contents()
-        for sibling in siblings:
-            if isinstance(sibling, CallableSegmentContext):
-                siblings_by_name[sibling.get_callable_segment_name()] = sibling
-        callable_segment_context = CallableSegmentContext(self, self.get_indentation_level() + 4, siblings_by_name)
+        callable_segment_context = CallableSegmentContext(self, self.get_indentation_level() + 4)
         # forward the callable-segment statement and the prefix lines to the callable-segment-context
         for prefix_comment_line in prefix_comment_lines:
             callable_segment_context.process_line(prefix_comment_line)
@@ -166,9 +161,11 @@ class CallableContext(ContextBaseClass):
         """
             Retrieves the callable-segments of this callable-context, as they shall be exposted to the abstract-syntax-tree
         """
-        callable_segments = {}
-        contents = self.get_contents()
-        for content in contents:
-            if isinstance(content, CallableSegmentContext):
-                callable_segments[content.get_callable_segment_name()] = content
-        return callable_segments
\ No newline at end of file
+        return self.get_child_contexts_by_name(CallableSegmentContext)
+
+    def get_content_callable_segment(self, callable_segment_name):
+        """
+            retrieves the callable-segment named 'callable_segment_name' (e.g. "inputs") of this callable-context, or
+            None if there is no such callable-segment
+        """
+        return self.get_child_context(CallableSegmentContext, callable_segment_name)
\ No newline at end of file
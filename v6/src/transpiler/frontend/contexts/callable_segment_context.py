@@ -7,7 +7,7 @@ class CallableSegmentContext(ContextBaseClass):
         A context-sensitive parser for parsing a callable-segment within a YAPL-class
     """
 
-    def __init__(self, parent_class_context, indentation_level, siblings_by_name):
+    def __init__(self, parent_class_context, indentation_level):
         """
             initializes the CallableSegmentContext
 
@@ -15,7 +15,6 @@ class CallableSegmentContext(ContextBaseClass):
         """
         ContextBaseClass.__init__(self, None, parent_class_context, "CALLABLESEGMENT", indentation_level)
         self.__callable_segment_name = None
-        self.__siblings_by_name = siblings_by_name
 
     def get_name(self):
         """
@@ -61,15 +60,15 @@ class CallableSegmentContext(ContextBaseClass):
         """
         self.trace("callable-segment declaration encountered", callable_segment_name_token)
         self.__callable_segment_name = callable_segment_name_token.get_lexeme_value()
-        if self.__callable_segment_name in self.__siblings_by_name:
+        if self.get_parent_context().get_content_callable_segment(self.__callable_segment_name) is not None:
             self.error("EXPECTED-UNIQUE-CALLABLE-SEGMENT-NAME", "callable-segment statements must be unique. This callable segment has already been declared.", callable_segment_name_token)
-        lexer_line = self.peek_lexer_line().consume(callable_segment_name_token)
-        colon_token = lexer_line.peek_leading_token()
+        token_stream = self.peek_lexer_line().get_token_stream().consume(callable_segment_name_token)
+        colon_token = token_stream.peek_leading_token()
         if not colon_token.is_symbol(":"):
             self.error("EXPECTED-COLON-TERMINATOR-FOR-CALLABLE-SEGMENT-STATEMENT", "callable-segment statements must be terminated by a colon", colon_token)
         else:
-            lexer_line = lexer_line.consume(colon_token)
-            end_of_line = lexer_line.peek_leading_token()
+            token_stream = token_stream.consume(colon_token)
+            end_of_line = token_stream.peek_leading_token()
             if end_of_line.is_end_of_line():
                 pass
             elif end_of_line.is_comment():
@@ -98,7 +97,7 @@ class CallableSegmentContext(ContextBaseClass):
             error_declaration_statement_line = self.pop_lexer_line()
             prefix_comment_lines = self.maybe_pop_prefix_comments_at_offset(self.get_indentation_level() + 4)
             # create the error-declaration context, attach it as a child of this context, and pass control to it
-            error_declaration_context = IdentifierDeclarationContext(self, self.get_indentation_level() + 4)
+            error_declaration_context = ErrorDeclarationContext(self, self.get_indentation_level() + 4)
             # forward the error-declaration statement and the prefix lines to the child context
             for prefix_comment_line in prefix_comment_lines:
                 error_declaration_context.process_line(prefix_comment_line)
@@ -106,13 +105,16 @@ class CallableSegmentContext(ContextBaseClass):
             self.push_child_context(error_declaration_context)
         elif self.__callable_segment_name == "code":
             self.error("NOT-YET-IMPLEMENTED", "ignoring callable (type={}) segment body {}".format(self.__callable_segment_name, str(leading_token)), leading_token)
+            ContextBaseClass.pop_lexer_line(self)
         elif self.__callable_segment_name == "preconditions":
             self.error("NOT-YET-IMPLEMENTED", "ignoring callable (type={}) segment body {}".format(self.__callable_segment_name, str(leading_token)), leading_token)
+            ContextBaseClass.pop_lexer_line(self)
         elif self.__callable_segment_name == "postconditions":
             self.error("NOT-YET-IMPLEMENTED", "ignoring callable (type={}) segment body {}".format(self.__callable_segment_name, str(leading_token)), leading_token)
+            ContextBaseClass.pop_lexer_line(self)
         else:
             self.error("NOT-IMPLEMENTED", "ignoring callable (type={}) segment body {}".format(self.__callable_segment_name, str(leading_token)), leading_token)
-        ContextBaseClass.pop_lexer_line(self)
+            ContextBaseClass.pop_lexer_line(self)
 
     def validate_contents(self):
         """
@@ -121,7 +123,10 @@ class CallableSegmentContext(ContextBaseClass):
         ContextBaseClass.validate_contents(self)
         if not self.get_content_callable_segment_name():
             self.error("CALLABLE-SEGMENT-MUST-HAVE-NAME", "a YAPL callable-segment must have a name", None)
-        if not self.get_content_identifier_declarations():
+        if self.__callable_segment_name == "errors":
+            if not self.get_content_error_declarations():
+                self.error("CALLABLE-SEGMENT-MUST-HAVE-CONTENT", "a YAPL callable-segment must have one or more content declarations", None)
+        elif not self.get_content_identifier_declarations():
             self.error("CALLABLE-SEGMENT-MUST-HAVE-CONTENT", "a YAPL callable-segment must have one or more content declarations", None)
         # TODO: sub-content
 
@@ -135,20 +140,24 @@ class CallableSegmentContext(ContextBaseClass):
         """
             retrieves the list of identifier declarations contained within this callable segment, which should non-empty for an input, returns or emits segment
         """
-        identifier_declarations = []
-        contents = self.get_contents()
-        for content in contents:
-            if isinstance(content, IdentifierDeclarationContext):
-                identifier_declarations.append(content)
-        return identifier_declarations
+        return self.get_child_contexts(IdentifierDeclarationContext)
+
+    def get_content_identifier_declaration(self, identifier_name):
+        """
+            retrieves the declaration of the identifier named 'identifier_name' within this callable segment, or None if
+            there is no such declaration
+        """
+        return self.get_child_context(IdentifierDeclarationContext, identifier_name)
 
     def get_content_error_declarations(self):
         """
             retrieves the list of error declarations contained within this callable segment, which should be non-empty for an error declaration segment
         """
-        error_declarations = []
-        contents = self.get_contents()
-        for content in contents:
-            if isinstance(content, IdentifierDeclarationContext):
-                error_declarations.append(content)
-        return error_declarations
+        return self.get_child_contexts(ErrorDeclarationContext)
+
+    def get_content_error_declaration(self, error_name):
+        """
+            retrieves the declaration of the error named 'error_name' within this callable segment, or None if there is
+            no such declaration
+        """
+        return self.get_child_context(ErrorDeclarationContext, error_name)
@@ -62,24 +62,24 @@ class ClassContext(ContextBaseClass):
             Helper function for process_line that handles the leading class declaration statement
         """
         self.trace("class statement encountered", leading_token)
-        lexer_line = self.peek_lexer_line().consume(leading_token)
-        class_name = lexer_line.peek_leading_token()
+        token_stream = self.peek_lexer_line().get_token_stream().consume(leading_token)
+        class_name = token_stream.peek_leading_token()
         if not class_name.is_identifier():
             self.error("EXPECTED-IDENTIFIER", "classes must have a name", class_name)
         elif not class_name.is_valid_identifier():
             self.error("EXPECTED-VALID-IDENTIFIER", "class names must be valid identifiers", class_name)
         else:
             self.__class_name = class_name.get_lexeme_value()
-            self.trace("class name: {}".format(self.__class_name), class_name)
-            lexer_line = lexer_line.consume(class_name)
+            self.trace(lambda: "class name: {}".format(self.__class_name), class_name)
+            token_stream = token_stream.consume(class_name)
             # TODO - extends X, implements Y, aggregates Z, ...
-            colon_token = lexer_line.peek_leading_token()
+            colon_token = token_stream.peek_leading_token()
             if not colon_token.is_symbol(":"):
                 self.error("EXPECTED-COLON-TERMINATOR-FOR-CLASS-STATEMENT", "class statements must be terminated by a colon", colon_token)
             else:
-                lexer_line = lexer_line.consume(colon_token)
+                token_stream = token_stream.consume(colon_token)
                 # now there might be an optional suffix comment
-                suffix_comment = lexer_line.peek_leading_token()
+                suffix_comment = token_stream.peek_leading_token()
                 if suffix_comment.is_end_of_line():
                     pass
                 elif suffix_comment.is_comment_horizontal_rule():
@@ -95,11 +95,14 @@ class ClassContext(ContextBaseClass):
             Helper function for process_line that handles the class's body
         """
         if leading_token.is_visibility_level():
-            class_facet_type_keyword = self.peek_lexer_line().clone().consume(leading_token).peek_leading_token()
+            class_facet_type_keyword = self.peek_lexer_line().get_token_stream().consume(leading_token).peek_leading_token()
             if class_facet_type_keyword.is_class_facet_type():
                 self.__process_line_class_body_facet_statement()
             else:
-                self.error("EXPECTED-FACET-KEYWORD", "class-facet statements should start with a visibility-level, followed by the facet keyword", facet_keyword)
+                self.error("EXPECTED-FACET-KEYWORD", "class-facet statements should start with a visibility-level, followed by the facet keyword", class_facet_type_keyword)
+        elif leading_token.is_comment():
+            # assuming that this is a class-facet-comment
+            pass
         else:
             self.error("UNEXPECTED-CLASS-CONTENT", "YAPL classes may only contain class-facet statements", leading_token)
 
@@ -153,9 +156,10 @@ class ClassContext(ContextBaseClass):
         """
             retrieves the list of facets contained within this class, which should be > 0 for a valid YAPL file
         """
-        facets = []
-        contents = self.get_contents()
-        for content in contents:
-            if isinstance(content, ClassFacetContext):
-                facets.append(content)
-        return facets
+        return self.get_child_contexts(ClassFacetContext)
+
+    def get_content_class_facet(self, class_facet_name):
+        """
+            retrieves the facet named 'class_facet_name' within this class, or None if there is no such facet
+        """
+        return self.get_child_context(ClassFacetContext, class_facet_name)
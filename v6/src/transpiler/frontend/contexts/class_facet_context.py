@@ -65,29 +65,29 @@ class ClassFacetContext(ContextBaseClass):
         """
         self.trace("class-facet visibility-declaration encountered", visibility_token)
         self.__class_facet_visibility = visibility_token.get_lexeme_value()
-        lexer_line = self.peek_lexer_line().consume(visibility_token)
-        class_facet_type_keyword = lexer_line.peek_leading_token()
+        token_stream = self.peek_lexer_line().get_token_stream().consume(visibility_token)
+        class_facet_type_keyword = token_stream.peek_leading_token()
         if not class_facet_type_keyword.is_class_facet_type():
             self.error("EXPECTED-FACET-KEYWORD", "class-facets require the facet keyword", class_facet_type_keyword)
         else:
             self.__class_facet_type = class_facet_type_keyword.get_lexeme_value()
-            lexer_line = lexer_line.consume(class_facet_type_keyword)
-            facet_name = lexer_line.peek_leading_token()
+            token_stream = token_stream.consume(class_facet_type_keyword)
+            facet_name = token_stream.peek_leading_token()
             if not facet_name.is_identifier():
                 self.error("EXPECTED-IDENTIFIER", "class-facets must have a name", facet_name)
             elif not facet_name.is_valid_identifier():
                 self.error("EXPECTED-VALID-IDENTIFIER", "class-facet names must be valid identifiers", facet_name)
             else:
                 self.__class_facet_name = facet_name.get_lexeme_value()
-                self.trace("class facet name: {}".format(self.__class_facet_name), facet_name)
-                lexer_line = lexer_line.consume(facet_name)
-                colon_token = lexer_line.peek_leading_token()
+                self.trace(lambda: "class facet name: {}".format(self.__class_facet_name), facet_name)
+                token_stream = token_stream.consume(facet_name)
+                colon_token = token_stream.peek_leading_token()
                 if not colon_token.is_symbol(":"):
                     self.error("EXPECTED-COLON-TERMINATOR-FOR-CLASS-FACET-STATEMENT", "class-facet statements must be terminated by a colon", colon_token)
                 else:
-                    lexer_line = lexer_line.consume(colon_token)
+                    token_stream = token_stream.consume(colon_token)
                     # now there might be an optional suffix comment
-                    suffix_comment = lexer_line.peek_leading_token()
+                    suffix_comment = token_stream.peek_leading_token()
                     if suffix_comment.is_end_of_line():
                         pass
                     elif suffix_comment.is_comment_horizontal_rule():
@@ -179,12 +179,14 @@ class ClassFacetContext(ContextBaseClass):
         """
             retrieves the list of callables contained within this ClassFacetContext
         """
-        callables = []
-        contents = self.get_contents()
-        for content in contents:
-            if isinstance(content, CallableContext):
-                callables.append(content)
-        return callables
+        return self.get_child_contexts(CallableContext)
+
+    def get_content_callable(self, callable_name):
+        """
+            retrieves the callable named 'callable_name' within this ClassFacetContext, or None if there is no such
+            callable
+        """
+        return self.get_child_context(CallableContext, callable_name)
 
     def get_content_member_variables(self):
         """
@@ -1,7 +1,29 @@
 import abc
+import collections.abc
+import sys
+import types
 
 from transpiler.frontend.lexer import LexicallyAnalyzedLine
 
+class ChildContextsView(collections.abc.Sequence):
+    """
+        A read-only view of a list of child-contexts, which reflects the child-contexts that are pushed later on
+    """
+
+    __slots__ = ("__child_contexts",)
+
+    def __init__(self, child_contexts):
+        self.__child_contexts = child_contexts
+
+    def __getitem__(self, index):
+        return self.__child_contexts[index]
+
+    def __len__(self):
+        return len(self.__child_contexts)
+
+    def __repr__(self):
+        return "ChildContextsView({!r})".format(self.__child_contexts)
+
 class ContextBaseClass(metaclass=abc.ABCMeta):
     """
         Abstract base class used by all Context objects
@@ -20,6 +42,16 @@ class ContextBaseClass(metaclass=abc.ABCMeta):
         self.__contents = []
         self.__component = component
         self.__indentation_level = indentation_level
+        self.__declaration_complete = False
+        # the first lexically-analyzed-line pushed to this context, i.e. its first prefix comment or its declaration
+        self.__first_line = None
+        # the fully-qualified name is resolved once the declaration is complete, and cached from then on
+        self.__fully_qualified_name = None
+        # indexes of the child-contexts in __contents by their concrete type, and by their concrete type and lookup
+        # name. A type is only indexed once its children are first retrieved, as most contexts are never looked up in,
+        # and the indexes are not pickled.
+        self.__child_contexts_by_type = None
+        self.__child_contexts_by_type_and_name = None
 
     def get_indentation_level(self):
         """
@@ -27,6 +59,14 @@ class ContextBaseClass(metaclass=abc.ABCMeta):
         """
         return self.__indentation_level
 
+    def is_declaration_complete(self):
+        """
+            returns True once this Context's declaration statement has been processed and the Context has been pushed
+            as a child of its parent. From then on, lines at this Context's own indentation level belong to its parent,
+            e.g. as the declaration of a sibling.
+        """
+        return self.__declaration_complete
+
     def get_contents(self):
         """
             Retreives the internal contents that have been pushed to this Context, which may be either
@@ -48,10 +88,48 @@ class ContextBaseClass(metaclass=abc.ABCMeta):
             self.__job = self.__parent_context.get_job()
         return self.__job
 
+    def set_job(self, job):
+        """
+            attaches a top-most Context, e.g. one that was loaded from a cache, to a transpiler Job
+        """
+        assert self.__parent_context is None, "only top-most contexts may be attached to a job"
+        self.__job = job
+
+    def __getstate__(self):
+        """
+            excludes the transpiler Job from the pickled state of this Context, so that parsed contexts can be cached
+            and later attached to another Job. The child-context index is excluded as well, as it is cheaper to
+            rebuild, once it is first used, than to unpickle.
+        """
+        state = self.__dict__.copy()
+        state["_ContextBaseClass__job"] = None
+        state["_ContextBaseClass__child_contexts_by_type"] = None
+        state["_ContextBaseClass__child_contexts_by_type_and_name"] = None
+        return state
+
+    def get_first_line(self):
+        """
+            retrieves the first lexically-analyzed-line that was pushed to this Context, which is its first prefix
+            comment, or its declaration statement if it has no prefix comments, or None once the Context was compacted
+        """
+        return self.__first_line
+
+    def compact_contents(self):
+        """
+            releases the lexically-analyzed-lines that this Context still holds, i.e. its first line and any lines left
+            in its contents, once it has been fully processed. The values that were extracted from them, and the
+            child-contexts, are kept, but the lines and their lexemes can be reclaimed.
+        """
+        self.__first_line = None
+        if any(isinstance(content, LexicallyAnalyzedLine) for content in self.__contents):
+            self.__contents = [content for content in self.__contents if not isinstance(content, LexicallyAnalyzedLine)]
+
     def push_lexer_line(self, lexer_line):
         """
             pushes a lexically-analyzed-line to the end of this Context's contents list.
         """
+        if self.__first_line is None:
+            self.__first_line = lexer_line
         self.__contents.append(lexer_line)
 
     def peek_lexer_line(self):
@@ -81,7 +159,88 @@ class ContextBaseClass(metaclass=abc.ABCMeta):
             Pushes a child-context ('child_context') onto the job's ContextStack, and adds it to our contents
         """
         self.__contents.append(child_context)
+        child_context.__declaration_complete = True
+        child_context.__fully_qualified_name = sys.intern(child_context.get_fully_qualified_name())
+        self.get_symbol_table().define(child_context.__fully_qualified_name, child_context)
+        self.__index_child_context(child_context)
         self.get_job().get_context_stack().push_context(child_context)
+
+    def __index_child_context(self, child_context):
+        """
+            adds 'child_context', the last of this Context's contents, to the child-context indexes that its type is
+            indexed in. A later child with the same name replaces an earlier one, as in a dictionary built from the
+            contents.
+        """
+        if self.__child_contexts_by_type is not None:
+            child_contexts = self.__child_contexts_by_type.get(type(child_context))
+            if child_contexts is not None:
+                child_contexts.append(child_context)
+        if self.__child_contexts_by_type_and_name is not None:
+            child_contexts_by_name = self.__child_contexts_by_type_and_name.get(type(child_context))
+            if child_contexts_by_name is not None:
+                child_contexts_by_name[child_context.get_lookup_name()] = child_context
+
+    def detach_contents_from(self, child_context):
+        """
+            removes the child-context 'child_context', and all contents that were pushed after it, from this Context,
+            returning the removed contents. This restores the Context to the state it was in before 'child_context'
+            was declared, so that the child-context can be parsed again, e.g. after an edit.
+        """
+        index = self.__contents.index(child_context)
+        detached_contents = self.__contents[index:]
+        del self.__contents[index:]
+        self.__child_contexts_by_type = None
+        self.__child_contexts_by_type_and_name = None
+        return detached_contents
+
+    def reattach_contents(self, detached_contents):
+        """
+            appends the contents that detach_contents_from() returned back to this Context, except for the detached
+            child-context itself, which the child-context that was parsed again in the meantime takes the place of
+        """
+        self.__contents.extend(detached_contents[1:])
+        self.__child_contexts_by_type = None
+        self.__child_contexts_by_type_and_name = None
+
+    def get_child_contexts(self, context_type):
+        """
+            retrieves a read-only view of the child-contexts of 'context_type' that have been pushed to this Context, in
+            the order they were pushed
+
+            'context_type' must be the concrete type of the child-contexts, as they are indexed by it.
+        """
+        if self.__child_contexts_by_type is None:
+            self.__child_contexts_by_type = {}
+        child_contexts = self.__child_contexts_by_type.get(context_type)
+        if child_contexts is None:
+            child_contexts = [content for content in self.__contents if type(content) is context_type]
+            self.__child_contexts_by_type[context_type] = child_contexts
+        return ChildContextsView(child_contexts)
+
+    def get_child_contexts_by_name(self, context_type):
+        """
+            retrieves a read-only dictionary of the child-contexts of 'context_type' that have been pushed to this
+            Context, by their lookup name, in the order they were pushed. Of several children with the same name, the
+            last one is retrieved.
+
+            'context_type' must be the concrete type of the child-contexts, as they are indexed by it.
+        """
+        if self.__child_contexts_by_type_and_name is None:
+            self.__child_contexts_by_type_and_name = {}
+        child_contexts_by_name = self.__child_contexts_by_type_and_name.get(context_type)
+        if child_contexts_by_name is None:
+            child_contexts_by_name = {}
+            for content in self.__contents:
+                if type(content) is context_type:
+                    child_contexts_by_name[content.get_lookup_name()] = content
+            self.__child_contexts_by_type_and_name[context_type] = child_contexts_by_name
+        return types.MappingProxyType(child_contexts_by_name)
+
+    def get_child_context(self, context_type, name):
+        """
+            retrieves the child-context of 'context_type' with the lookup name 'name', or None if there is none
+        """
+        return self.get_child_contexts_by_name(context_type).get(name)
         
     def pop_to_parent_context(self):
         """
@@ -94,6 +253,8 @@ class ContextBaseClass(metaclass=abc.ABCMeta):
         else:
             parent = context_stack.current_context().get_parent_context()
         context_stack.pop_context(self)
+        if self.get_job().is_compacting_contents():
+            self.compact_contents()
         return parent
 
     def error(self, error_code, message, location):
@@ -105,8 +266,13 @@ class ContextBaseClass(metaclass=abc.ABCMeta):
     def trace(self, message, location):
         """
             forwards a trace message, with a location-of-origin, to the job
+
+            'message' may be a string, or a thunk that computes it, which is only called if the job is tracing
         """
-        self.get_job().trace(self.__component, message, location, self.get_fully_qualified_name())
+        job = self.get_job()
+        if not job.is_tracing():
+            return
+        job.trace(self.__component, message, location, self.get_fully_qualified_name)
 
     def maybe_pop_prefix_comments_at_offset(self, offset):
         """
@@ -159,17 +325,35 @@ class ContextBaseClass(metaclass=abc.ABCMeta):
         contents = self.get_contents()
         for content in contents:
             if not isinstance(content, ContextBaseClass):
-                self.trace("validating contexts: context not fully processed ({})".format(content), content)
+                self.trace(lambda: "validating contexts: context not fully processed ({})".format(content), content)
             else:
                 content.validate_contents()
 
     def get_fully_qualified_name(self):
         """
             retrieves the fully-qualified name of this context
+
+            The name is built from the parent's name until the declaration of this context is complete, after which
+            the cached name is returned.
         """
+        if self.__fully_qualified_name is not None:
+            return self.__fully_qualified_name
         assert self.__parent_context is not None, "root-level contexts must override get_fully_qualified_name()"
         return self.__parent_context.get_fully_qualified_name() + "." + self.get_name()
 
+    def get_symbol_table(self):
+        """
+            retrieves the file-wide SymbolTable that this context's declarations are defined in
+        """
+        assert self.__parent_context is not None, "root-level contexts must override get_symbol_table()"
+        return self.__parent_context.get_symbol_table()
+
+    def get_lookup_name(self):
+        """
+            retrieves the name under which the parent of this context indexes it, which is its name by default
+        """
+        return self.get_name()
+
     @abc.abstractmethod
     def get_name(self):
         """
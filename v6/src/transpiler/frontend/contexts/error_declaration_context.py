@@ -60,9 +60,9 @@ class ErrorDeclarationContext(ContextBaseClass):
         """
         self.trace("error-declaration-statement encountered", error_name_token)
         self.__error_name = error_name_token.get_lexeme_value()
-        lexer_line = self.peek_lexer_line().consume(error_name_token)
+        token_stream = self.peek_lexer_line().get_token_stream().consume(error_name_token)
         # now there might be an optional suffix comment
-        suffix_comment = lexer_line.peek_leading_token()
+        suffix_comment = token_stream.peek_leading_token()
         if suffix_comment.is_end_of_line():
             pass
         elif suffix_comment.is_comment_horizontal_rule():
@@ -2,6 +2,7 @@ import os
 
 from transpiler.frontend.contexts.context import ContextBaseClass
 from transpiler.frontend.contexts.module_context import ModuleContext
+from transpiler.frontend.symbol_table import SymbolTable
 
 class FileContext(ContextBaseClass):
     """
@@ -18,6 +19,7 @@ class FileContext(ContextBaseClass):
         ContextBaseClass.__init__(self, job, None, "FILE", indentation_level=0)
         assert os.path.abspath(input_file_name) == input_file_name, "expected input_file_name to be an absolute file name"
         self.__input_file_name = input_file_name
+        self.__symbol_table = SymbolTable()
 
     def __str__(self):
         return "YAPL frontend file context for file '{}'".format(self.__input_file_name)
@@ -28,6 +30,12 @@ class FileContext(ContextBaseClass):
         """
         return self.__input_file_name
 
+    def get_symbol_table(self):
+        """
+            retrieves the file-wide SymbolTable, which holds the declarations of all the contexts in this file
+        """
+        return self.__symbol_table
+
     def get_name(self):
         """
             retrieves the name of this context
@@ -97,9 +105,11 @@ class FileContext(ContextBaseClass):
         """
             retrieves the list of modules contained within this FileContext, which should be > 0 for a valid YAPL file
         """
-        modules = []
-        contents = self.get_contents()
-        for content in contents:
-            if isinstance(content, ModuleContext):
-                modules.append(content)
-        return modules
+        return self.get_child_contexts(ModuleContext)
+
+    def get_content_module(self, module_fully_qualified_name):
+        """
+            retrieves the module with the fully-qualified name 'module_fully_qualified_name' within this FileContext,
+            or None if there is no such module
+        """
+        return self.get_child_context(ModuleContext, module_fully_qualified_name)
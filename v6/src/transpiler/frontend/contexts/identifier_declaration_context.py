@@ -62,21 +62,21 @@ class IdentifierDeclarationContext(ContextBaseClass):
         """
         self.trace("identifier-declaration-statement encountered", identifier_name_token)
         self.__identifier_name = identifier_name_token.get_lexeme_value()
-        lexer_line = self.peek_lexer_line().consume(identifier_name_token)
-        identifier_value_or_reference_token = lexer_line.peek_leading_token()
+        token_stream = self.peek_lexer_line().get_token_stream().consume(identifier_name_token)
+        identifier_value_or_reference_token = token_stream.peek_leading_token()
         if not identifier_value_or_reference_token.is_identifier_declaration_type():
             self.error("EXPECTED-IDENTIFIER-DECLARATION-TYPE-IDENTIFIER-DECLARATION-STATEMENT", "identifier-declaration statements must specify an is/references relationship between the identifier and the type", identifier_value_or_reference_token)
         else:
             self.__identifier_value_or_reference = identifier_value_or_reference_token.get_lexeme_value()
-            lexer_line = lexer_line.consume(identifier_value_or_reference_token)
-            identifier_type_token = lexer_line.peek_leading_token()
+            token_stream = token_stream.consume(identifier_value_or_reference_token)
+            identifier_type_token = token_stream.peek_leading_token()
             if not identifier_type_token.is_unqualified_identifier():
                 self.error("EXPECTED-IDENTIFIER-TYPE-DECLARATION", "identifier-declaration statements must specify a type for the identifier", identifier_value_or_reference_token)
             else:
                 self.__identifier_type = identifier_type_token.get_lexeme_value()
-                lexer_line = lexer_line.consume(identifier_type_token)
+                token_stream = token_stream.consume(identifier_type_token)
                 # now there might be an optional suffix comment
-                suffix_comment = lexer_line.peek_leading_token()
+                suffix_comment = token_stream.peek_leading_token()
                 if suffix_comment.is_end_of_line():
                     pass
                 elif suffix_comment.is_comment_horizontal_rule():
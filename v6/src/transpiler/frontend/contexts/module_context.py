@@ -29,6 +29,12 @@ class ModuleContext(ContextBaseClass):
         """
         return self.get_fully_qualified_name().split(".")[-1]
 
+    def get_lookup_name(self):
+        """
+            retrieves the name under which the parent FileContext indexes this module, which is its fully-qualified name
+        """
+        return self.get_fully_qualified_name()
+
     def __str__(self):
         return "YAPL frontend module context for module '{}'".format(self.get_fully_qualified_name())
 
@@ -110,23 +116,23 @@ class ModuleContext(ContextBaseClass):
             2. removes the line from the ModuleContext's unprocessed contents
         """
         self.trace("module statement encountered", leading_token)
-        lexer_line = self.peek_lexer_line().consume(leading_token)
-        module_name = lexer_line.peek_leading_token()
+        token_stream = self.peek_lexer_line().get_token_stream().consume(leading_token)
+        module_name = token_stream.peek_leading_token()
         if not module_name.is_qualified_identifier():
             self.error("EXPECTED-QUALIFIED-NAME", "modules must have fully qualified names", module_name)
         elif not module_name.is_valid_fully_qualified_token():
             self.error("EXPECTED-VALID-FULLY-QUALIFIED-NAME", "modules must have VALID fully qualified names. A valid fully-qualified module name must consist of at least three dot-separated valid tokens.", module_name)
         else:
             self.__module_fully_qualified_name = module_name.get_lexeme_value()
-            self.trace("module fully qualified name: {}".format(self.__module_fully_qualified_name), module_name)
-            lexer_line = lexer_line.consume(module_name)
-            colon_token = lexer_line.peek_leading_token()
+            self.trace(lambda: "module fully qualified name: {}".format(self.__module_fully_qualified_name), module_name)
+            token_stream = token_stream.consume(module_name)
+            colon_token = token_stream.peek_leading_token()
             if not colon_token.is_symbol(":"):
                 self.error("EXPECTED-COLON-TERMINATOR-FOR-MODULE-STATEMENT", "module statements must be terminated by a colon", colon_token)
             else:
-                lexer_line = lexer_line.consume(colon_token)
+                token_stream = token_stream.consume(colon_token)
                 # now there might be an optional suffix comment
-                suffix_comment = lexer_line.peek_leading_token()
+                suffix_comment = token_stream.peek_leading_token()
                 if suffix_comment.is_end_of_line():
                     pass
                 elif suffix_comment.is_comment_horizontal_rule():
@@ -147,12 +153,13 @@ class ModuleContext(ContextBaseClass):
             self.error("MODULE-MUST-HAVE-CONTENTS", "a YAPL module must contain at least one class, function, type or constant", None)
 
     def get_content_classes(self):
-        classes = []
-        contents = self.get_contents()
-        for content in contents:
-            if isinstance(content, ClassContext):
-                classes.append(content)
-        return classes
+        return self.get_child_contexts(ClassContext)
+
+    def get_content_class(self, class_name):
+        """
+            retrieves the class named 'class_name' within this module, or None if there is no such class
+        """
+        return self.get_child_context(ClassContext, class_name)
 
     def get_content_module_fully_qualified_name(self):
         return self.__module_fully_qualified_name
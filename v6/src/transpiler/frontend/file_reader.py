@@ -1,14 +1,74 @@
+import array
 import io
+import mmap
+import os
+import re
+
+# YAPL files are read as UTF-8, whichever way they are read, rather than in the locale's encoding
+ENCODING = "utf-8"
+
+# the line endings that the memory-mapped path splits on, which are the universal newlines that the streaming path
+# splits on
+NEWLINE = re.compile(rb"\r\n|\r|\n")
+
+def get_byte_length(text):
+    return len(text) if text.isascii() else len(text.encode(ENCODING))
 
 class FileReader(object):
 
-    def __init__(self, absolute_file_name):
+    def __init__(self, absolute_file_name, memory_mapped=False):
         self.absolute_file_name = absolute_file_name
+        self.memory_mapped = memory_mapped
+        # the byte offset of each line read so far, indexed by line number - 1
+        self.__line_byte_offsets = array.array("q")
 
     def read_lines(self):
-        last_line_was_empty = False
-        with io.open(self.absolute_file_name) as f:
-            for line in f.readlines():
-                rstripped_line = line.rstrip()
-                last_line_was_empty = rstripped_line == ""
-                yield rstripped_line
+        """
+            yields the right-stripped lines of the file, one at a time, as they are read, and records the byte offset of
+            each line in the file
+        """
+        del self.__line_byte_offsets[:]
+        if self.memory_mapped:
+            for line in self.__read_memory_mapped_lines():
+                yield line
+        else:
+            # newline="" splits the lines on the universal newlines, without translating them, so that the byte length
+            # of each line includes its line ending
+            with io.open(self.absolute_file_name, encoding=ENCODING, newline="") as f:
+                byte_offset = 0
+                for line in f:
+                    self.__line_byte_offsets.append(byte_offset)
+                    byte_offset += get_byte_length(line)
+                    yield line.rstrip()
+
+    def __read_memory_mapped_lines(self):
+        with io.open(self.absolute_file_name, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                offset = 0
+                end = len(mapped)
+                while offset < end:
+                    newline = NEWLINE.search(mapped, offset)
+                    line_end, next_offset = (end, end) if newline is None else newline.span()
+                    self.__line_byte_offsets.append(offset)
+                    yield mapped[offset:line_end].decode(ENCODING).rstrip()
+                    offset = next_offset
+
+    def get_line_byte_offset(self, line_number):
+        """
+            retrieves the byte offset in the file of a (1-based) line number, or None if the line hasn't been read
+        """
+        if 0 < line_number <= len(self.__line_byte_offsets):
+            return self.__line_byte_offsets[line_number - 1]
+        return None
+
+    def get_byte_offset(self, line_number, line, offset):
+        """
+            retrieves the byte offset in the file of the character at 'offset' in 'line', the text of a (1-based) line
+            number, or None if the line hasn't been read
+        """
+        line_byte_offset = self.get_line_byte_offset(line_number)
+        if line_byte_offset is None:
+            return None
+        return line_byte_offset + get_byte_length(line[:offset])
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from transpiler.frontend.file_reader import FileReader
+
+class TestFileReader(unittest.TestCase):
+    """
+        Unit test suite for FileReader
+    """
+
+    def test_both_ways_of_reading_decode_utf8(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            file_name = os.path.join(directory_name, "test.py.yapl")
+            with open(file_name, "wb") as f:
+                f.write("-- caf\u00e9, na\u00efve  \r\n\nmodule x:\n".encode("utf-8"))
+            expected = ["-- caf\u00e9, na\u00efve", "", "module x:"]
+            self.assertEqual(expected, list(FileReader(file_name).read_lines()))
+            self.assertEqual(expected, list(FileReader(file_name, memory_mapped=True).read_lines()))
+
+    def test_both_ways_of_reading_split_on_the_same_newlines(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            file_name = os.path.join(directory_name, "test.py.yapl")
+            with open(file_name, "wb") as f:
+                f.write(b"module a.b.c:\r    class x:\r\n\n    class y:")
+            expected = ["module a.b.c:", "    class x:", "", "    class y:"]
+            self.assertEqual(expected, list(FileReader(file_name).read_lines()))
+            self.assertEqual(expected, list(FileReader(file_name, memory_mapped=True).read_lines()))
+
+    def test_both_ways_of_reading_record_the_byte_offsets_of_lines(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            file_name = os.path.join(directory_name, "test.py.yapl")
+            with open(file_name, "wb") as f:
+                f.write("-- caf\u00e9\r\nmodule x:\r    class y:\n".encode("utf-8"))
+            for memory_mapped in (False, True):
+                reader = FileReader(file_name, memory_mapped=memory_mapped)
+                lines = list(reader.read_lines())
+                self.assertEqual([0, 10, 20], [reader.get_line_byte_offset(n) for n in range(1, len(lines) + 1)])
+                self.assertEqual(24, reader.get_byte_offset(3, lines[2], 4))
+                self.assertEqual(8, reader.get_byte_offset(1, lines[0], 7))
+                self.assertIsNone(reader.get_line_byte_offset(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
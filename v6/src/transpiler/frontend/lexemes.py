@@ -1,15 +1,36 @@
-import re
 import sys
 
-def advance_offset(input, output, current_offset):
-    return output, current_offset + len(input) - len(output)
+# integer kind tags, one bit per type of lexeme, so that families of lexemes can be tested with a single mask
+KIND_EMPTY_LINE = 1 << 0
+KIND_END_OF_LINE = 1 << 1
+KIND_COMMENT_HORIZONTAL_RULE = 1 << 2
+KIND_COMMENT = 1 << 3
+KIND_QUALIFIED_IDENTIFIER = 1 << 4
+KIND_IDENTIFIER = 1 << 5
+KIND_TWO_GLYPH_SYMBOL = 1 << 6
+KIND_SINGLE_GLYPH_SYMBOL = 1 << 7
+KIND_KEYWORD = 1 << 8
+KIND_CLASS_FACET_TYPE = 1 << 9
+KIND_CALLABLE = 1 << 10
+KIND_CALLABLE_SEGMENT = 1 << 11
+KIND_VISIBILITY_LEVEL = 1 << 12
+KIND_IDENTIFIER_DECLARATION_TYPE = 1 << 13
+KIND_LITERAL_NUMBER = 1 << 14
+KIND_LITERAL_BOOLEAN = 1 << 15
+KIND_DOUBLE_QUOTED_STRING = 1 << 16
+KIND_SINGLE_QUOTED_STRING = 1 << 17
+KIND_UNRECOGNIZED_INPUT = 1 << 18
+
+KINDS_OF_COMMENTS = KIND_COMMENT | KIND_COMMENT_HORIZONTAL_RULE
+KINDS_OF_IDENTIFIERS = KIND_IDENTIFIER | KIND_QUALIFIED_IDENTIFIER
+KINDS_OF_SYMBOLS = KIND_TWO_GLYPH_SYMBOL | KIND_SINGLE_GLYPH_SYMBOL
 
 def join(*patterns):
     parenthesized = []
     for pattern in patterns:
         parenthesized.append("(" + pattern + ")")
     joined = "|".join(parenthesized)
-    return "^(" + joined + ")"
+    return "(" + joined + ")"
 
 
 def join_words(*patterns):
@@ -18,57 +39,42 @@ def join_words(*patterns):
         parenthesized.append("(" + pattern + "$)")
         parenthesized.append("(" + pattern + "\\b)")
     joined = "|".join(parenthesized)
-    return "^(" + joined + ")"
-
-def consume(tokens, input, pattern, constructor, offset):
-    try:
-        token_result = re.search(pattern, input)
-    except re.error:
-        _type, _value, _traceback = sys.exc_info()
-        print("INTERNAL ERROR: bad regular expression")
-        print("pattern: " + pattern)
-        if _value.pos:
-            print("         " + ((_value.pos -1) * "-") + "⬆")
-        raise
-    if token_result:
-        token = token_result[0].rstrip()
-        tokens.append(constructor(token, offset))
-        output = input[len(token):]
-    else:
-        output = input
-    return advance_offset(input, output, offset)
-
-def consume_string(tokens, input, delimiter, constructor, offset):
-    next_quote = 1
-    if input.startswith(delimiter):
-        while True:
-            if next_quote >= len(input):
-                break
-            tmp = input.find(delimiter, next_quote)
-            if tmp == -1:
-                break
-            if input[tmp - 1] == '\\':
-                next_quote = tmp + 1
-                continue
-            quoted_string = input[1:next_quote]
-            quoted_string = quoted_string.replace("\\\"", '"')
-            quoted_string = quoted_string.replace("\\\'", "'")
-            quoted_string = quoted_string.replace("\\\\", "\\")
-            quoted_string = quoted_string.replace("\\r", "\r")
-            quoted_string = quoted_string.replace("\\n", "\n")
-            quoted_string = quoted_string.replace("\\t", "\t")
-            # TODO: \uFFFF \UFFFFFFFF \xFF
-            tokens.append(constructor(quoted_string))
-            return advance_offset(input, input[next_quote+1:], offset)
-    return input, offset
+    return "(" + joined + ")"
+
+def unescape_string(quoted_string):
+    quoted_string = quoted_string.replace("\\\"", '"')
+    quoted_string = quoted_string.replace("\\\'", "'")
+    quoted_string = quoted_string.replace("\\\\", "\\")
+    quoted_string = quoted_string.replace("\\r", "\r")
+    quoted_string = quoted_string.replace("\\n", "\n")
+    quoted_string = quoted_string.replace("\\t", "\t")
+    # TODO: \uFFFF \UFFFFFFFF \xFF
+    return quoted_string
 
 class Lexeme(object):
 
+    # lexemes are plentiful, so they carry no __dict__
+    __slots__ = ("__value", "__offset", "__lexical_line")
+
+    # the regular expression that matches this type of lexeme at the current position, or None if
+    # the lexeme is not produced by the scanner
+    PATTERN = None
+
+    # the integer kind tag of this type of lexeme
+    KIND = 0
+
     def __init__(self, value, offset):
-        self.__value = value
+        self.__value = sys.intern(value)
         self.__offset = offset
         self.__lexical_line = None
 
+    @classmethod
+    def from_token(cls, token, offset):
+        """
+            constructs a lexeme from the source text matched by PATTERN, at the given offset
+        """
+        return cls(token, offset)
+
     def get_printable_value(self):
         return "[type={}, value=\"{}\"]".format(
             type(self).__name__,
@@ -81,6 +87,23 @@ class Lexeme(object):
             self.__value
         )
 
+    def __reduce__(self):
+        """
+            pickles this lexeme as its type, value and offset, but not its lexically-analyzed line, which binds its
+            lexemes again when it is unpickled
+        """
+        return (restore_lexeme, (type(self), self.__value, self.__offset))
+
+    def copy(self):
+        """
+            returns a copy of this lexeme, that is not bound to a lexically-analyzed line yet
+        """
+        lexeme = object.__new__(type(self))
+        lexeme.__value = self.__value
+        lexeme.__offset = self.__offset
+        lexeme.__lexical_line = None
+        return lexeme
+
     def get_lexical_line(self):
         return self.__lexical_line
 
@@ -93,8 +116,11 @@ class Lexeme(object):
     def get_lexeme_value(self):
         return self.__value
 
+    def get_kind(self):
+        return self.KIND
+
     def is_callable(self, value=None):
-        if not isinstance(self, Callable):
+        if self.KIND != KIND_CALLABLE:
             return False
         if value is not None:
             if value != self.__value:
@@ -102,7 +128,7 @@ class Lexeme(object):
         return True
 
     def is_callable_segment(self, value=None):
-        if not isinstance(self, CallableSegment):
+        if self.KIND != KIND_CALLABLE_SEGMENT:
             return False
         if value is not None:
             if value != self.__value:
@@ -110,7 +136,7 @@ class Lexeme(object):
         return True
 
     def is_keyword(self, value=None):
-        if not isinstance(self, Keyword):
+        if self.KIND != KIND_KEYWORD:
             return False
         if value is not None:
             if value != self.__value:
@@ -118,7 +144,7 @@ class Lexeme(object):
         return True
 
     def is_class_facet_type(self, value=None):
-        if not isinstance(self, ClassFacetType):
+        if self.KIND != KIND_CLASS_FACET_TYPE:
             return False
         if value is not None:
             if value != self.__value:
@@ -126,7 +152,7 @@ class Lexeme(object):
         return True
 
     def is_visibility_level(self, value=None):
-        if not isinstance(self, VisibilityLevel):
+        if self.KIND != KIND_VISIBILITY_LEVEL:
             return False
         if value is not None:
             if value != self.__value:
@@ -134,39 +160,54 @@ class Lexeme(object):
         return True
     
     def is_end_of_line(self):
-        return isinstance(self, EndOfLine)
+        return self.KIND == KIND_END_OF_LINE
 
     def is_comment(self):
-        return isinstance(self, Comment) or isinstance(self, CommentHorizontalRule)
+        return (self.KIND & KINDS_OF_COMMENTS) != 0
 
     def is_comment_horizontal_rule(self):
-        return isinstance(self, CommentHorizontalRule)
+        return self.KIND == KIND_COMMENT_HORIZONTAL_RULE
 
     def is_identifier_declaration_type(self):
-        return isinstance(self, IdentifierDeclarationType)        
+        return self.KIND == KIND_IDENTIFIER_DECLARATION_TYPE
 
     def is_empty_line(self):
-        return isinstance(self, EmptyLine)
+        return self.KIND == KIND_EMPTY_LINE
+
+    def is_unrecognized_input(self):
+        return self.KIND == KIND_UNRECOGNIZED_INPUT
 
     def is_identifier(self):
-        return isinstance(self, Identifier) or isinstance(self, QualifiedIdentifier)
+        return (self.KIND & KINDS_OF_IDENTIFIERS) != 0
 
     def is_unqualified_identifier(self):
-        return isinstance(self, Identifier)
+        return self.KIND == KIND_IDENTIFIER
 
     def is_qualified_identifier(self):
-        return isinstance(self, QualifiedIdentifier)
+        return self.KIND == KIND_QUALIFIED_IDENTIFIER
 
     def is_symbol(self, value=None):
-        if not (isinstance(self, TwoGlyphSymbol) or isinstance(self, SingleGlyphSymbol)):
+        if (self.KIND & KINDS_OF_SYMBOLS) == 0:
             return False
         if value is not None:
             if value != self.__value:
                 return False
         return True
 
+def restore_lexeme(lexeme_type, value, offset):
+    """
+        recreates a lexeme that was pickled by Lexeme.__reduce__
+    """
+    lexeme = object.__new__(lexeme_type)
+    Lexeme.__init__(lexeme, value, offset)
+    return lexeme
+
 class EmptyLine(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_EMPTY_LINE
+
     def __init__(self, offset):
         Lexeme.__init__(self, "", offset)
 
@@ -175,14 +216,12 @@ class EmptyLine(Lexeme):
             type(self).__name__
         )
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        if input == "":
-            tokens.append(EmptyLine(offset))
-        return input, offset
-
 class EndOfLine(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_END_OF_LINE
+
     def __init__(self, offset):
         Lexeme.__init__(self, "", offset)
 
@@ -191,34 +230,49 @@ class EndOfLine(Lexeme):
             type(self).__name__
         )
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        if input == "":
-            tokens.append(EndOfLine(offset))
-        return input, offset
+class UnrecognizedInput(Lexeme):
+    """
+        Input that no lexeme type matches, up to the next whitespace. The scanner skips it, and the Job reports it as
+        a lexer error, instead of parsing the line that it is part of.
+    """
 
-class CommentHorizontalRule(Lexeme):
+    __slots__ = ()
+
+    KIND = KIND_UNRECOGNIZED_INPUT
 
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = "^(---+)$"
-        return consume(tokens, input, pattern, CommentHorizontalRule, offset)
+class CommentHorizontalRule(Lexeme):
 
-class Comment(Lexeme):
+    __slots__ = ()
+
+    KIND = KIND_COMMENT_HORIZONTAL_RULE
+
+    PATTERN = "(---+)$"
 
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = "^(--.*)$"
-        return consume(tokens, input, pattern, Comment, offset)
+class Comment(Lexeme):
+
+    __slots__ = ()
+
+    KIND = KIND_COMMENT
+
+    PATTERN = "(--.*)$"
+
+    def __init__(self, characters, offset):
+        Lexeme.__init__(self, characters, offset)
 
 class QualifiedIdentifier(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_QUALIFIED_IDENTIFIER
+
+    PATTERN = r"([a-z][a-z0-9_]+)\.([a-z][a-z0-9_\.]+)"
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
@@ -234,13 +288,14 @@ class QualifiedIdentifier(Lexeme):
             return False
         return True
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = r"^([a-z][a-z0-9_]+)\.([a-z][a-z0-9_\.]+)"
-        return consume(tokens, input, pattern, QualifiedIdentifier, offset)
-
 class Identifier(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_IDENTIFIER
+
+    PATTERN = "([a-z][a-z0-9_]+)"
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
@@ -252,149 +307,162 @@ class Identifier(Lexeme):
             return False
         return True
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = "^([a-z][a-z0-9_]+)"
-        return consume(tokens, input, pattern, Identifier, offset)
-
 class TwoGlyphSymbol(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_TWO_GLYPH_SYMBOL
+
+    PATTERN = join("==", "<=", ">=", "!=", ":=", r"\+=", "-=", r"\*=", "/=")
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join("==", "<=", ">=", "!=", ":=", r"\+=", "-=", r"\*=", "/=")
-        return consume(tokens, input, pattern, TwoGlyphSymbol, offset)
-
 class SingleGlyphSymbol(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_SINGLE_GLYPH_SYMBOL
+
+    PATTERN = join(r"\(", r"\)", "<", ">", r"\+", "-", r"\*", "/", ":", r"\.")
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join(r"\(", r"\)", "<", ">", r"\+", "-", r"\*", "/", ":", r"\.")
-        return consume(tokens, input, pattern, SingleGlyphSymbol, offset)
-
 class Keyword(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_KEYWORD
+
+    PATTERN = join_words(
+        "module",
+        "class"
+    )
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join_words(
-            "module",
-            "class"
-        )
-        return consume(tokens, input, pattern, Keyword, offset)
-
 class ClassFacetType(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_CLASS_FACET_TYPE
+
+    PATTERN = join_words(
+        "facet",
+        "interface",
+        "trait",
+    )
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join_words(
-            "facet",
-            "interface",
-            "trait",
-        )
-        return consume(tokens, input, pattern, ClassFacetType, offset)
-
 class Callable(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_CALLABLE
+
+    PATTERN = join_words(
+        "function", "generator", "constructor", "method", "getter", "setter", "closure"
+    )
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join_words(
-            "function", "generator", "constructor", "method", "getter", "setter", "closure"
-        )
-        return consume(tokens, input, pattern, Callable, offset)
-
 class CallableSegment(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_CALLABLE_SEGMENT
+
+    PATTERN = join_words(
+        "inputs", "returns", "errors", "code", "emits", "preconditions", "postconditions"
+    )
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join_words(
-            "inputs", "returns", "errors", "code", "emits", "preconditions", "postconditions"
-        )
-        return consume(tokens, input, pattern, CallableSegment, offset)
-
 class VisibilityLevel(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_VISIBILITY_LEVEL
+
+    PATTERN = join_words(
+        "public", "private", "protected"
+    )
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join_words(
-            "public", "private", "protected"
-        )
-        return consume(tokens, input, pattern, VisibilityLevel, offset)
-
 class IdentifierDeclarationType(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_IDENTIFIER_DECLARATION_TYPE
+
+    # note - the 'is' keyword is used for more things, so it will be moving out of IdentifierDeclarationType
+    PATTERN = join_words(
+        "is", "references"
+    )
+
     def __init__(self, characters, offset):
         Lexeme.__init__(self, characters, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        # note - the 'is' keyword is used for more things, so it will be moving out of IdentifierDeclarationType
-        pattern = join_words(
-            "is", "references"
-        )
-        return consume(tokens, input, pattern, IdentifierDeclarationType, offset)
-
 class LiteralNumber(Lexeme):
 
-    def __init__(self, token, offset):
-        self.__token = token
-        self.__offset = offset
+    __slots__ = ()
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = r"^(([+-]?[0-9]+)(\.[0-9+])?([eE][+-]\d)?)"
-        return consume(tokens, input, pattern, LiteralNumber, offset)
+    KIND = KIND_LITERAL_NUMBER
 
-class LiteralBoolean(Lexeme):
+    PATTERN = r"(([+-]?[0-9]+)(\.[0-9+])?([eE][+-]\d)?)"
 
     def __init__(self, token, offset):
-        self.__token = token
-        self.__offset = offset
+        Lexeme.__init__(self, token, offset)
+
+class LiteralBoolean(Lexeme):
+
+    __slots__ = ()
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        pattern = join_words("true", "false")
-        return consume(tokens, input, pattern, LiteralBoolean, offset)
+    KIND = KIND_LITERAL_BOOLEAN
+
+    PATTERN = join_words("true", "false")
+
+    def __init__(self, token, offset):
+        Lexeme.__init__(self, token, offset)
 
 
 class DoubleQuotedString(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_DOUBLE_QUOTED_STRING
+
+    PATTERN = r'"(.*?)(?<!\\)"'
+
     def __init__(self, token, offset):
-        self.__token = token
-        self.__offset = offset
+        Lexeme.__init__(self, token, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        return consume_string(tokens, input, '"', DoubleQuotedString, offset)
+    @classmethod
+    def from_token(cls, token, offset):
+        return cls(unescape_string(token[1:-1]), offset)
 
 class SingleQuotedString(Lexeme):
 
+    __slots__ = ()
+
+    KIND = KIND_SINGLE_QUOTED_STRING
+
+    PATTERN = r"'(.*?)(?<!\\)'"
+
     def __init__(self, token, offset):
-        self.__token = token
-        self.__offset = offset
+        Lexeme.__init__(self, token, offset)
 
-    @staticmethod
-    def consume(tokens, input, offset):
-        return consume_string(tokens, input, '"', SingleQuotedString, offset)
+    @classmethod
+    def from_token(cls, token, offset):
+        return cls(unescape_string(token[1:-1]), offset)
 
 
 ALL_LEXEME_TYPES = [
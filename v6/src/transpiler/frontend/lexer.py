@@ -1,4 +1,99 @@
-from transpiler.frontend.lexemes import ALL_LEXEME_TYPES, advance_offset, consume, EndOfLine
+import collections
+
+from transpiler.frontend.lexemes import EndOfLine
+from transpiler.frontend.scanner import Scanner
+
+# the scanner is compiled once, and shared by all lexically-analyzed lines
+SCANNER = Scanner()
+
+DEFAULT_LINE_CACHE_SIZE = 4096
+
+class LineCache(object):
+    """
+        A bounded cache of the lexemes that lines were scanned into, keyed by the line's text, that evicts the least
+        recently used line when it is full.
+
+        Most lines of a YAPL file repeat exactly (segment statements, horizontal rules, and similar boilerplate), so
+        that a hit replaces scanning the line by copying its cached lexemes.
+    """
+
+    def __init__(self, max_size=DEFAULT_LINE_CACHE_SIZE):
+        self.__max_size = max_size
+        self.__lexemes_by_line = collections.OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self):
+        return len(self.__lexemes_by_line)
+
+    def lookup(self, line):
+        """
+            retrieves the tuple of lexemes that 'line' was scanned into, or None if the line is not cached. The lexemes
+            must be copied before they are bound to another lexically-analyzed line.
+        """
+        lexemes = self.__lexemes_by_line.get(line)
+        if lexemes is None:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        self.__lexemes_by_line.move_to_end(line)
+        return lexemes
+
+    def store(self, line, lexemes):
+        """
+            caches the tuple of lexemes that 'line' was scanned into
+        """
+        self.__lexemes_by_line[line] = lexemes
+        if len(self.__lexemes_by_line) > self.__max_size:
+            self.__lexemes_by_line.popitem(last=False)
+
+    def get_hits(self):
+        return self.__hits
+
+    def get_misses(self):
+        return self.__misses
+
+    def get_hit_rate(self):
+        """
+            retrieves the fraction of lookups that were hits, or 0.0 if there were no lookups
+        """
+        lookups = self.__hits + self.__misses
+        return self.__hits / lookups if lookups else 0.0
+
+# the line cache is shared by all lexers, so that a process that lexes several files, e.g. a worker or the frontend
+# server, reuses the lines that the files have in common
+LINE_CACHE = LineCache()
+
+class TokenStream(object):
+    """
+        An immutable view of the tokens of a lexically-analyzed line, starting at a given position.
+
+        Consuming a token yields a new TokenStream that starts one token later, without copying any tokens. Backtracking
+        is a matter of holding on to an earlier TokenStream.
+    """
+
+    def __init__(self, lexical_line, tokens, position):
+        self.__lexical_line = lexical_line
+        self.__tokens = tokens
+        self.__position = position
+
+    def __str__(self):
+        return "TokenStream, at position {} of {}".format(self.__position, str(self.__lexical_line))
+
+    def get_lexical_line(self):
+        return self.__lexical_line
+
+    def get_position(self):
+        return self.__position
+
+    def peek_leading_token(self):
+        if self.__position < len(self.__tokens):
+            return self.__tokens[self.__position]
+        return self.__lexical_line.get_end_of_line()
+
+    def consume(self, leading_token):
+        assert leading_token is self.peek_leading_token(), "expected the leading token to be the one provided ({}), not {}".format(str(leading_token), str(self.peek_leading_token()))
+        return TokenStream(self.__lexical_line, self.__tokens, self.__position + 1)
 
 class LexicallyAnalyzedLine(object):
 
@@ -6,67 +101,111 @@ class LexicallyAnalyzedLine(object):
         self.__lexer = lexer
         self.__line_number = line_number
         self.__line = line
-        self.__tokens = []
-
-    def clone(self):
-        cloned_line = LexicallyAnalyzedLine(self.__lexer, self.__line_number, self.__line)
-        cloned_line.__tokens = self.__tokens[:]
-        return cloned_line
+        self.__tokens = ()
+        self.__token_stream = TokenStream(self, self.__tokens, 0)
+        self.__end_of_line = None
+        self.__unrecognized_input = ()
 
     def get_line_number(self):
         return self.__line_number
 
+    def get_line(self):
+        return self.__line
+
+    def set_line_number(self, line_number):
+        """
+            renumbers this line, e.g. after lines were inserted or removed above it in an edited file
+        """
+        self.__line_number = line_number
+
+    def __getstate__(self):
+        """
+            pickles this line as its line number, its text and its lexemes, so that unpickling it doesn't re-analyze it,
+            but not as its Lexer, whose LineCache is shared, nor as its TokenStream and end-of-line lexeme, which are
+            cheaper to recreate than to unpickle
+        """
+        return (self.__line_number, self.__line, self.__tokens)
+
+    def __setstate__(self, state):
+        self.__line_number, self.__line, self.__tokens = state
+        self.__lexer = None
+        for token in self.__tokens:
+            token.set_lexical_line(self)
+        self.__token_stream = TokenStream(self, self.__tokens, 0)
+        self.__end_of_line = None
+        self.__unrecognized_input = tuple([ token for token in self.__tokens if token.is_unrecognized_input() ])
+
     def __str__(self):
         return "LexicallyAnalyzedLine, for line number {}, with content: \"{}\"".format(self.__line_number, self.__line)
 
     def analyze(self):
-        offset = 0
-        tokens = []
-        stripped = self.__line.rstrip()
-        while True:
-            stripped, offset = advance_offset(stripped, stripped.lstrip(), offset)
-            # TODO: multi-line quoted string
-            for lexeme_type in ALL_LEXEME_TYPES:
-                consume = getattr(lexeme_type, "consume")
-                stripped, offset = consume(tokens, stripped, offset)
-            if len(stripped) > 0:
-                continue
-            break
+        line = self.__line.rstrip()
+        line_cache = self.__lexer.get_line_cache()
+        cached_tokens = line_cache.lookup(line) if line_cache is not None else None
+        if cached_tokens is not None:
+            tokens = [token.copy() for token in cached_tokens]
+        else:
+            tokens = SCANNER.scan(line)
+            assert tokens, "expected to have some tokens"
+            if line_cache is not None:
+                # the cache keeps unbound copies, as the lexemes that are bound to this line would keep it, and its
+                # Lexer, alive for as long as the line is cached
+                line_cache.store(line, tuple(token.copy() for token in tokens))
         def decorate_token(token):
             token.set_lexical_line(self)
             return token
-        assert tokens, "expected to have some tokens"
-        self.__tokens = [ decorate_token(token) for token in tokens ]
+        self.__tokens = tuple([ decorate_token(token) for token in tokens ])
+        self.__token_stream = TokenStream(self, self.__tokens, 0)
+        self.__unrecognized_input = tuple([ token for token in self.__tokens if token.is_unrecognized_input() ])
 
     def peek_tokens(self):
         return self.__tokens
 
-    def peek_leading_token(self):
-        if not self.__tokens:
-            eol = EndOfLine(len(self.__line))
-            eol.set_lexical_line(self)
-            return eol
-        return self.__tokens[0]
+    def get_unrecognized_input(self):
+        """
+            retrieves the UnrecognizedInput lexemes of this line, which is empty unless the line contains input that the
+            scanner could not scan
+        """
+        return self.__unrecognized_input
 
-    def pop_leading_token(self):
-        leading_token = self.__tokens[0]
-        self.__tokens = self.__tokens[1:]
-        return leading_token
+    def get_token_stream(self):
+        """
+            retrieves a TokenStream positioned at the leading token of this line
+        """
+        return self.__token_stream
 
-    def consume(self, leading_token):
-        result = self.clone()
-        popped_leading_token = result.pop_leading_token()
-        assert leading_token is popped_leading_token, "expected the leading token to be the one provided ({}), not {}".format(str(leading_token), str(popped_leading_token))
-        return result
+    def get_end_of_line(self):
+        if self.__end_of_line is None:
+            self.__end_of_line = EndOfLine(len(self.__line))
+            self.__end_of_line.set_lexical_line(self)
+        return self.__end_of_line
+
+    def peek_leading_token(self):
+        return self.__token_stream.peek_leading_token()
 
 class Lexer(object):
 
-    def __init__(self):
+    def __init__(self, line_cache=LINE_CACHE):
+        """
+            initializes the Lexer
+
+            'line_cache' is the LineCache to reuse the lexemes of earlier lines from, or None to scan every line
+        """
         self.__next_line_number = 1
+        self.__line_cache = line_cache
+
+    def get_line_cache(self):
+        return self.__line_cache
 
     def analyze_line(self, line):
-        line_number = self.__next_line_number
+        analyzed_line = self.analyze_line_at(line, self.__next_line_number)
+        self.__next_line_number += 1
+        return analyzed_line
+
+    def analyze_line_at(self, line, line_number):
+        """
+            analyzes a line with an explicit line number, e.g. a line that was edited in an already analyzed file
+        """
         analyzed_line = LexicallyAnalyzedLine(self, line_number, line)
         analyzed_line.analyze()
-        self.__next_line_number += 1
         return analyzed_line
@@ -0,0 +1,58 @@
+import gc
+import unittest
+import weakref
+
+from transpiler.frontend.lexer import Lexer, LineCache
+
+class TestLineCache(unittest.TestCase):
+    """
+        Unit test suite for the LineCache, and for its use by the Lexer
+    """
+
+    def test_repeated_lines_are_hits(self):
+        line_cache = LineCache()
+        lexer = Lexer(line_cache)
+        first = lexer.analyze_line("    class first: -- the first class")
+        second = lexer.analyze_line("    class first: -- the first class")
+        lexer.analyze_line("    class second: -- the second class")
+        self.assertEqual((1, 2), (line_cache.get_hits(), line_cache.get_misses()))
+        self.assertEqual(
+            [(type(token), token.get_lexeme_value(), token.get_offset()) for token in first.peek_tokens()],
+            [(type(token), token.get_lexeme_value(), token.get_offset()) for token in second.peek_tokens()]
+        )
+        for token in second.peek_tokens():
+            self.assertIs(second, token.get_lexical_line())
+
+    def test_the_least_recently_used_line_is_evicted(self):
+        line_cache = LineCache(max_size=2)
+        lexer = Lexer(line_cache)
+        lexer.analyze_line("a")
+        lexer.analyze_line("b")
+        # looking "a" up makes it the most recently used line, so that "b" is evicted instead
+        lexer.analyze_line("a")
+        lexer.analyze_line("c")
+        self.assertEqual(2, len(line_cache))
+        self.assertIsNotNone(line_cache.lookup("a"))
+        self.assertIsNone(line_cache.lookup("b"))
+        self.assertIsNotNone(line_cache.lookup("c"))
+
+    def test_cached_lexemes_are_not_bound_to_a_line(self):
+        line_cache = LineCache()
+        lexer = Lexer(line_cache)
+        lexer.analyze_line("module a.b.c: -- the test module")
+        lexer.analyze_line("module a.b.c: -- the test module")
+        cached_tokens = line_cache.lookup("module a.b.c: -- the test module")
+        self.assertTrue(cached_tokens)
+        for token in cached_tokens:
+            self.assertIsNone(token.get_lexical_line())
+
+    def test_cached_lines_do_not_keep_lines_alive(self):
+        line_cache = LineCache()
+        analyzed_line = weakref.ref(Lexer(line_cache).analyze_line("module a.b.c: -- the test module"))
+        gc.collect()
+        self.assertIsNone(analyzed_line())
+        self.assertEqual(1, len(line_cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
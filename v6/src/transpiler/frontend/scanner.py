@@ -0,0 +1,75 @@
+import re
+
+from transpiler.frontend.lexemes import ALL_LEXEME_TYPES, EmptyLine, UnrecognizedInput
+
+WHITESPACE = re.compile(r"\s+")
+UNRECOGNIZED_INPUT = re.compile(r"\S+")
+
+class Scanner(object):
+    """
+        A single-pass scanner that turns a line of YAPL into lexemes.
+
+        The PATTERN of every lexeme type is compiled once into a master regular expression with one named
+        group per lexeme type, which is then matched left-to-right against the line.
+    """
+
+    def __init__(self, lexeme_types=ALL_LEXEME_TYPES):
+        """
+            compiles the scanner
+
+            'lexeme_types' is the ordered list of lexeme types to scan for. Earlier types take precedence over later ones.
+        """
+        scanned_types = [lexeme_type for lexeme_type in lexeme_types if lexeme_type.PATTERN is not None]
+        self.__lexeme_types_by_group_name = {}
+        for lexeme_type in scanned_types:
+            self.__lexeme_types_by_group_name[lexeme_type.__name__] = lexeme_type
+        self.__master = Scanner.__compile(scanned_types)
+        # the original lexer tried each lexeme type once per pass, in order, without skipping whitespace between
+        # them. A lexeme that immediately follows another lexeme therefore prefers the lexeme types that come after
+        # the previous one (e.g. "(module" scans as a symbol followed by an identifier, not a keyword). We keep one
+        # compiled continuation per lexeme type to reproduce that precedence.
+        self.__continuations = {}
+        for index, lexeme_type in enumerate(scanned_types):
+            remaining_types = scanned_types[index + 1:]
+            self.__continuations[lexeme_type] = Scanner.__compile(remaining_types) if remaining_types else None
+
+    @staticmethod
+    def __compile(lexeme_types):
+        named_groups = ["(?P<{}>{})".format(lexeme_type.__name__, lexeme_type.PATTERN) for lexeme_type in lexeme_types]
+        return re.compile("|".join(named_groups))
+
+    def scan(self, line):
+        """
+            scans a right-stripped line, returning the list of lexemes that it contains. Input that no lexeme type
+            matches is skipped up to the next whitespace, and returned as an UnrecognizedInput lexeme.
+        """
+        if line == "":
+            return [EmptyLine(0)]
+        lexemes = []
+        position = 0
+        end = len(line)
+        previous_type = None
+        while position < end:
+            whitespace = WHITESPACE.match(line, position)
+            if whitespace is not None:
+                position = whitespace.end()
+                previous_type = None
+                continue
+            match = None
+            if previous_type is not None:
+                continuation = self.__continuations[previous_type]
+                if continuation is not None:
+                    match = continuation.match(line, position)
+            if match is None:
+                match = self.__master.match(line, position)
+            if match is None:
+                match = UNRECOGNIZED_INPUT.match(line, position)
+                lexemes.append(UnrecognizedInput(match.group(), position))
+                position = match.end()
+                previous_type = None
+                continue
+            lexeme_type = self.__lexeme_types_by_group_name[match.lastgroup]
+            lexemes.append(lexeme_type.from_token(match.group(), position))
+            position = match.end()
+            previous_type = lexeme_type
+        return lexemes
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from benchmark.corpus import generate_lines
+from benchmark.multi_pass_lexer import multi_pass_scan
+from transpiler.frontend.scanner import Scanner
+
+# pieces that random lines are made of: words of every lexeme type, partial words, symbols, quotes, escapes and
+# characters that no lexeme type matches
+PIECES = (
+    "module", "class", "facet", "interface", "trait", "public", "private", "method", "inputs", "errors", "is",
+    "references", "true", "false", "modules", "ab", "a", "x_1", "org.yapllang.test", "a.b", "_", "__", "1", "-12",
+    "3.5", "1e+5", "--", "---", "-", "+", "*", "/", ":", ".", "(", ")", "<", ">", "=", "!", "==", ":=", "+=", "\"",
+    "'", "\\", "\\\"", "\\n", "$", "@", "#", "Foo", "é", " ", " ", "  ", "\t"
+)
+
+def describe(tokens):
+    return [(type(token).__name__, token.get_lexeme_value(), token.get_offset()) for token in tokens]
+
+class TestScanner(unittest.TestCase):
+    """
+        Unit test suite for the Scanner, against the original multi-pass lexer
+    """
+
+    def setUp(self):
+        self.scanner = Scanner()
+
+    def assert_same_lexemes(self, line):
+        self.assertEqual(describe(multi_pass_scan(line)), describe(self.scanner.scan(line.rstrip())), repr(line))
+
+    def test_generated_lines(self):
+        for line in generate_lines(modules=2, classes=4, errors=2):
+            self.assert_same_lexemes(line)
+
+    def test_strings(self):
+        for line in (
+            "\"\"", "\"abc\" x", "'abc' x", "\"a \\\" b\"", "'a \\' b'", "\"a\\nb\\tc\\\\\"", "x(\"a\", 'b')",
+            "\"unterminated", "'unterminated", "\"a\"\"b\"", "\"it's\"",
+        ):
+            self.assert_same_lexemes(line)
+
+    def test_unrecognized_input(self):
+        for line in ("module Foo:", "$", "a$b c", "@x -- comment", "class x: # y", "été", "1.x"):
+            self.assert_same_lexemes(line)
+
+    def test_unrecognized_input_is_scanned_up_to_whitespace(self):
+        self.assertEqual(
+            [("Keyword", "module", 0), ("UnrecognizedInput", "Foo:", 7)],
+            describe(self.scanner.scan("module Foo:"))
+        )
+
+    def test_random_lines(self):
+        rng = random.Random(0)
+        for _ in range(20000):
+            self.assert_same_lexemes("".join(rng.choice(PIECES) for _ in range(rng.randint(1, 10))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+class SymbolTable(object):
+    """
+        A file-wide table of the declared Contexts, by their (interned) fully-qualified names, in the order they were
+        defined. That is the order of the source file after a full parse, but not after the frontend server re-parsed a
+        Context incrementally, which defines its declarations anew, after all others; walk the Contexts instead where
+        the order of the source file matters.
+    """
+
+    def __init__(self):
+        self.__symbols = {}
+        self.__has_redeclarations = False
+
+    def __len__(self):
+        return len(self.__symbols)
+
+    def __contains__(self, fully_qualified_name):
+        return fully_qualified_name in self.__symbols
+
+    def define(self, fully_qualified_name, context):
+        """
+            defines 'fully_qualified_name' as the name of 'context'
+
+            returns the Context that the name refers to, which is an earlier Context if the name was already defined,
+            as the first declaration of a name wins
+        """
+        defined_context = self.__symbols.setdefault(fully_qualified_name, context)
+        if defined_context is not context:
+            self.__has_redeclarations = True
+        return defined_context
+
+    def has_redeclarations(self):
+        """
+            returns True if a name was ever defined for more than one Context, in which case removing a definition
+            may uncover another declaration of the same name that is not in this table
+        """
+        return self.__has_redeclarations
+
+    def undefine(self, fully_qualified_name, context):
+        """
+            removes the definition of 'fully_qualified_name', if it refers to 'context'
+        """
+        if self.__symbols.get(fully_qualified_name) is context:
+            del self.__symbols[fully_qualified_name]
+
+    def lookup(self, fully_qualified_name):
+        """
+            retrieves the Context with the fully-qualified name 'fully_qualified_name', or None if there is none
+        """
+        return self.__symbols.get(fully_qualified_name)
+
+    def get_symbols(self):
+        """
+            retrieves a dictionary of all Contexts by their fully-qualified names, in the order they were defined. The
+            dictionary must not be modified.
+        """
+        return self.__symbols
@@ -1,10 +1,13 @@
 import os
+import time
 
+from transpiler.diagnostics import Diagnostic, Diagnostics, FORMAT_TEXT, SEVERITY_ERROR, SEVERITY_TRACE, create_sink, resolve
 from transpiler.frontend.file_reader import FileReader as YAPLFileReader
 from transpiler.frontend.contexts.context_stack import Stack as ContextStack
 from transpiler.frontend.contexts.file_context import FileContext
 from transpiler.frontend.lexer import Lexer as YAPLLexer, LexicallyAnalyzedLine
 from transpiler.frontend.lexemes import Lexeme
+from transpiler.profiler import PHASE_CACHE_LOAD, PHASE_CACHE_STORE, PHASE_END_OF_FILE, PHASE_LEX, PHASE_READ, PHASE_VALIDATE
 
 
 class Job(object):
@@ -15,6 +18,14 @@ class Job(object):
         self.__failed = False
         self.__context_stack = ContextStack()
         self.__verbose = False
+        self.__memory_mapped = False
+        self.__file_reader = None
+        self.__file_context = None
+        self.__cache = None
+        self.__diagnostics = Diagnostics()
+        self.__diagnostics_format = FORMAT_TEXT
+        self.__profile = None
+        self.__compacting_contents = False
 
     def get_context_stack(self):
         return self.__context_stack
@@ -24,6 +35,57 @@ class Job(object):
 
     def set_verbose(self):
         self.__verbose = True
+        self.__diagnostics.set_tracing()
+
+    def set_diagnostics_format(self, diagnostics_format):
+        """
+            selects the format that diagnostics are rendered in, one of transpiler.diagnostics.ALL_FORMATS
+        """
+        self.__diagnostics_format = diagnostics_format
+
+    def get_diagnostics(self):
+        return self.__diagnostics
+
+    def is_tracing(self):
+        return self.__diagnostics.is_tracing()
+
+    def set_profile(self, profile):
+        """
+            makes this Job account the wall time of its phases and Contexts to 'profile', a transpiler.profiler.Profile
+        """
+        self.__profile = profile
+
+    def get_profile(self):
+        return self.__profile
+
+    def set_compacting_contents(self):
+        """
+            makes this Job's Contexts release their lexically-analyzed-lines as they are popped off the ContextStack,
+            which bounds the memory held by the lines to that of the Contexts on the ContextStack, see
+            ContextBaseClass.compact_contents(). Verbose Jobs never compact, so that their traces are complete.
+        """
+        self.__compacting_contents = True
+
+    def is_compacting_contents(self):
+        return self.__compacting_contents and not self.__verbose
+
+    def set_memory_mapped(self):
+        self.__memory_mapped = True
+
+    def get_file_reader(self):
+        return self.__file_reader
+
+    def set_cache(self, cache):
+        self.__cache = cache
+
+    def get_file_context(self):
+        return self.__file_context
+
+    def get_errors(self):
+        """
+            retrieves the error Diagnostics reported by this Job
+        """
+        return self.__diagnostics.get_errors()
 
     def set_failed(self):
         self.__failed = True
@@ -41,66 +103,196 @@ class Job(object):
         self.__output_directory_name = os.path.abspath(output_directory_name)
 
     def run(self):
+        self.__diagnostics.add_sink(create_sink(self.__diagnostics_format))
+        started = time.perf_counter()
+        try:
+            self.__run()
+        finally:
+            if self.__profile is not None:
+                self.__profile.add_wall_time(time.perf_counter() - started)
+            self.__diagnostics.flush()
+
+    def __run(self):
         input_file_name = self.get_input_file_name()
-        reader = YAPLFileReader(input_file_name)
-        initial_context = FileContext(self, input_file_name)
-        self.__context_stack.push_context(initial_context)
+        profile = self.__profile
+        if self.__cache is not None and not self.__verbose:
+            # verbose runs re-parse, so that their traces are complete
+            cached = self.__measure(PHASE_CACHE_LOAD, self.__cache.load, input_file_name)
+            if cached is not None:
+                file_context, errors = cached
+                file_context.set_job(self)
+                self.__file_context = file_context
+                for error in errors:
+                    self.__report_error(error)
+                return
+        reader = YAPLFileReader(input_file_name, memory_mapped=self.__memory_mapped)
+        self.__file_reader = reader
+        initial_context = self.begin_file()
         lexer = YAPLLexer()
-        for line in reader.read_lines():
-            lexer_line = lexer.analyze_line(line)
-            leading_token = lexer_line.peek_leading_token()
-            current_context = self.__context_stack.current_context()
-            while (not self.__context_stack.is_empty()) and (not leading_token.is_empty_line()) and (leading_token.get_offset() < current_context.get_indentation_level()):
-                current_context.process_end_of_context(lexer_line)
-                current_context = current_context.pop_to_parent_context()
-            if current_context is None:
-                assert False, "did not expect to wind up in the root context"
-            else:
-                current_context.process_line(lexer_line)
+        lines = reader.read_lines()
+        analyze_line = lexer.analyze_line
+        line_cache = lexer.get_line_cache()
+        if profile is not None:
+            lines = profile.iterate(PHASE_READ, lines)
+            analyze_line = lambda line: profile.call(PHASE_LEX, lexer.analyze_line, line)
+            if line_cache is not None:
+                line_cache_hits, line_cache_misses = line_cache.get_hits(), line_cache.get_misses()
+        for line in lines:
+            self.dispatch_line(analyze_line(line))
             if self.failed():
                 # TODO: consider recovering
                 break
+        if profile is not None and line_cache is not None:
+            profile.add_line_cache_lookups(line_cache.get_hits() - line_cache_hits, line_cache.get_misses() - line_cache_misses)
+        self.end_file()
+        if self.__cache is not None:
+            self.__measure(PHASE_CACHE_STORE, self.__cache.store, input_file_name, initial_context, self.get_errors())
+
+    def begin_file(self):
+        """
+            starts parsing the input file, by pushing a new FileContext onto the ContextStack, which is returned
+        """
+        initial_context = FileContext(self, self.get_input_file_name())
+        self.__file_context = initial_context
+        self.__context_stack = ContextStack()
+        self.__context_stack.push_context(initial_context)
+        return initial_context
+
+    def resume_context(self, context):
+        """
+            prepares to parse further lines into 'context', a Context of the already parsed FileContext, by rebuilding
+            the ContextStack from the FileContext down to 'context'
+        """
+        ancestors = []
+        while context is not None:
+            ancestors.append(context)
+            context = context.get_parent_context()
+        assert ancestors[-1] is self.__file_context, "expected a Context of this Job's FileContext"
+        self.__context_stack = ContextStack()
+        for ancestor in reversed(ancestors):
+            self.__context_stack.push_context(ancestor)
+
+    def end_contexts_above(self, context, lexer_line):
+        """
+            ends each Context on the ContextStack above 'context', as 'lexer_line' (which may be None, at the end of
+            the file) would, without dispatching that line
+        """
+        current_context = self.__context_stack.current_context()
+        while current_context is not context:
+            current_context.process_end_of_context(lexer_line)
+            current_context = current_context.pop_to_parent_context()
+
+    def dispatch_line(self, lexer_line):
+        """
+            dispatches a lexically-analyzed line to the Context that it belongs to, after ending each Context on the
+            ContextStack that the line ends
+        """
+        profile = self.__profile
+        current_context = self.__context_stack.current_context()
+        if lexer_line.get_unrecognized_input():
+            self.__report_unrecognized_input(lexer_line, current_context)
+            return
+        leading_token = lexer_line.peek_leading_token()
+        while (not self.__context_stack.is_empty()) and (not leading_token.is_empty_line()) and self.__ends_context(leading_token, current_context):
+            if profile is None:
+                current_context.process_end_of_context(lexer_line)
+            else:
+                profile.dispatch(current_context, "process_end_of_context", lexer_line)
+            current_context = current_context.pop_to_parent_context()
+        if current_context is None:
+            assert False, "did not expect to wind up in the root context"
+        elif profile is None:
+            current_context.process_line(lexer_line)
+        else:
+            profile.dispatch(current_context, "process_line", lexer_line)
+
+    def __report_unrecognized_input(self, lexer_line, current_context):
+        """
+            reports a lexer error for each piece of input in 'lexer_line' that the scanner could not scan, instead of
+            dispatching the line
+        """
+        for unrecognized_input in lexer_line.get_unrecognized_input():
+            self.error(
+                "LEXER",
+                "UNRECOGNIZED-INPUT",
+                "unrecognized input \"{}\"".format(unrecognized_input.get_lexeme_value()),
+                unrecognized_input,
+                current_context.get_fully_qualified_name
+            )
+
+    def end_file(self):
+        """
+            finishes parsing the input file, by tearing down the ContextStack and validating the FileContext
+        """
         if not self.failed():
             current_context = self.__context_stack.current_context()
-            current_context.process_end_of_file()
+            self.__measure(PHASE_END_OF_FILE, current_context.process_end_of_file)
             assert self.__context_stack.is_empty(), "expected the whole context stack to have been torn down during process-end-of-file"
-        initial_context.validate_contents()
+        self.__measure(PHASE_VALIDATE, self.__file_context.validate_contents)
 
-    def error(self, component, error_code, error_message, location, fully_qualified_name):
+    def reset_diagnostics(self):
+        """
+            discards the errors reported so far and clears the failed state, so that the input file can be parsed again
+        """
+        self.__failed = False
+        self.__diagnostics = Diagnostics()
+        if self.__verbose:
+            self.__diagnostics.set_tracing()
+
+    def __ends_context(self, leading_token, context):
+        """
+            returns True if a line starting with 'leading_token' ends 'context', i.e. if it is less indented than the
+            context, or if it is a sibling of an already declared context at the same indentation level
+        """
+        offset = leading_token.get_offset()
+        indentation_level = context.get_indentation_level()
+        return offset < indentation_level or (offset == indentation_level and context.is_declaration_complete())
+
+    def __measure(self, phase, function, *args):
+        """
+            calls 'function' with 'args', accounting its wall time to 'phase' if this Job is being profiled
+        """
+        if self.__profile is None:
+            return function(*args)
+        return self.__profile.call(phase, function, *args)
+
+    def __report_error(self, error):
+        """
+            reports an error Diagnostic that was created elsewhere, e.g. loaded from the cache
+        """
         self.set_failed()
+        self.__diagnostics.record(error)
+
+    def __create_diagnostic(self, severity, component, error_code, message, location, fully_qualified_name):
         if location is None:
-            print("ERROR: reported_by(component={}, error_code={}), location(file=\"{}\", name=\"{}\"), message={}".format(
-                component, error_code, self.get_input_file_name(), fully_qualified_name, error_message
-            ))
+            line_number, offset, lexeme = None, None, None
+            lexical_line = None
         elif isinstance(location, Lexeme):
-            lexeme = location
-            lexical_line = lexeme.get_lexical_line()
-            print("ERROR: reported_by(component={}, error_code={}), location(file=\"{}\", line {}, offset={}, name=\"{}\"), lexeme={}, message={}".format(
-                component, error_code, self.get_input_file_name(), lexical_line.get_line_number(), lexeme.get_offset(), fully_qualified_name, lexeme.get_printable_value(), error_message
-            ))
+            lexical_line = location.get_lexical_line()
+            line_number = lexical_line.get_line_number()
+            offset = location.get_offset()
+            lexeme = location.get_printable_value()
         else:
             assert isinstance(location, LexicallyAnalyzedLine)
             lexical_line = location
-            print("ERROR: reported_by(component={}, error_code={}), location(file=\"{}\", line {}, name=\"{}\"), message={}".format(
-                component, error_code, self.get_input_file_name(), lexical_line.get_line_number(), fully_qualified_name, error_message
-            ))
+            line_number, offset, lexeme = location.get_line_number(), None, None
+        byte_offset = None
+        if lexical_line is not None and self.__file_reader is not None:
+            byte_offset = self.__file_reader.get_byte_offset(line_number, lexical_line.get_line(), offset or 0)
+        return Diagnostic(severity, component, error_code, self.get_input_file_name(), line_number, offset, resolve(fully_qualified_name), lexeme, resolve(message), byte_offset)
+
+    def error(self, component, error_code, error_message, location, fully_qualified_name):
+        """
+            reports an error. 'error_message' and 'fully_qualified_name' may be given as values, or as thunks that
+            compute them
+        """
+        self.__report_error(self.__create_diagnostic(SEVERITY_ERROR, component, error_code, error_message, location, fully_qualified_name))
 
     def trace(self, component, trace_message, location, fully_qualified_name):
-        if not self.__verbose:
+        """
+            reports a trace, if tracing is enabled. 'trace_message' and 'fully_qualified_name' may be given as values,
+            or as thunks that compute them, which are only called when tracing is enabled
+        """
+        if not self.__diagnostics.is_tracing():
             return
-        if location is None:
-            print("TRACE: reported_by(component={}), location(file=\"{}\", name=\"{}\"), message={}".format(
-                component, self.get_input_file_name(), fully_qualified_name, trace_message
-            ))
-        elif isinstance(location, Lexeme):
-            lexeme = location
-            lexical_line = lexeme.get_lexical_line()
-            print("TRACE: reported_by(component={}), location(file=\"{}\", line {}, offset={}, name=\"{}\"), lexeme={}, message={}".format(
-                component, self.get_input_file_name(), lexical_line.get_line_number(), lexeme.get_offset(), fully_qualified_name, lexeme.get_printable_value(), trace_message
-            ))
-        else:
-            assert isinstance(location, LexicallyAnalyzedLine)
-            lexical_line = location
-            print("TRACE: reported_by(component={}), location(file=\"{}\", line {}, name=\"{}\"), message={}".format(
-                component, self.get_input_file_name(), lexical_line.get_line_number(), fully_qualified_name, trace_message
-            ))
+        self.__diagnostics.record(self.__create_diagnostic(SEVERITY_TRACE, component, None, trace_message, location, fully_qualified_name))
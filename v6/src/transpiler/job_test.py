@@ -0,0 +1,182 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from transpiler.frontend.contexts.error_declaration_context import ErrorDeclarationContext
+from transpiler.job import Job
+
+EXAMPLES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "examples")
+
+SIBLING_DECLARATIONS = """module org.yapllang.test: -- the test module
+
+    class first: -- the first class
+
+        -- the facet of the first class
+        public facet first_facet:
+
+            method first_method: -- a method
+
+                inputs:
+
+                    first_input is integer -- the first input
+                    second_input references garden -- the second input
+
+                returns:
+
+                    result is boolean -- the result
+
+                errors:
+
+                    first_error -- the first error
+                    second_error -- the second error
+
+            method second_method: -- a method
+
+                inputs:
+
+                    only_input is integer -- the only input
+
+        public interface second_facet:
+
+            method third_method: -- a method
+
+                inputs:
+
+                    only_input is integer -- the only input
+
+    class second: -- the second class
+
+        public facet only_facet:
+
+            method only_method: -- a method
+
+                inputs:
+
+                    only_input is integer -- the only input
+"""
+
+
+def run_job(input_file_name):
+    """
+        runs a Job on 'input_file_name', discarding the diagnostics that it writes, and returns the Job
+    """
+    job = Job()
+    job.set_input_file_name(input_file_name)
+    with contextlib.redirect_stdout(io.StringIO()):
+        job.run()
+    return job
+
+
+class TestJob(unittest.TestCase):
+    """
+        Unit test suite for the parsing of input files by a Job
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        input_file_name = os.path.join(self.directory.name, "test.py.yapl")
+        with open(input_file_name, "w") as f:
+            f.write(SIBLING_DECLARATIONS)
+        self.job = run_job(input_file_name)
+        self.module = self.job.get_file_context().get_content_module("org.yapllang.test")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sibling_declarations_parse_without_errors(self):
+        self.assertEqual([], [error.to_text() for error in self.job.get_errors()])
+
+    def test_sibling_declarations_end_each_other(self):
+        self.assertEqual(["first", "second"], [c.get_content_class_name() for c in self.module.get_content_classes()])
+        first_class = self.module.get_content_class("first")
+        self.assertEqual(["first_facet", "second_facet"], [f.get_content_class_facet_name() for f in first_class.get_content_class_facets()])
+        first_facet = first_class.get_content_class_facet("first_facet")
+        self.assertEqual(["first_method", "second_method"], [c.get_content_callable_name() for c in first_facet.get_content_callables()])
+        first_method = first_facet.get_content_callable("first_method")
+        self.assertEqual(["inputs", "returns", "errors"], list(first_method.get_content_callable_segments()))
+
+    def test_callable_segments_keep_their_declarations(self):
+        first_method = self.module.get_content_class("first").get_content_class_facet("first_facet").get_content_callable("first_method")
+        inputs = first_method.get_content_callable_segment("inputs")
+        self.assertEqual(["first_input", "second_input"], [i.get_content_identifier_name() for i in inputs.get_content_identifier_declarations()])
+
+    def test_errors_segments_declare_errors(self):
+        first_method = self.module.get_content_class("first").get_content_class_facet("first_facet").get_content_callable("first_method")
+        errors = first_method.get_content_callable_segment("errors").get_content_error_declarations()
+        self.assertTrue(all(isinstance(error, ErrorDeclarationContext) for error in errors))
+        self.assertEqual(["first_error", "second_error"], [error.get_content_error_name() for error in errors])
+
+    def test_class_bodies_accept_class_facet_prefix_comments(self):
+        first_facet = self.module.get_content_class("first").get_content_class_facet("first_facet")
+        self.assertEqual(1, len(first_facet.get_content_class_prefix_comments()))
+
+    def test_example_file_is_parsed_up_to_its_callable_segment(self):
+        # the prefix comment of the class-facet in the example is accepted, and parsing goes on up to the "input:"
+        # segment of its method, which isn't a callable-segment keyword
+        job = run_job(os.path.join(EXAMPLES_DIRECTORY, "org.yapllang.examples", "file.py.yapl"))
+        self.assertEqual(
+            [("EXPECTED-CONTENT-AT-SPECIFIC-INDENT", 23)],
+            [(error.error_code, error.line_number) for error in job.get_errors()]
+        )
+
+
+class TestChildContextLookups(unittest.TestCase):
+    """
+        Unit test suite for looking up the child-contexts of a parsed Context
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        input_file_name = os.path.join(self.directory.name, "test.py.yapl")
+        with open(input_file_name, "w") as f:
+            # the module declares the class "first" twice
+            f.write(SIBLING_DECLARATIONS.replace("class second:", "class first:"))
+        self.module = run_job(input_file_name).get_file_context().get_content_module("org.yapllang.test")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_the_last_of_several_children_with_the_same_name_is_looked_up(self):
+        classes = self.module.get_content_classes()
+        self.assertEqual(2, len(classes))
+        self.assertIs(classes[1], self.module.get_content_class("first"))
+
+    def test_lookups_do_not_expose_the_index(self):
+        with self.assertRaises(AttributeError):
+            self.module.get_content_classes().clear()
+        self.assertEqual(2, len(self.module.get_content_classes()))
+        with self.assertRaises(TypeError):
+            self.module.get_child_contexts_by_name(type(self.module.get_content_class("first")))["second"] = None
+
+
+class TestUnrecognizedInput(unittest.TestCase):
+    """
+        Unit test suite for the reporting of input that the scanner could not scan
+    """
+
+    def test_unrecognized_input_is_reported_as_a_lexer_error(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            input_file_name = os.path.join(directory_name, "test.py.yapl")
+            with open(input_file_name, "w") as f:
+                f.write("module Foo: -- the test module\n")
+            job = run_job(input_file_name)
+        error = job.get_errors()[0]
+        self.assertEqual(("LEXER", "UNRECOGNIZED-INPUT"), (error.component, error.error_code))
+        self.assertEqual((1, 7), (error.line_number, error.offset))
+        self.assertEqual("[type=UnrecognizedInput, value=\"Foo:\"]", error.lexeme)
+
+    def test_unrecognized_input_is_located_in_the_file(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            input_file_name = os.path.join(directory_name, "test.py.yapl")
+            with open(input_file_name, "wb") as f:
+                f.write("-- caf\u00e9\nmodule Foo: -- the test module\n".encode("utf-8"))
+            job = run_job(input_file_name)
+        error = job.get_errors()[0]
+        self.assertEqual((2, 7), (error.line_number, error.offset))
+        self.assertEqual(16, error.byte_offset)
+
+
+if __name__ == "__main__":
+    unittest.main()
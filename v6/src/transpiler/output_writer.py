@@ -0,0 +1,183 @@
+"""
+    The output layer of the transpiler, that writes the artifacts of Jobs to the output directory.
+
+    Artifacts are written atomically, through a temporary file that is renamed over the target, and only if their
+    content differs from what is already on disk, so that the files of unchanged artifacts keep their mtimes and don't
+    trigger rebuilds downstream. A manifest in the output directory records which input file each artifact was produced
+    from, so that stale artifacts (e.g. of an input file that was removed, or that failed to transpile) can be pruned.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+from transpiler.cache import calculate_sha256_of_file
+
+MANIFEST_FILE_NAME = ".yapl-manifest.json"
+MANIFEST_VERSION = 1
+
+def get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# the mode that files are created with, as mkstemp() creates its temporary files readable by their owner only
+FILE_MODE = 0o666 & ~get_umask()
+
+def write_file_atomically(file_name, data):
+    """
+        writes the bytes 'data' to 'file_name' through a temporary file in the same directory, that is renamed over
+        'file_name', so that readers never see a partially written file
+    """
+    directory_name = os.path.dirname(file_name)
+    os.makedirs(directory_name, mode=0o777, exist_ok=True)
+    file_descriptor, temporary_file_name = tempfile.mkstemp(dir=directory_name, suffix=".tmp")
+    try:
+        with io.open(file_descriptor, "wb") as f:
+            f.write(data)
+        os.chmod(temporary_file_name, FILE_MODE)
+        os.replace(temporary_file_name, file_name)
+    except:
+        os.unlink(temporary_file_name)
+        raise
+
+class Manifest(object):
+    """
+        The manifest of the artifacts in an output directory: per artifact, by its name relative to the output directory,
+        the input file that it was produced from, and the sha256, size and mtime of its content
+    """
+
+    def __init__(self, output_directory_name):
+        self.__output_directory_name = os.path.abspath(output_directory_name)
+        self.__entries = {}
+        self.__updated_names = set()
+
+    def get_file_name(self):
+        return os.path.join(self.__output_directory_name, MANIFEST_FILE_NAME)
+
+    def load(self):
+        """
+            loads the manifest from the output directory. A missing or unreadable manifest is treated as empty, which
+            only means that artifacts are compared against the disk by hashing them.
+        """
+        try:
+            with io.open(self.get_file_name()) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if isinstance(manifest, dict) and manifest.get("version") == MANIFEST_VERSION:
+            self.__entries = manifest.get("files", {})
+        return self
+
+    def save(self):
+        data = json.dumps({"version": MANIFEST_VERSION, "files": self.__entries}, indent=2, sort_keys=True) + "\n"
+        write_file_atomically(self.get_file_name(), data.encode("utf-8"))
+
+    def get_entries(self):
+        return self.__entries
+
+    def get_entries_by_source(self):
+        """
+            retrieves the manifest entries grouped by the input file that they were produced from, as a dictionary of
+            dictionaries of entries by artifact name, by input file name
+        """
+        entries_by_source = {}
+        for name, entry in self.__entries.items():
+            entries_by_source.setdefault(entry["source"], {})[name] = entry
+        return entries_by_source
+
+    def update(self, entries):
+        """
+            records the artifacts 'entries', a dictionary of manifest entries by artifact name, that were produced by
+            the current run
+        """
+        self.__entries.update(entries)
+        self.__updated_names.update(entries)
+
+    def prune(self, input_file_names):
+        """
+            removes the stale artifacts, i.e. those that were produced from one of 'input_file_names' by an earlier
+            run, but not by the current one, and those whose input file no longer exists
+
+            returns the sorted list of the names of the artifacts removed
+        """
+        input_file_names = set(input_file_names)
+        pruned_names = []
+        for name, entry in list(self.__entries.items()):
+            if name in self.__updated_names:
+                continue
+            if entry["source"] in input_file_names or not os.path.exists(entry["source"]):
+                try:
+                    os.unlink(os.path.join(self.__output_directory_name, name))
+                except FileNotFoundError:
+                    pass
+                del self.__entries[name]
+                pruned_names.append(name)
+        return sorted(pruned_names)
+
+class OutputWriter(object):
+    """
+        Writes the artifacts that a Job produces from one input file to the output directory, skipping those whose
+        content is already on disk
+    """
+
+    def __init__(self, output_directory_name, source_file_name, previous_entries=None):
+        """
+            initializes the OutputWriter
+
+            'source_file_name' is the input file that the artifacts are produced from
+            'previous_entries' is the dictionary of the manifest entries, by artifact name, of the artifacts that an
+            earlier run produced from the input file, if the manifest was loaded. An artifact whose file still has the
+            size and mtime recorded in its entry is not hashed again.
+        """
+        self.__output_directory_name = os.path.abspath(output_directory_name)
+        self.__source_file_name = os.path.abspath(source_file_name)
+        self.__previous_entries = previous_entries or {}
+        self.__entries = {}
+        self.__written_names = []
+
+    def get_entries(self):
+        """
+            retrieves the manifest entries of the artifacts produced so far, by artifact name
+        """
+        return self.__entries
+
+    def get_written_names(self):
+        """
+            retrieves the names of the artifacts whose content changed, and that were therefore written
+        """
+        return self.__written_names
+
+    def __get_sha256_on_disk(self, name, file_name):
+        try:
+            stat = os.stat(file_name)
+        except FileNotFoundError:
+            return None, None
+        entry = self.__previous_entries.get(name)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"], stat
+        return calculate_sha256_of_file(file_name), stat
+
+    def write(self, name, data):
+        """
+            writes the bytes 'data' to the artifact 'name', relative to the output directory, unless the artifact
+            already has that content
+
+            returns True if the artifact was written
+        """
+        file_name = os.path.join(self.__output_directory_name, name)
+        sha256 = hashlib.sha256(data).hexdigest()
+        sha256_on_disk, stat = self.__get_sha256_on_disk(name, file_name)
+        written = sha256 != sha256_on_disk
+        if written:
+            write_file_atomically(file_name, data)
+            stat = os.stat(file_name)
+            self.__written_names.append(name)
+        self.__entries[name] = {
+            "source": self.__source_file_name,
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+        return written
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+
+from transpiler.output_writer import Manifest, OutputWriter
+
+class TestOutputWriter(unittest.TestCase):
+    """
+        Unit test suite for writing artifacts to the output directory
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_directory_name = os.path.join(self.directory.name, "output")
+        self.source_file_name = os.path.join(self.directory.name, "a.py.yapl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_artifact(self, name):
+        with open(os.path.join(self.output_directory_name, name), "rb") as f:
+            return f.read()
+
+    def test_a_new_artifact_is_written(self):
+        output_writer = OutputWriter(self.output_directory_name, self.source_file_name)
+        self.assertTrue(output_writer.write(os.path.join("a", "a.py.ast"), b"tree"))
+        self.assertEqual(b"tree", self.read_artifact(os.path.join("a", "a.py.ast")))
+        self.assertEqual([os.path.join("a", "a.py.ast")], output_writer.get_written_names())
+        entry = output_writer.get_entries()[os.path.join("a", "a.py.ast")]
+        self.assertEqual((self.source_file_name, 4), (entry["source"], entry["size"]))
+        self.assertEqual([], [name for name in os.listdir(os.path.join(self.output_directory_name, "a")) if name.endswith(".tmp")])
+
+    def test_an_unchanged_artifact_is_not_rewritten(self):
+        OutputWriter(self.output_directory_name, self.source_file_name).write("a.py.ast", b"tree")
+        file_name = os.path.join(self.output_directory_name, "a.py.ast")
+        os.utime(file_name, ns=(1, 1))
+        for previous_entries in (None, {}):
+            output_writer = OutputWriter(self.output_directory_name, self.source_file_name, previous_entries)
+            self.assertFalse(output_writer.write("a.py.ast", b"tree"))
+            self.assertEqual([], output_writer.get_written_names())
+            self.assertEqual(1, os.stat(file_name).st_mtime_ns)
+
+    def test_a_changed_artifact_is_rewritten(self):
+        OutputWriter(self.output_directory_name, self.source_file_name).write("a.py.ast", b"tree")
+        output_writer = OutputWriter(self.output_directory_name, self.source_file_name)
+        self.assertTrue(output_writer.write("a.py.ast", b"other tree"))
+        self.assertEqual(b"other tree", self.read_artifact("a.py.ast"))
+
+    def test_previous_entries_spare_hashing_an_unchanged_file(self):
+        output_writer = OutputWriter(self.output_directory_name, self.source_file_name)
+        output_writer.write("a.py.ast", b"tree")
+        previous_entries = output_writer.get_entries()
+        # an entry that matches the file's size and mtime is trusted, so that its recorded sha256 is what is compared
+        previous_entries["a.py.ast"]["sha256"] = "stale"
+        output_writer = OutputWriter(self.output_directory_name, self.source_file_name, previous_entries)
+        self.assertTrue(output_writer.write("a.py.ast", b"tree"))
+
+
+class TestManifest(unittest.TestCase):
+    """
+        Unit test suite for the manifest of the artifacts in an output directory, and the pruning of stale artifacts
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_directory_name = os.path.join(self.directory.name, "output")
+        self.source_file_names = []
+        for name in ("a", "b"):
+            source_file_name = os.path.join(self.directory.name, "{}.py.yapl".format(name))
+            with open(source_file_name, "w") as f:
+                f.write("module {}:\n".format(name))
+            self.source_file_names.append(source_file_name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_writers(self, artifacts_by_source_file_name):
+        """
+            writes the artifacts of each input file, as a run would, returning the loaded Manifest, updated but not saved
+        """
+        manifest = Manifest(self.output_directory_name).load()
+        previous_entries = manifest.get_entries_by_source()
+        for source_file_name, names in artifacts_by_source_file_name.items():
+            output_writer = OutputWriter(self.output_directory_name, source_file_name, previous_entries.get(source_file_name))
+            for name in names:
+                output_writer.write(name, name.encode("utf-8"))
+            manifest.update(output_writer.get_entries())
+        return manifest
+
+    def artifact_exists(self, name):
+        return os.path.exists(os.path.join(self.output_directory_name, name))
+
+    def test_entries_survive_saving_and_loading(self):
+        manifest = self.run_writers({self.source_file_names[0]: ["a.py.ast"]})
+        manifest.save()
+        self.assertEqual(manifest.get_entries(), Manifest(self.output_directory_name).load().get_entries())
+
+    def test_a_missing_or_unreadable_manifest_is_empty(self):
+        self.assertEqual({}, Manifest(self.output_directory_name).load().get_entries())
+        os.makedirs(self.output_directory_name)
+        with open(Manifest(self.output_directory_name).get_file_name(), "w") as f:
+            f.write("{")
+        self.assertEqual({}, Manifest(self.output_directory_name).load().get_entries())
+
+    def test_an_artifact_whose_input_file_was_removed_is_pruned(self):
+        self.run_writers({self.source_file_names[0]: ["a.py.ast"], self.source_file_names[1]: ["b.py.ast"]}).save()
+        os.unlink(self.source_file_names[1])
+        manifest = self.run_writers({self.source_file_names[0]: ["a.py.ast"]})
+        self.assertEqual(["b.py.ast"], manifest.prune(self.source_file_names[:1]))
+        self.assertFalse(self.artifact_exists("b.py.ast"))
+        self.assertEqual(["a.py.ast"], list(manifest.get_entries()))
+
+    def test_an_artifact_that_the_run_did_not_produce_again_is_pruned(self):
+        self.run_writers({self.source_file_names[0]: ["a.py.ast", "a.py.old"]}).save()
+        manifest = self.run_writers({self.source_file_names[0]: ["a.py.ast"]})
+        self.assertEqual(["a.py.old"], manifest.prune(self.source_file_names[:1]))
+        self.assertFalse(self.artifact_exists("a.py.old"))
+
+    def test_artifacts_produced_by_the_run_are_kept(self):
+        self.run_writers({self.source_file_names[0]: ["a.py.ast"], self.source_file_names[1]: ["b.py.ast"]}).save()
+        manifest = self.run_writers({self.source_file_names[0]: ["a.py.ast"], self.source_file_names[1]: ["b.py.ast"]})
+        self.assertEqual([], manifest.prune(self.source_file_names))
+        self.assertTrue(self.artifact_exists("a.py.ast"))
+        self.assertTrue(self.artifact_exists("b.py.ast"))
+
+    def test_artifacts_of_input_files_outside_the_run_are_kept(self):
+        self.run_writers({self.source_file_names[0]: ["a.py.ast"], self.source_file_names[1]: ["b.py.ast"]}).save()
+        manifest = self.run_writers({self.source_file_names[0]: ["a.py.ast"]})
+        self.assertEqual([], manifest.prune(self.source_file_names[:1]))
+        self.assertTrue(self.artifact_exists("b.py.ast"))
+
+    def test_files_that_are_not_in_the_manifest_are_kept(self):
+        self.run_writers({self.source_file_names[0]: ["a.py.ast"]}).save()
+        with open(os.path.join(self.output_directory_name, "hand-written.txt"), "w") as f:
+            f.write("not an artifact")
+        os.unlink(self.source_file_names[0])
+        manifest = self.run_writers({})
+        self.assertEqual(["a.py.ast"], manifest.prune([]))
+        self.assertTrue(self.artifact_exists("hand-written.txt"))
+        self.assertTrue(os.path.exists(manifest.get_file_name()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import time
+
+PHASE_CACHE_LOAD = "cache_load"
+PHASE_READ = "read"
+PHASE_LEX = "lex"
+PHASE_DISPATCH = "dispatch"
+PHASE_END_OF_FILE = "end_of_file"
+PHASE_VALIDATE = "validate"
+PHASE_CACHE_STORE = "cache_store"
+ALL_PHASES = [PHASE_CACHE_LOAD, PHASE_READ, PHASE_LEX, PHASE_DISPATCH, PHASE_END_OF_FILE, PHASE_VALIDATE, PHASE_CACHE_STORE]
+
+class Profile(object):
+    """
+        Accumulates wall time and call counts for the phases of a transpilation Job, and for the Context classes
+        that lines are dispatched to.
+
+        Profiles are converted to plain dictionaries with to_dict(), so that they can be returned from worker
+        processes, and merged with merge_profile_dicts().
+    """
+
+    def __init__(self):
+        self.__wall_time = 0.0
+        self.__phases = {}
+        self.__contexts = {}
+        self.__line_cache_hits = 0
+        self.__line_cache_misses = 0
+
+    @staticmethod
+    def __add(entries, name, seconds):
+        entry = entries.get(name)
+        if entry is None:
+            entry = entries[name] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def add_wall_time(self, seconds):
+        self.__wall_time += seconds
+
+    def add_phase_time(self, phase, seconds):
+        Profile.__add(self.__phases, phase, seconds)
+
+    def add_context_time(self, context_class_name, seconds):
+        Profile.__add(self.__contexts, context_class_name, seconds)
+
+    def add_line_cache_lookups(self, hits, misses):
+        """
+            accounts the hits and misses of the lexer's LineCache while lexing the input file
+        """
+        self.__line_cache_hits += hits
+        self.__line_cache_misses += misses
+
+    def call(self, phase, function, *args):
+        """
+            calls 'function' with 'args', accounting its wall time to 'phase'
+        """
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.add_phase_time(phase, time.perf_counter() - started)
+
+    def dispatch(self, context, method_name, *args):
+        """
+            calls the method 'method_name' of 'context' with 'args', accounting its wall time both to the dispatch
+            phase, and to the class of 'context'
+        """
+        started = time.perf_counter()
+        try:
+            return getattr(context, method_name)(*args)
+        finally:
+            seconds = time.perf_counter() - started
+            self.add_phase_time(PHASE_DISPATCH, seconds)
+            self.add_context_time(type(context).__name__, seconds)
+
+    def iterate(self, phase, iterable):
+        """
+            yields the items of 'iterable', accounting the wall time spent producing each item to 'phase'
+        """
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_phase_time(phase, time.perf_counter() - started)
+                return
+            self.add_phase_time(phase, time.perf_counter() - started)
+            yield item
+
+    def to_dict(self):
+        def entries_to_dict(entries):
+            return dict((name, {"calls": calls, "seconds": seconds}) for name, (calls, seconds) in entries.items())
+        return {
+            "jobs": 1,
+            "wall_time": self.__wall_time,
+            "phases": entries_to_dict(self.__phases),
+            "contexts": entries_to_dict(self.__contexts),
+            "line_cache": line_cache_to_dict(self.__line_cache_hits, self.__line_cache_misses)
+        }
+
+def line_cache_to_dict(hits, misses):
+    lookups = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0}
+
+def merge_profile_dicts(profile_dicts):
+    """
+        merges the dictionaries of several Profiles, e.g. one per input file, into a single dictionary
+    """
+    result = {"jobs": 0, "wall_time": 0.0, "phases": {}, "contexts": {}}
+    line_cache_hits = 0
+    line_cache_misses = 0
+    for profile_dict in profile_dicts:
+        result["jobs"] += profile_dict["jobs"]
+        result["wall_time"] += profile_dict["wall_time"]
+        line_cache_hits += profile_dict["line_cache"]["hits"]
+        line_cache_misses += profile_dict["line_cache"]["misses"]
+        for key in ["phases", "contexts"]:
+            for name, entry in profile_dict[key].items():
+                merged = result[key].setdefault(name, {"calls": 0, "seconds": 0.0})
+                merged["calls"] += entry["calls"]
+                merged["seconds"] += entry["seconds"]
+    result["line_cache"] = line_cache_to_dict(line_cache_hits, line_cache_misses)
+    return result
@@ -0,0 +1,366 @@
+"""
+    A long-running frontend server, that keeps parsed YAPL files in memory and re-parses them incrementally as they
+    are edited, so that editors and pre-commit hooks don't pay for interpreter startup and a full parse on every change.
+
+    The server speaks JSON-RPC 2.0, with one request or response per line, over stdio or a unix socket. The methods are:
+
+    - open(file_name, text=None): parses a file, from 'text' if given, or else from disk
+    - change(file_name, start_line, deleted_line_count, lines): replaces 'deleted_line_count' lines, starting at the
+      1-based line number 'start_line', with 'lines', and re-parses the file
+    - diagnostics(file_name): retrieves the result of the last parse of a file
+    - syntax_tree(file_name): retrieves the syntax tree of a file, serialized by transpiler.syntax_tree, in base64
+    - close(file_name): forgets a file
+    - shutdown(): stops the server
+
+    An edit only re-lexes the changed lines. If the edit lies within the body of a Context, i.e. all changed lines are
+    empty or indented deeper than the Context, then only the smallest such Context is re-run through the Job's
+    ContextStack. Otherwise, or if the file failed to parse before the edit or fails to parse after it, the whole file
+    is re-parsed, so that the diagnostics are always those of a full parse.
+"""
+import base64
+import errno
+import inspect
+import io
+import json
+import os
+import socketserver
+import stat
+import sys
+
+from transpiler.frontend.contexts.context import ContextBaseClass
+from transpiler.frontend.file_reader import FileReader as YAPLFileReader
+from transpiler.frontend.lexer import Lexer as YAPLLexer
+from transpiler.job import Job
+from transpiler.syntax_tree import dumps as dump_syntax_tree
+
+REPARSE_FULL = "full"
+REPARSE_INCREMENTAL = "incremental"
+
+# the JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+class RequestError(Exception):
+    """
+        An error that is reported to the client as the JSON-RPC error of a request
+    """
+
+    def __init__(self, code, message):
+        Exception.__init__(self, message)
+        self.code = code
+        self.message = message
+
+def is_within_body(lexer_line, indentation_level):
+    """
+        returns True if 'lexer_line' does not end a Context at 'indentation_level', i.e. if it is empty or indented
+        deeper than the Context
+    """
+    leading_token = lexer_line.peek_leading_token()
+    return leading_token.is_empty_line() or leading_token.get_offset() > indentation_level
+
+def iterate_contexts(context):
+    """
+        yields 'context' and all of its descendant Contexts
+    """
+    yield context
+    for content in context.get_contents():
+        if isinstance(content, ContextBaseClass):
+            yield from iterate_contexts(content)
+
+class Document(object):
+    """
+        A YAPL file that is kept in memory, as its lexically-analyzed lines and the FileContext that they parse into
+    """
+
+    def __init__(self, file_name, lines):
+        self.__lexer = YAPLLexer()
+        self.__lexer_lines = [self.__lexer.analyze_line_at(line, index + 1) for index, line in enumerate(lines)]
+        self.__job = Job()
+        self.__job.set_input_file_name(file_name)
+        self.__last_reparse = None
+        self.__last_reparsed_context = None
+        self.__parse_fully()
+
+    def get_file_name(self):
+        return self.__job.get_input_file_name()
+
+    def get_job(self):
+        return self.__job
+
+    def get_line_count(self):
+        return len(self.__lexer_lines)
+
+    def get_last_reparse(self):
+        """
+            retrieves how the file was last parsed, REPARSE_FULL or REPARSE_INCREMENTAL
+        """
+        return self.__last_reparse
+
+    def get_last_reparsed_context(self):
+        """
+            retrieves the Context that was re-parsed by the last incremental parse, or the FileContext after a full parse
+        """
+        return self.__last_reparsed_context
+
+    def edit(self, start_line, deleted_line_count, lines):
+        """
+            replaces 'deleted_line_count' lines, starting at the 1-based line number 'start_line', with 'lines', and
+            re-parses the file, incrementally if possible
+        """
+        start = start_line - 1
+        if start < 0 or deleted_line_count < 0 or start + deleted_line_count > len(self.__lexer_lines):
+            raise RequestError(INVALID_PARAMS, "the edit of lines {} to {} is outside of the {} lines of {}".format(
+                start_line, start_line + deleted_line_count - 1, len(self.__lexer_lines), self.get_file_name()
+            ))
+        inserted_lexer_lines = [self.__lexer.analyze_line_at(line.rstrip(), start + index + 1) for index, line in enumerate(lines)]
+        context = None
+        if not self.__job.failed():
+            context = self.__find_reparsable_context(start, self.__lexer_lines[start:start + deleted_line_count] + inserted_lexer_lines)
+        self.__lexer_lines[start:start + deleted_line_count] = inserted_lexer_lines
+        if len(inserted_lexer_lines) != deleted_line_count:
+            for index in range(start + len(inserted_lexer_lines), len(self.__lexer_lines)):
+                self.__lexer_lines[index].set_line_number(index + 1)
+        if context is None or not self.__reparse_context(context, start + len(inserted_lexer_lines)):
+            self.__parse_fully()
+
+    def __parse_fully(self):
+        job = self.__job
+        job.reset_diagnostics()
+        job.begin_file()
+        for lexer_line in self.__lexer_lines:
+            job.dispatch_line(lexer_line)
+            if job.failed():
+                break
+        job.end_file()
+        self.__last_reparse = REPARSE_FULL
+        self.__last_reparsed_context = job.get_file_context()
+
+    def __find_reparsable_context(self, start, changed_lexer_lines):
+        """
+            finds the smallest Context whose body contains the edit of 'changed_lexer_lines' (the deleted lines and the
+            inserted lines) at index 'start', such that the edit can't end the Context or change its declaration.
+            Returns None if there is no such Context.
+        """
+        found = None
+        context = self.__job.get_file_context()
+        while True:
+            child_contexts = [content for content in context.get_contents() if isinstance(content, ContextBaseClass)]
+            # the child-contexts are in source order, so find the last one that starts before the edit
+            low, high = 0, len(child_contexts)
+            while low < high:
+                middle = (low + high) // 2
+                if child_contexts[middle].get_first_line().get_line_number() - 1 < start:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low == 0:
+                return found
+            context = child_contexts[low - 1]
+            if not self.__contains_edit(context, start, changed_lexer_lines):
+                return found
+            found = context
+
+    def __contains_edit(self, context, start, changed_lexer_lines):
+        indentation_level = context.get_indentation_level()
+        # skip the prefix comments, to find the declaration statement of the context
+        declaration = context.get_first_line().get_line_number() - 1
+        while declaration < start and self.__lexer_lines[declaration].peek_leading_token().is_comment():
+            declaration += 1
+        if declaration >= start:
+            return False
+        for index in range(declaration + 1, start):
+            if not is_within_body(self.__lexer_lines[index], indentation_level):
+                return False
+        return all(is_within_body(lexer_line, indentation_level) for lexer_line in changed_lexer_lines)
+
+    def __reparse_context(self, context, end_of_edit):
+        """
+            re-parses 'context' from its first line up to the line that ends it, which lies at or after 'end_of_edit',
+            and replaces it by the resulting Context. Returns False if the file has to be parsed fully instead.
+        """
+        job = self.__job
+        file_context = job.get_file_context()
+        symbol_table = file_context.get_symbol_table()
+        if symbol_table.has_redeclarations():
+            # the declarations of the context may shadow, or be shadowed by, those of a redeclaration elsewhere
+            return False
+        end = end_of_edit
+        while end < len(self.__lexer_lines) and is_within_body(self.__lexer_lines[end], context.get_indentation_level()):
+            end += 1
+        job.reset_diagnostics()
+        for descendant in iterate_contexts(context):
+            symbol_table.undefine(descendant.get_fully_qualified_name(), descendant)
+        parent_context = context.get_parent_context()
+        detached_contents = parent_context.detach_contents_from(context)
+        job.resume_context(parent_context)
+        for lexer_line in self.__lexer_lines[context.get_first_line().get_line_number() - 1:end]:
+            job.dispatch_line(lexer_line)
+            if job.failed():
+                return False
+        job.end_contexts_above(parent_context, self.__lexer_lines[end] if end < len(self.__lexer_lines) else None)
+        reparsed_context = parent_context.get_contents()[-1]
+        parent_context.reattach_contents(detached_contents)
+        # the file had no errors before the edit, and the ancestors of the context only validate their own children,
+        # which the context was replaced among by a context with the same declaration, so that validating the context
+        # reports the same errors as validating the whole file
+        reparsed_context.validate_contents()
+        if job.failed():
+            return False
+        self.__last_reparse = REPARSE_INCREMENTAL
+        self.__last_reparsed_context = reparsed_context
+        return True
+
+class Server(object):
+    """
+        Handles the JSON-RPC requests of the frontend server, keeping a Document per open file
+    """
+
+    def __init__(self):
+        self.__documents = {}
+        self.__shut_down = False
+
+    def is_shut_down(self):
+        return self.__shut_down
+
+    def handle_line(self, line):
+        """
+            handles a line holding a JSON-RPC request, returning the line holding the response, or None for a
+            notification
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return json.dumps(self.__error_response(None, PARSE_ERROR, "invalid JSON: {}".format(e)))
+        response = self.handle_request(request)
+        return None if response is None else json.dumps(response)
+
+    def handle_request(self, request):
+        """
+            handles a decoded JSON-RPC request, returning the response, or None for a notification
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return self.__error_response(None, INVALID_REQUEST, "expected a JSON-RPC request object with a method")
+        request_id = request.get("id")
+        params = request.get("params", {})
+        handler = getattr(self, "rpc_" + request["method"], None)
+        try:
+            if handler is None:
+                raise RequestError(METHOD_NOT_FOUND, "unknown method '{}'".format(request["method"]))
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "expected the params to be an object")
+            try:
+                inspect.signature(handler).bind(**params)
+            except TypeError as e:
+                raise RequestError(INVALID_PARAMS, str(e))
+            result = handler(**params)
+        except RequestError as e:
+            response = self.__error_response(request_id, e.code, e.message)
+        except Exception as e:
+            response = self.__error_response(request_id, INTERNAL_ERROR, "{}: {}".format(type(e).__name__, e))
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return response if "id" in request else None
+
+    def __error_response(self, request_id, code, message):
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def __get_document(self, file_name):
+        document = self.__documents.get(os.path.abspath(file_name))
+        if document is None:
+            raise RequestError(INVALID_PARAMS, "the file {} is not open".format(file_name))
+        return document
+
+    def __describe(self, document):
+        reparsed_context = document.get_last_reparsed_context()
+        return {
+            "file_name": document.get_file_name(),
+            "line_count": document.get_line_count(),
+            "reparse": document.get_last_reparse(),
+            "context": reparsed_context.get_fully_qualified_name() if reparsed_context is not None else None,
+            "failed": document.get_job().failed(),
+            "diagnostics": [error.to_dict() for error in document.get_job().get_errors()]
+        }
+
+    def rpc_open(self, file_name, text=None):
+        if text is None:
+            lines = YAPLFileReader(os.path.abspath(file_name)).read_lines()
+        else:
+            lines = [line.rstrip() for line in io.StringIO(text)]
+        document = Document(os.path.abspath(file_name), lines)
+        self.__documents[document.get_file_name()] = document
+        return self.__describe(document)
+
+    def rpc_change(self, file_name, start_line, deleted_line_count, lines):
+        document = self.__get_document(file_name)
+        document.edit(start_line, deleted_line_count, lines)
+        return self.__describe(document)
+
+    def rpc_diagnostics(self, file_name):
+        return self.__describe(self.__get_document(file_name))
+
+    def rpc_syntax_tree(self, file_name):
+        document = self.__get_document(file_name)
+        return base64.b64encode(dump_syntax_tree(document.get_job().get_file_context())).decode("ascii")
+
+    def rpc_close(self, file_name):
+        del self.__documents[self.__get_document(file_name).get_file_name()]
+        return None
+
+    def rpc_shutdown(self):
+        self.__shut_down = True
+        return None
+
+def serve_streams(server, input_stream, output_stream):
+    """
+        serves the JSON-RPC requests read from 'input_stream', one per line, until it ends or the server is shut down
+    """
+    for line in input_stream:
+        if not line.strip():
+            continue
+        response = server.handle_line(line)
+        if response is not None:
+            output_stream.write(response + "\n")
+            output_stream.flush()
+        if server.is_shut_down():
+            break
+
+def serve_stdio(server):
+    serve_streams(server, sys.stdin, sys.stdout)
+
+class UnixSocketRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        serve_streams(self.server.frontend_server, io.TextIOWrapper(self.rfile, encoding="utf-8"), io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True))
+
+def is_socket_file(file_name):
+    """
+        returns True if 'file_name' is a unix socket, and False if it is anything else, or doesn't exist
+    """
+    try:
+        return stat.S_ISSOCK(os.lstat(file_name).st_mode)
+    except FileNotFoundError:
+        return False
+
+def serve_unix_socket(server, socket_file_name):
+    """
+        serves the JSON-RPC requests of the clients that connect to the unix socket 'socket_file_name', one client at a
+        time, until the server is shut down
+
+        a socket that is left over at 'socket_file_name', e.g. by a server that was killed, is replaced, but a
+        FileExistsError is raised if anything else is there
+    """
+    if is_socket_file(socket_file_name):
+        os.unlink(socket_file_name)
+    elif os.path.lexists(socket_file_name):
+        raise FileExistsError(errno.EEXIST, "not a unix socket, refusing to replace it", socket_file_name)
+    with socketserver.UnixStreamServer(socket_file_name, UnixSocketRequestHandler) as socket_server:
+        socket_server.frontend_server = server
+        try:
+            while not server.is_shut_down():
+                socket_server.handle_request()
+        finally:
+            if is_socket_file(socket_file_name):
+                os.unlink(socket_file_name)
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from transpiler.server import REPARSE_FULL, REPARSE_INCREMENTAL, Server, serve_unix_socket
+
+DOCUMENT = """module org.yapllang.test: -- the test module
+
+    class only_class: -- the only class
+
+        public facet only_facet:
+
+            method first_method: -- the first method
+
+                inputs:
+
+                    only_input is integer -- the only input
+
+            method second_method: -- the second method
+
+                inputs:
+
+                    only_input is integer -- the only input
+"""
+
+
+class TestServer(unittest.TestCase):
+    """
+        Unit test suite for the incremental re-parsing of the frontend server
+    """
+
+    def setUp(self):
+        self.server = Server()
+        self.file_name = os.path.join(tempfile.gettempdir(), "test.py.yapl")
+        self.assertEqual([], self.request("open", file_name=self.file_name, text=DOCUMENT)["diagnostics"])
+
+    def request(self, method, **params):
+        response = self.server.handle_request({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+        self.assertNotIn("error", response)
+        return response["result"]
+
+    def change(self, start_line, deleted_line_count, lines):
+        return self.request("change", file_name=self.file_name, start_line=start_line, deleted_line_count=deleted_line_count, lines=lines)
+
+    def test_an_edit_within_a_body_is_reparsed_incrementally(self):
+        result = self.change(11, 1, ["                    renamed_input is integer -- the renamed input"])
+        self.assertEqual(REPARSE_INCREMENTAL, result["reparse"])
+        self.assertEqual("org.yapllang.test.only_class.only_facet.first_method.inputs", result["context"])
+        self.assertEqual([], result["diagnostics"])
+
+    def test_an_edit_that_fails_validation_is_reparsed_fully(self):
+        # an identifier declaration without a comment is only reported by the validation of the re-parsed context
+        result = self.change(11, 1, ["                    only_input is integer"])
+        self.assertEqual(REPARSE_FULL, result["reparse"])
+        self.assertEqual(["IDENTIFIER-MUST-BE-COMMENTED"], [diagnostic["error_code"] for diagnostic in result["diagnostics"]])
+
+
+class TestServeUnixSocket(unittest.TestCase):
+    """
+        Unit test suite for serving the frontend server on a unix socket
+    """
+
+    def test_a_file_that_is_not_a_socket_is_not_replaced(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            file_name = os.path.join(directory_name, "not-a-socket")
+            with open(file_name, "w") as f:
+                f.write("keep me")
+            with self.assertRaises(FileExistsError):
+                serve_unix_socket(Server(), file_name)
+            with open(file_name) as f:
+                self.assertEqual("keep me", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,282 @@
+"""
+    A compact binary format for the syntax tree that the frontend parses a YAPL file into, i.e. the tree of
+    FileContext, ModuleContext, ClassContext, ClassFacetContext, CallableContext, CallableSegmentContext,
+    IdentifierDeclarationContext and ErrorDeclarationContext objects.
+
+    The format consists of:
+
+    1. a header, which is the MAGIC bytes followed by the FORMAT_VERSION byte
+    2. a string table, which is the number of strings, followed by each string as its length and its UTF-8 bytes
+    3. the record of the FileContext node
+
+    Each record is a node kind byte, followed by the length of the rest of the record, the node's fields (per the
+    NODE_SCHEMAS of its kind) and its child records. String fields are indexes into the string table, string-list
+    fields are a count followed by that many indexes, and all numbers are little-endian unsigned 32-bit integers.
+
+    Loading a syntax tree yields read-only SyntaxTreeNode objects, without re-reading or lexing the YAPL file. Data that
+    is not a syntax tree of this format, or that is truncated or corrupt, is rejected with a ValueError.
+"""
+import io
+import struct
+
+from transpiler.frontend.contexts.context import ContextBaseClass
+from transpiler.frontend.contexts.callable_context import CallableContext
+from transpiler.frontend.contexts.callable_segment_context import CallableSegmentContext
+from transpiler.frontend.contexts.class_context import ClassContext
+from transpiler.frontend.contexts.class_facet_context import ClassFacetContext
+from transpiler.frontend.contexts.error_declaration_context import ErrorDeclarationContext
+from transpiler.frontend.contexts.file_context import FileContext
+from transpiler.frontend.contexts.identifier_declaration_context import IdentifierDeclarationContext
+from transpiler.frontend.contexts.module_context import ModuleContext
+
+MAGIC = b"YAPLAST"
+FORMAT_VERSION = 1
+
+KIND_FILE = 1
+KIND_MODULE = 2
+KIND_CLASS = 3
+KIND_CLASS_FACET = 4
+KIND_CALLABLE = 5
+KIND_CALLABLE_SEGMENT = 6
+KIND_IDENTIFIER_DECLARATION = 7
+KIND_ERROR_DECLARATION = 8
+
+FIELD_STRING = 1
+FIELD_STRINGS = 2
+
+# the string-table index that encodes a string field whose value is None
+NONE_INDEX = 0xFFFFFFFF
+
+UINT8 = struct.Struct("<B")
+UINT32 = struct.Struct("<I")
+
+# per node kind: its name, the Context type it is serialized from, and its fields as (name, field type, getter name)
+NODE_SCHEMAS = {
+    KIND_FILE: ("file", FileContext, [
+        ("absolute_file_name", FIELD_STRING, "get_content_absolute_file_name")
+    ]),
+    KIND_MODULE: ("module", ModuleContext, [
+        ("fully_qualified_name", FIELD_STRING, "get_content_module_fully_qualified_name"),
+        ("prefix_comments", FIELD_STRINGS, "get_content_module_prefix_comments"),
+        ("suffix_comment", FIELD_STRING, "get_content_module_suffix_comment")
+    ]),
+    KIND_CLASS: ("class", ClassContext, [
+        ("name", FIELD_STRING, "get_content_class_name"),
+        ("prefix_comments", FIELD_STRINGS, "get_content_class_prefix_comments"),
+        ("suffix_comment", FIELD_STRING, "get_content_class_suffix_comment")
+    ]),
+    KIND_CLASS_FACET: ("class_facet", ClassFacetContext, [
+        ("visibility", FIELD_STRING, "get_content_class_facet_visibility"),
+        ("type", FIELD_STRING, "get_content_class_facet_type"),
+        ("name", FIELD_STRING, "get_content_class_facet_name"),
+        ("prefix_comments", FIELD_STRINGS, "get_content_class_prefix_comments"),
+        ("suffix_comment", FIELD_STRING, "get_content_class_suffix_comment")
+    ]),
+    KIND_CALLABLE: ("callable", CallableContext, [
+        ("type", FIELD_STRING, "get_content_callable_type"),
+        ("name", FIELD_STRING, "get_content_callable_name"),
+        ("prefix_comments", FIELD_STRINGS, "get_content_callable_prefix_comments"),
+        ("suffix_comment", FIELD_STRING, "get_content_callable_suffix_comment")
+    ]),
+    KIND_CALLABLE_SEGMENT: ("callable_segment", CallableSegmentContext, [
+        ("name", FIELD_STRING, "get_content_callable_segment_name")
+    ]),
+    KIND_IDENTIFIER_DECLARATION: ("identifier_declaration", IdentifierDeclarationContext, [
+        ("name", FIELD_STRING, "get_content_identifier_name"),
+        ("value_or_reference", FIELD_STRING, "get_content_identifier_value_or_reference"),
+        ("type", FIELD_STRING, "get_content_identifier_type"),
+        ("prefix_comments", FIELD_STRINGS, "get_content_identifier_prefix_comments"),
+        ("suffix_comment", FIELD_STRING, "get_content_identifier_suffix_comment")
+    ]),
+    KIND_ERROR_DECLARATION: ("error_declaration", ErrorDeclarationContext, [
+        ("name", FIELD_STRING, "get_content_error_name"),
+        ("prefix_comments", FIELD_STRINGS, "get_content_error_prefix_comments"),
+        ("suffix_comment", FIELD_STRING, "get_content_error_suffix_comment")
+    ])
+}
+
+KINDS_BY_CONTEXT_TYPE = dict((context_type, kind) for kind, (_, context_type, _) in NODE_SCHEMAS.items())
+
+# per node kind: a dictionary of the index of each field, by field name
+FIELD_INDEXES = dict((kind, dict((field[0], index) for index, field in enumerate(fields))) for kind, (_, _, fields) in NODE_SCHEMAS.items())
+
+class SyntaxTreeNode(object):
+    """
+        A read-only node of a loaded syntax tree
+    """
+
+    __slots__ = ("__kind", "__values", "__children")
+
+    def __init__(self, kind, values, children):
+        object.__setattr__(self, "_SyntaxTreeNode__kind", kind)
+        object.__setattr__(self, "_SyntaxTreeNode__values", values)
+        object.__setattr__(self, "_SyntaxTreeNode__children", children)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("syntax tree nodes are read-only")
+
+    def __str__(self):
+        return "SyntaxTreeNode, of kind {}, with fields {}".format(self.get_kind_name(), self.get_fields())
+
+    def get_kind(self):
+        return self.__kind
+
+    def get_kind_name(self):
+        return NODE_SCHEMAS[self.__kind][0]
+
+    def get(self, field_name):
+        """
+            retrieves the value of the field 'field_name', which is a string, a tuple of strings, or None
+        """
+        return self.__values[FIELD_INDEXES[self.__kind][field_name]]
+
+    def get_fields(self):
+        """
+            retrieves a dictionary of the values of all fields of this node, by field name
+        """
+        return dict((field[0], value) for field, value in zip(NODE_SCHEMAS[self.__kind][2], self.__values))
+
+    def get_children(self, kind=None):
+        """
+            retrieves the tuple of child nodes of this node, in source order, optionally only those of 'kind'
+        """
+        if kind is None:
+            return self.__children
+        return tuple(child for child in self.__children if child.get_kind() == kind)
+
+class StringTable(object):
+    """
+        Assigns an index to each distinct string, in the order the strings are first added
+    """
+
+    def __init__(self):
+        self.__indexes = {}
+        self.__strings = []
+
+    def add(self, string):
+        if string is None:
+            return NONE_INDEX
+        index = self.__indexes.get(string)
+        if index is None:
+            index = self.__indexes[string] = len(self.__strings)
+            self.__strings.append(string)
+        return index
+
+    def get_strings(self):
+        return self.__strings
+
+def encode_record(context, string_table, chunks):
+    kind = KINDS_BY_CONTEXT_TYPE[type(context)]
+    payload = []
+    for _, field_type, getter_name in NODE_SCHEMAS[kind][2]:
+        value = getattr(context, getter_name)()
+        if field_type == FIELD_STRING:
+            payload.append(UINT32.pack(string_table.add(value)))
+        else:
+            payload.append(UINT32.pack(len(value)))
+            payload.extend(UINT32.pack(string_table.add(string)) for string in value)
+    children = [content for content in context.get_contents() if isinstance(content, ContextBaseClass)]
+    payload.append(UINT32.pack(len(children)))
+    for child in children:
+        encode_record(child, string_table, payload)
+    payload_length = sum(len(chunk) for chunk in payload)
+    chunks.append(UINT8.pack(kind))
+    chunks.append(UINT32.pack(payload_length))
+    chunks.extend(payload)
+
+def dumps(file_context):
+    """
+        serializes the syntax tree of 'file_context' to bytes
+    """
+    string_table = StringTable()
+    records = []
+    encode_record(file_context, string_table, records)
+    chunks = [MAGIC, UINT8.pack(FORMAT_VERSION), UINT32.pack(len(string_table.get_strings()))]
+    for string in string_table.get_strings():
+        encoded = string.encode("utf-8")
+        chunks.append(UINT32.pack(len(encoded)))
+        chunks.append(encoded)
+    chunks.extend(records)
+    return b"".join(chunks)
+
+def dump(file_context, f):
+    """
+        serializes the syntax tree of 'file_context' to the binary file object 'f'
+    """
+    f.write(dumps(file_context))
+
+def decode_record(data, offset, strings):
+    kind, = UINT8.unpack_from(data, offset)
+    payload_length, = UINT32.unpack_from(data, offset + 1)
+    offset += 5
+    end = offset + payload_length
+    if kind not in NODE_SCHEMAS:
+        raise ValueError("unknown syntax tree node kind {} at offset {}".format(kind, offset - 5))
+    values = []
+    for _, field_type, _ in NODE_SCHEMAS[kind][2]:
+        if field_type == FIELD_STRING:
+            index, = UINT32.unpack_from(data, offset)
+            offset += 4
+            values.append(None if index == NONE_INDEX else strings[index])
+        else:
+            count, = UINT32.unpack_from(data, offset)
+            offset += 4
+            indexes = struct.unpack_from("<{}I".format(count), data, offset)
+            offset += 4 * count
+            values.append(tuple(strings[index] for index in indexes))
+    child_count, = UINT32.unpack_from(data, offset)
+    offset += 4
+    children = []
+    for _ in range(child_count):
+        child, offset = decode_record(data, offset, strings)
+        children.append(child)
+    if offset != end:
+        raise ValueError("syntax tree record at offset {} has an inconsistent length".format(end - payload_length - 5))
+    return SyntaxTreeNode(kind, tuple(values), tuple(children)), offset
+
+def loads(data):
+    """
+        loads a syntax tree from 'data', returning the SyntaxTreeNode of the file
+
+        raises a ValueError if 'data' is not a syntax tree of this format, or if it is truncated or corrupt
+    """
+    data = memoryview(data)
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("not a YAPL syntax tree")
+    offset = len(MAGIC)
+    try:
+        version, = UINT8.unpack_from(data, offset)
+        if version != FORMAT_VERSION:
+            raise ValueError("unsupported YAPL syntax tree format version {}".format(version))
+        offset += 1
+        string_count, = UINT32.unpack_from(data, offset)
+        offset += 4
+        strings = []
+        for _ in range(string_count):
+            length, = UINT32.unpack_from(data, offset)
+            offset += 4
+            if offset + length > len(data):
+                raise ValueError("truncated YAPL syntax tree, in the string at offset {}".format(offset - 4))
+            strings.append(str(data[offset:offset + length], "utf-8"))
+            offset += length
+        root, offset = decode_record(data, offset, strings)
+    except (struct.error, IndexError) as e:
+        # reading past the end of the data, or a string index past the end of the string table
+        raise ValueError("truncated or corrupt YAPL syntax tree: {}".format(e)) from e
+    if offset != len(data):
+        raise ValueError("unexpected trailing data after the syntax tree")
+    return root
+
+def load(f):
+    """
+        loads a syntax tree from the binary file object 'f', returning the SyntaxTreeNode of the file
+    """
+    return loads(f.read())
+
+def write_file(file_context, file_name):
+    with io.open(file_name, "wb") as f:
+        dump(file_context, f)
+
+def read_file(file_name):
+    with io.open(file_name, "rb") as f:
+        return load(f)
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from benchmark.corpus import write_file
+from transpiler.frontend.contexts.context import ContextBaseClass
+from transpiler.job_test import run_job
+from transpiler.syntax_tree import KIND_FILE, KINDS_BY_CONTEXT_TYPE, MAGIC, NODE_SCHEMAS, dumps, loads
+
+# an identifier without a type or a comment, whose value_or_reference and type are None, and whose suffix comment is
+# the empty string
+MISSING_FIELDS = """module org.yapllang.test: -- the test module
+
+    class only_class: -- the only class
+
+        public facet only_facet: -- the only facet
+
+            method only_method: -- a method
+
+                inputs:
+
+                    untyped_input
+"""
+
+class TestSyntaxTree(unittest.TestCase):
+    """
+        Unit test suite for the compact binary syntax tree format
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def parse(self, input_file_name):
+        return run_job(input_file_name).get_file_context()
+
+    def assert_same_tree(self, context, node):
+        """
+            asserts that 'node' has the kind, the field values and the children, in order, of 'context'
+        """
+        kind = KINDS_BY_CONTEXT_TYPE[type(context)]
+        self.assertEqual(kind, node.get_kind())
+        for field_name, field_type, getter_name in NODE_SCHEMAS[kind][2]:
+            value = getattr(context, getter_name)()
+            self.assertEqual(value if isinstance(value, str) or value is None else tuple(value), node.get(field_name), field_name)
+        children = [content for content in context.get_contents() if isinstance(content, ContextBaseClass)]
+        self.assertEqual(len(children), len(node.get_children()))
+        for child, child_node in zip(children, node.get_children()):
+            self.assert_same_tree(child, child_node)
+
+    def test_a_parsed_corpus_file_round_trips(self):
+        input_file_name = os.path.join(self.directory.name, "corpus.py.yapl")
+        write_file(input_file_name, modules=2, classes=3, errors=2)
+        file_context = self.parse(input_file_name)
+        root = loads(dumps(file_context))
+        self.assertEqual(KIND_FILE, root.get_kind())
+        self.assert_same_tree(file_context, root)
+
+    def test_none_and_empty_string_fields_are_kept_apart(self):
+        input_file_name = os.path.join(self.directory.name, "test.py.yapl")
+        with open(input_file_name, "w") as f:
+            f.write(MISSING_FIELDS)
+        file_context = self.parse(input_file_name)
+        root = loads(dumps(file_context))
+        self.assert_same_tree(file_context, root)
+        untyped_input, = root.get_children()[0].get_children()[0].get_children()[0].get_children()[0].get_children()[0].get_children()
+        self.assertEqual(
+            {"name": "untyped_input", "value_or_reference": None, "type": None, "prefix_comments": (), "suffix_comment": ""},
+            untyped_input.get_fields()
+        )
+
+    def test_truncated_data_is_rejected(self):
+        input_file_name = os.path.join(self.directory.name, "corpus.py.yapl")
+        write_file(input_file_name, classes=1)
+        data = dumps(self.parse(input_file_name))
+        for length in (len(MAGIC), len(MAGIC) + 3, len(data) // 2, len(data) - 1):
+            with self.assertRaises(ValueError, msg=length):
+                loads(data[:length])
+
+    def test_data_with_a_bad_magic_is_rejected(self):
+        input_file_name = os.path.join(self.directory.name, "corpus.py.yapl")
+        write_file(input_file_name, classes=1)
+        data = dumps(self.parse(input_file_name))
+        with self.assertRaises(ValueError):
+            loads(b"X" + data[1:])
+        with self.assertRaises(ValueError):
+            loads(b"")
+
+    def test_trailing_data_is_rejected(self):
+        input_file_name = os.path.join(self.directory.name, "corpus.py.yapl")
+        write_file(input_file_name, classes=1)
+        with self.assertRaises(ValueError):
+            loads(dumps(self.parse(input_file_name)) + b"\0")
+
+
+if __name__ == "__main__":
+    unittest.main()
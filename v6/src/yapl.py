@@ -1,36 +1,121 @@
 #!/usr/bin/env python3
 import argparse
+import json
+import pstats
+import shutil
 import sys
 import os
 import os.path
+import tempfile
 
 if sys.version_info[0] < 3:
     print("This script requires Python version 3 or higher")
     sys.exit(1)
 
-from transpiler.job import Job as TranspilationJob
+from transpiler.batch import collect_input_files, get_syntax_tree_names, run_jobs
+from transpiler.cache import DEFAULT_CACHE_DIRECTORY, DEFAULT_CACHE_SIZE_IN_BYTES
+from transpiler.diagnostics import ALL_FORMATS, FORMAT_TEXT
+from transpiler.output_writer import Manifest
+from transpiler.profiler import merge_profile_dicts
+from transpiler.server import Server, serve_stdio, serve_unix_socket
 
 def main(args):
     argument_parser = argparse.ArgumentParser()
-    argument_parser.add_argument("-i", "--input", help="the input yapl file")
+    argument_parser.add_argument("inputs", help="yapl files, or directories to search for yapl files", nargs="*")
+    argument_parser.add_argument("-i", "--input", help="the input yapl file, may be repeated", action="append", default=[])
     argument_parser.add_argument("-o", "--output_directory", help="the output directory")
+    argument_parser.add_argument("--ast", help="write the serialized syntax tree of each input file to the output directory, at the input file's path relative to the directory it was found in", action='store_true')
+    argument_parser.add_argument("--prune", help="remove the files in the output directory that an earlier run produced from the input files, but this run didn't", action='store_true')
     argument_parser.add_argument("-v", "--verbose", help="verbose level output", action='store_true')
+    argument_parser.add_argument("--diagnostics_format", help="the format to write errors and traces in (default: {})".format(FORMAT_TEXT), choices=ALL_FORMATS, default=FORMAT_TEXT)
+    argument_parser.add_argument("-m", "--memory_mapped", help="read the input file through a memory map", action='store_true')
+    argument_parser.add_argument("-j", "--jobs", help="the number of worker processes to transpile with (default: the number of CPUs)", type=int, default=None)
+    argument_parser.add_argument("--compact", help="release the lines of each Context as soon as it is processed, to bound the memory held while transpiling large input files", action='store_true')
+    argument_parser.add_argument("--no-cache", help="neither load nor store parse results in the parse cache", action='store_true')
+    argument_parser.add_argument("--cache_directory", help="the parse cache directory (default: {})".format(DEFAULT_CACHE_DIRECTORY), default=DEFAULT_CACHE_DIRECTORY)
+    argument_parser.add_argument("--cache_size", help="the maximum size of the parse cache, in megabytes", type=int, default=DEFAULT_CACHE_SIZE_IN_BYTES // (1024 * 1024))
+    argument_parser.add_argument("--profile", help="write the wall time and call counts of each phase and Context class, as JSON, to this file ('-' for standard error)")
+    argument_parser.add_argument("--pstats", help="run under cProfile, and dump the combined statistics of all jobs to this file")
+    argument_parser.add_argument("--serve", help="run as a frontend server, that answers JSON-RPC requests on standard input and output", action='store_true')
+    argument_parser.add_argument("--socket", help="run as a frontend server, that answers JSON-RPC requests on this unix socket")
     args = argument_parser.parse_args(args[1:])
+    if args.serve or args.socket:
+        server = Server()
+        if args.socket:
+            try:
+                serve_unix_socket(server, args.socket)
+            except FileExistsError as e:
+                argument_parser.error(str(e))
+        else:
+            serve_stdio(server)
+        return 0
+    if args.ast and not args.output_directory:
+        argument_parser.error("--ast requires an output directory")
+    if args.prune and not args.output_directory:
+        argument_parser.error("--prune requires an output directory")
 
-    job = TranspilationJob()
+    input_files = collect_input_files(args.input + args.inputs)
+    if not input_files:
+        argument_parser.error("no input files: give yapl files, or directories that contain them")
+    input_file_names = [input_file_name for input_file_name, _ in input_files]
+    syntax_tree_names = None
+    if args.ast:
+        try:
+            syntax_tree_names = get_syntax_tree_names(input_files)
+        except ValueError as e:
+            argument_parser.error(str(e))
 
-    if args.input:
-        job.set_input_file_name(args.input)
+    manifest = Manifest(args.output_directory).load() if args.output_directory else None
+    pstats_directory_name = tempfile.mkdtemp(prefix="yapl-pstats-") if args.pstats else None
+    failed = False
+    profile_dicts = []
+    for input_file_name, job_failed, diagnostics, profile_dict, outputs in run_jobs(
+        input_file_names,
+        workers=args.jobs,
+        pstats_directory_name=pstats_directory_name,
+        profile=bool(args.profile),
+        syntax_tree_names=syntax_tree_names,
+        output_directory_name=args.output_directory,
+        manifest=manifest,
+        verbose=args.verbose,
+        diagnostics_format=args.diagnostics_format,
+        memory_mapped=args.memory_mapped,
+        compact=args.compact,
+        cache_directory=None if args.no_cache else args.cache_directory,
+        cache_size_in_bytes=args.cache_size * 1024 * 1024
+    ):
+        sys.stdout.write(diagnostics)
+        failed = failed or job_failed
+        if profile_dict is not None:
+            profile_dict["file"] = input_file_name
+            profile_dicts.append(profile_dict)
+        if manifest is not None:
+            manifest.update(outputs)
 
-    if args.output_directory:
-        job.set_output_directory_name(args.output_directory)
+    if manifest is not None and (args.ast or args.prune):
+        if args.prune:
+            pruned_names = manifest.prune(input_file_names)
+            if args.verbose:
+                for name in pruned_names:
+                    print("pruned {}".format(name))
+        manifest.save()
 
-    if args.verbose:
-        job.set_verbose()
+    if args.profile:
+        report = merge_profile_dicts(profile_dicts)
+        report["files"] = profile_dicts
+        if args.profile == "-":
+            json.dump(report, sys.stderr, indent=2, sort_keys=True)
+            sys.stderr.write("\n")
+        else:
+            with open(args.profile, "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+    if pstats_directory_name is not None:
+        pstats_file_names = [os.path.join(pstats_directory_name, file_name) for file_name in sorted(os.listdir(pstats_directory_name))]
+        if pstats_file_names:
+            pstats.Stats(*pstats_file_names).dump_stats(args.pstats)
+        shutil.rmtree(pstats_directory_name)
 
-    job.run()
-
-    return 1 if job.failed() else 0
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":